@@ -73,16 +73,17 @@ def model(lbda, angle, params):
 # -------------------------
 # The fit function follows the protocol defined by the lmfit package and needs the parameters dictionary as first argument. It has to return a residual value, which will be minimized.
 # Here psi and delta are used across all angles to calculate the residual, but could be changed to any other measured quantity like transmission or reflection data.
+# All angles are evaluated in a single call, the result arrays then have a leading angle axis.
 
 
 def fit_function(params, lbda, data):
     residual = []
+    angles = [50, 60, 70]
+    model_result = model(lbda, angles, params)
 
-    for phi_i in [50, 60, 70]:
-        model_result = model(lbda, phi_i, params)
-
-        resid_psi = data.loc[(phi_i, "Ψ")].to_numpy() - model_result.psi
-        resid_delta = data.loc[(phi_i, "Δ")].to_numpy() - model_result.delta
+    for i, phi_i in enumerate(angles):
+        resid_psi = data.loc[(phi_i, "Ψ")].to_numpy() - model_result.psi[i]
+        resid_delta = data.loc[(phi_i, "Δ")].to_numpy() - model_result.delta[i]
 
         residual.append(resid_psi)
         residual.append(resid_delta)
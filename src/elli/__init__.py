@@ -5,7 +5,8 @@ from . import database as db
 from .database.materials_db import AIR
 from .dispersions import *
 from .dispersions.base_dispersion import *
-from .experiment import Experiment
+from .ensemble import StructureEnsemble
+from .experiment import Experiment, ExperimentSnapshot
 from .importer.accurion import read_accurion_psi_delta
 from .importer.nexus import *
 from .importer.spectraray import *
@@ -14,5 +15,6 @@ from .materials import *
 from .result import Result, ResultList
 from .solver2x2 import Solver2x2
 from .solver4x4 import *
+from .solver4x4_torch import Solver4x4Torch
 from .structure import *
 from .utils import *
@@ -21,3 +21,4 @@ from .tauc_lorentz import TaucLorentz
 from .cody_lorentz import CodyLorentz
 from .pseudo_dielectric import PseudoDielectricFunction
 from .formula import Formula, FormulaIndex
+from .baked import BakedDispersion, BakedIndexDispersion
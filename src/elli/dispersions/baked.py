@@ -0,0 +1,183 @@
+# Encoding: utf-8
+"""Dispersions tabulated from other dispersions for fast repeated evaluation."""
+
+import warnings
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .base_dispersion import BaseDispersion
+from .table_epsilon import TableEpsilon
+from .table_index import Table
+from .table_interpolation import TableInterpolation
+
+
+class BakedTable:
+    """Tabulation of a dispersion on an adaptively refined wavelength grid.
+
+    Starting from the given wavelengths, intervals are bisected until the interpolation
+    deviates less than the tolerance from the dispersion at the midpoints of all intervals.
+    The table keeps a link to the dispersion it was baked from and is rebuilt automatically,
+    when the parameters of that dispersion change.
+    """
+
+    table_key = None
+    source = None
+    tolerance = None
+    max_points = None
+    max_error = None
+    _lbda = None
+    _source_fingerprint = None
+
+    def __init__(
+        self,
+        source: BaseDispersion,
+        lbda: Optional[npt.ArrayLike] = None,
+        kind: str = "cubic",
+        tolerance: float = 1e-6,
+        max_points: int = 10000,
+    ) -> None:
+        """Bakes a dispersion into a table.
+
+        Args:
+            source (BaseDispersion): Dispersion to tabulate.
+            lbda (npt.ArrayLike, optional): Wavelengths (in nm) of the initial table,
+                the table covers the range of these wavelengths.
+                Defaults to None, i.e. the default wavelength range of the source.
+            kind (str, optional): Type of interpolation
+                (see scipy.interpolate.interp1d for more information). Defaults to 'cubic'.
+            tolerance (float, optional): Maximum absolute interpolation error
+                at the midpoints of the table intervals. Defaults to 1e-6.
+            max_points (int, optional): Maximum number of table points.
+                If the tolerance is not reached with this number of points,
+                a warning is issued. Defaults to 10000.
+        """
+        if tolerance <= 0:
+            raise ValueError("Tolerance needs to be larger than 0.")
+
+        self.source = source
+        self.tolerance = tolerance
+        self.max_points = max_points
+        self._lbda = np.unique(
+            np.asarray(source.default_lbda_range if lbda is None else lbda, dtype=float)
+        )
+        if self._lbda.size < 2:
+            raise ValueError(
+                "At least two wavelengths are needed to bake a dispersion."
+            )
+
+        self._source_fingerprint = source.get_fingerprint()
+        lbda, values, self.max_error = self.sample(
+            self._source_function, self._lbda, kind, tolerance, max_points
+        )
+
+        super().__init__(lbda=lbda, kind=kind, **{self.table_key: values})
+
+    def _source_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Tabulated function of the source dispersion."""
+        raise NotImplementedError
+
+    @staticmethod
+    def sample(
+        function: Callable[[npt.NDArray], npt.NDArray],
+        lbda: npt.NDArray,
+        kind: str,
+        tolerance: float,
+        max_points: int,
+    ) -> Tuple[npt.NDArray, npt.NDArray, float]:
+        """Samples a function on an adaptively refined grid.
+
+        Args:
+            function (Callable[[npt.NDArray], npt.NDArray]): Function of the wavelength.
+            lbda (npt.NDArray): Sorted initial wavelengths.
+            kind (str): Type of interpolation.
+            tolerance (float): Maximum absolute interpolation error at the interval midpoints.
+            max_points (int): Maximum number of grid points.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray, float]:
+                Grid, function values and maximum interpolation error at the midpoints.
+        """
+        # Enough points for the spline interpolations
+        grid = np.union1d(lbda, np.linspace(lbda[0], lbda[-1], 9))
+        values = np.asarray(function(grid))
+
+        while True:
+            interpolation = TableInterpolation(grid, values, kind=kind, cache_size=0)
+            midpoints = (grid[1:] + grid[:-1]) / 2
+            exact = np.asarray(function(midpoints))
+            errors = np.abs(interpolation(midpoints) - exact)
+            refine = errors > tolerance
+
+            if not refine.any():
+                return grid, values, float(errors.max())
+
+            if grid.size + np.count_nonzero(refine) > max_points:
+                warnings.warn(
+                    f"Baking stopped at {grid.size} points with an interpolation error "
+                    f"of {errors.max()}, which exceeds the tolerance of {tolerance}."
+                )
+                return grid, values, float(errors.max())
+
+            grid = np.concatenate([grid, midpoints[refine]])
+            values = np.concatenate([values, exact[refine]])
+            order = np.argsort(grid)
+            grid, values = grid[order], values[order]
+
+    def is_stale(self) -> bool:
+        """Returns whether the parameters of the source dispersion changed since baking."""
+        return self.source.get_fingerprint() != self._source_fingerprint
+
+    def rebuild(self) -> None:
+        """Bakes the table again with the current parameters of the source dispersion."""
+        self._source_fingerprint = self.source.get_fingerprint()
+        lbda, values, self.max_error = self.sample(
+            self._source_function,
+            self._lbda,
+            self.kind,
+            self.tolerance,
+            self.max_points,
+        )
+
+        self.single_params["lbda"] = lbda
+        self.single_params[self.table_key] = values
+        self.interpolation = TableInterpolation(lbda, values, kind=self.kind)
+        self.default_lbda_range = lbda
+
+    def get_fingerprint(self) -> tuple:
+        return (
+            type(self).__name__,
+            self.source.get_fingerprint(),
+            self.kind,
+            self.tolerance,
+            self._lbda.tobytes(),
+        )
+
+
+class BakedDispersion(BakedTable, TableEpsilon):
+    """Dielectric function of a dispersion, tabulated by :meth:`BaseDispersion.bake`."""
+
+    table_key = "epsilon"
+
+    def _source_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        return self.source.get_dielectric(lbda)
+
+    def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        if self.is_stale():
+            self.rebuild()
+        return super().dielectric_function(lbda)
+
+
+class BakedIndexDispersion(BakedTable, Table):
+    """Refractive index of a dispersion, tabulated by :meth:`BaseDispersion.bake`."""
+
+    table_key = "n"
+
+    def _source_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        return self.source.get_refractive_index(lbda)
+
+    def refractive_index(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        if self.is_stale():
+            self.rebuild()
+        return super().refractive_index(lbda)
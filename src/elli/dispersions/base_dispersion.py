@@ -1,8 +1,21 @@
 # Encoding: utf-8
 """Abstract base class and utility classes for pyElli dispersion"""
 
+import numbers
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import numpy.typing as npt
@@ -16,6 +29,18 @@ class InvalidParameters(Exception):
     """Exception for invalid dispersion parameters."""
 
 
+def _fingerprint(value: Any) -> Any:
+    """Returns a hashable representation of parameter values.
+    Numbers, numpy scalars and arrays are all represented by shape, dtype and bytes,
+    so fingerprints of the same parameters can always be compared."""
+    if isinstance(value, dict):
+        return tuple((key, _fingerprint(item)) for key, item in value.items())
+    if isinstance(value, (np.ndarray, np.generic, list, numbers.Number)):
+        value = np.asarray(value)
+        return (value.shape, value.dtype.str, value.tobytes())
+    return value
+
+
 class BaseDispersion(ABC):
     """BaseDispersion (abstract class).
 
@@ -24,6 +49,18 @@ class BaseDispersion(ABC):
     """
 
     default_lbda_range = np.linspace(200, 1000, 801)
+    # Whether the parameters can be arrays with one value per wavelength.
+    # Models evaluated on their own wavelength grid, e.g. for Kramers-Kronig relations,
+    # can't be evaluated this way.
+    supports_parameter_arrays = True
+    cache_size = 0
+    cache_hits = 0
+    cache_misses = 0
+    _cache = None
+    _precomputed = None
+    _precomputed_fingerprint = None
+    _rep_params_dl = None
+    _rep_params_dl_fingerprint = None
 
     @property
     @abstractmethod
@@ -109,11 +146,350 @@ class BaseDispersion(ABC):
 
         return self
 
+    @property
+    def rep_params_dl(self) -> Dict[str, npt.NDArray]:
+        """Repeated parameters as dict of arrays, with the oscillators along the last axis.
+        They are kept until a value in 'rep_params' changes."""
+        fingerprint = tuple(_fingerprint(params) for params in self.rep_params)
+        if (
+            self._rep_params_dl is None
+            or fingerprint != self._rep_params_dl_fingerprint
+        ):
+            self._rep_params_dl = {
+                key: np.stack(
+                    np.broadcast_arrays(*(params[key] for params in self.rep_params)),
+                    axis=-1,
+                )
+                if self.rep_params
+                else np.zeros(0)
+                for key in self.rep_params_template
+            }
+            self._rep_params_dl_fingerprint = fingerprint
+
+        return self._rep_params_dl
+
+    def enable_cache(self, cache_size: int = 8) -> "BaseDispersion":
+        """Enables caching of the dielectric function.
+        Results are stored for the parameters and wavelengths they are calculated for,
+        so materials with unchanged parameters are not evaluated again, e.g. during fits.
+
+        Args:
+            cache_size (int, optional): Number of dielectric functions kept in the cache.
+                Set to 0 to disable caching. Defaults to 8.
+
+        Returns:
+            Dispersion: The current object with caching enabled.
+        """
+        if cache_size < 0:
+            raise ValueError("Cache size needs to be 0 or more.")
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        return self
+
+    def clear_cache(self) -> None:
+        """Removes all cached dielectric functions and resets the hit and miss counters."""
+        if self._cache is not None:
+            self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def get_fingerprint(self) -> tuple:
+        """Returns a hashable fingerprint of the parameters of the dispersion,
+        which changes whenever a parameter value changes."""
+        return (
+            type(self).__name__,
+            _fingerprint(self.single_params),
+            tuple(_fingerprint(params) for params in self.rep_params),
+        )
+
+    def _precompute(self) -> dict:
+        """Calculates the wavelength independent terms of the model,
+        which only depend on the parameters.
+
+        Returns:
+            dict: Precomputed terms by name.
+        """
+        return {}
+
+    def _get_precomputed(self) -> dict:
+        """Returns the terms calculated by :meth:`_precompute`,
+        which are kept until a parameter value changes.
+
+        Returns:
+            dict: Precomputed terms by name.
+        """
+        fingerprint = self.get_fingerprint()
+        if self._precomputed is None or fingerprint != self._precomputed_fingerprint:
+            self._precomputed = self._precompute()
+            self._precomputed_fingerprint = fingerprint
+
+        return self._precomputed
+
     def get_dielectric(self, lbda: Optional[npt.ArrayLike] = None) -> npt.NDArray:
         """Returns the dielectric constant for wavelength 'lbda' default unit (nm)
-        in the convention ε1 + iε2."""
+        in the convention ε1 + iε2.
+        If caching is enabled, the returned array is read-only."""
+        lbda = self.default_lbda_range if lbda is None else lbda
+        if not self.cache_size:
+            return np.asarray(self.dielectric_function(lbda), dtype=np.complex128)
+
+        try:
+            key = (self.get_fingerprint(), _fingerprint(np.asarray(lbda)))
+            hash(key)
+        except TypeError:
+            return np.asarray(self.dielectric_function(lbda), dtype=np.complex128)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return self._cache[key]
+
+        self.cache_misses += 1
+        dielectric = np.array(self.dielectric_function(lbda), dtype=np.complex128)
+        dielectric.setflags(write=False)
+
+        self._cache[key] = dielectric
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return dielectric
+
+    def get_batch_parameters(self) -> List[Union[str, Tuple[str, int]]]:
+        """Returns the parameters set by the columns of a parameter array
+        in :meth:`get_dielectric_batch`.
+        The single parameters come first, followed by the repeated parameters
+        of each oscillator, given as tuples (name, index of the oscillator).
+
+        Returns:
+            List[Union[str, Tuple[str, int]]]: Parameter of each column.
+        """
+        return list(self.single_params_template) + [
+            (name, index)
+            for index in range(len(self.rep_params))
+            for name in self.rep_params_template
+        ]
+
+    @contextmanager
+    def _batch_parameters(self, params_array: npt.NDArray, ndim: int) -> Iterator[None]:
+        """Temporarily sets one column of the parameter array per parameter,
+        with a leading parameter set axis.
+
+        Args:
+            params_array (npt.NDArray): Array of shape (N, parameters).
+            ndim (int): Number of wavelength dimensions to append to the columns.
+
+        Yields:
+            Iterator[None]: Context with substituted parameters.
+        """
+        columns = iter(
+            params_array.reshape(params_array.shape + (1,) * ndim).swapaxes(0, 1)
+        )
+        originals = [(self.single_params, dict(self.single_params))]
+        originals += [(params, dict(params)) for params in self.rep_params]
+        try:
+            for name in self.single_params_template:
+                self.single_params[name] = next(columns)
+            for params in self.rep_params:
+                for name in self.rep_params_template:
+                    params[name] = next(columns)
+
+            yield
+        finally:
+            for params, values in originals:
+                params.update(values)
+
+    def _check_params_array(self, params_array: npt.ArrayLike) -> npt.NDArray:
+        """Checks that the columns of a parameter array match the parameters.
+
+        Args:
+            params_array (npt.ArrayLike): Array of N parameter sets.
+
+        Returns:
+            npt.NDArray: Parameter array of shape (N, parameters).
+        """
+        params_array = np.asarray(params_array)
+        parameters = len(self.get_batch_parameters())
+        if params_array.ndim != 2 or params_array.shape[1] != parameters:
+            raise InvalidParameters(
+                f"Expected an array of shape (N, {parameters}) with a parameter set per row, "
+                f"got shape {params_array.shape}."
+            )
+
+        return params_array
+
+    def get_dielectric_batch(
+        self, lbda: Optional[npt.ArrayLike], params_array: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Returns the dielectric function for N parameter sets at once,
+        without creating a dispersion object for each set.
+        The parameters are broadcast against the wavelengths,
+        so the whole batch is evaluated in the same array operations as a single set.
+
+        Args:
+            lbda (npt.ArrayLike, optional): The wavelengths (in nm) to use.
+                If None, the default spectral range is used.
+            params_array (npt.ArrayLike): Array of shape (N, parameters)
+                with a parameter set per row,
+                the columns are ordered as in :meth:`get_batch_parameters`.
+
+        Returns:
+            npt.NDArray: Dielectric function of shape (N, wavelengths).
+        """
+        lbda = self.default_lbda_range if lbda is None else lbda
+        params_array = self._check_params_array(params_array)
+
+        with self._batch_parameters(params_array, np.ndim(lbda)):
+            dielectric = self.dielectric_function(lbda)
+
+        return np.array(
+            np.broadcast_to(dielectric, params_array.shape[:1] + np.shape(lbda)),
+            dtype=np.complex128,
+        )
+
+    def get_batch_values(self) -> npt.NDArray:
+        """Returns the current parameter values as a row of a parameter array
+        for :meth:`get_dielectric_batch`.
+
+        Returns:
+            npt.NDArray: Parameter values ordered as in :meth:`get_batch_parameters`.
+        """
+        return np.array(
+            [self.single_params[name] for name in self.single_params_template]
+            + [
+                params[name]
+                for params in self.rep_params
+                for name in self.rep_params_template
+            ]
+        )
+
+    def _stack_derivatives(
+        self,
+        lbda: npt.ArrayLike,
+        single_derivatives: Sequence[npt.ArrayLike],
+        repeated_derivatives: Sequence[npt.ArrayLike] = (),
+    ) -> npt.NDArray:
+        """Stacks the derivatives of the model to an array
+        with the parameters along the last axis, ordered as in :meth:`get_batch_parameters`.
+
+        Args:
+            lbda (npt.ArrayLike): The wavelengths the derivatives are calculated for.
+            single_derivatives (Sequence[npt.ArrayLike]):
+                Derivatives for each single parameter.
+            repeated_derivatives (Sequence[npt.ArrayLike], optional):
+                Derivatives for each repeated parameter, with the oscillators along the last axis.
+                Defaults to ().
+
+        Returns:
+            npt.NDArray: Derivatives of shape (wavelengths, parameters).
+        """
+        shape = np.shape(lbda)
+        columns = [np.broadcast_to(value, shape) for value in single_derivatives]
+        if self.rep_params:
+            oscillators = np.stack(
+                [
+                    np.broadcast_to(value, shape + (len(self.rep_params),))
+                    for value in repeated_derivatives
+                ],
+                axis=-1,
+            )
+            columns += list(np.moveaxis(oscillators.reshape(shape + (-1,)), -1, 0))
+
+        if not columns:
+            return np.zeros(shape + (0,), dtype=np.complex128)
+        return np.stack(columns, axis=-1).astype(np.complex128)
+
+    def _finite_differences(
+        self, lbda: npt.ArrayLike, function: Callable, columns: Sequence[int] = None
+    ) -> npt.NDArray:
+        """Calculates the derivatives of a function of the model by central differences.
+        All parameter steps are evaluated as one batch.
+
+        Args:
+            lbda (npt.ArrayLike): The wavelengths the derivatives are calculated for.
+            function (Callable): Function of the wavelength to differentiate,
+                e.g. the dielectric function.
+            columns (Sequence[int], optional): Indices of the parameters to differentiate.
+                Defaults to None, i.e. all parameters.
+
+        Returns:
+            npt.NDArray: Derivatives of shape (wavelengths, columns).
+        """
+        values = self.get_batch_values().astype(np.float64)
+        columns = np.arange(values.size) if columns is None else np.asarray(columns)
+        steps = np.cbrt(np.finfo(np.float64).eps) * np.maximum(
+            np.abs(values[columns]), 1
+        )
+
+        params_array = np.tile(values, (2 * columns.size, 1))
+        params_array[np.arange(columns.size), columns] += steps
+        params_array[np.arange(columns.size) + columns.size, columns] -= steps
+
+        with self._batch_parameters(params_array, np.ndim(lbda)):
+            result = np.broadcast_to(
+                function(lbda), params_array.shape[:1] + np.shape(lbda)
+            )
+
+        derivatives = (result[: columns.size] - result[columns.size :]) / np.reshape(
+            2 * steps, steps.shape + (1,) * np.ndim(lbda)
+        )
+        return np.moveaxis(derivatives, 0, -1).astype(np.complex128)
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        """Returns the derivatives of the dielectric function
+        with respect to each parameter of the model.
+        Models with analytic derivatives override this method,
+        for all other models the derivatives are approximated by central differences.
+
+        Args:
+            lbda (npt.ArrayLike, optional): The wavelengths (in nm) to use.
+                If None, the default spectral range is used.
+
+        Returns:
+            npt.NDArray: Jacobian of shape (wavelengths, parameters),
+                the parameters are ordered as in :meth:`get_batch_parameters`.
+        """
         lbda = self.default_lbda_range if lbda is None else lbda
-        return np.asarray(self.dielectric_function(lbda), dtype=np.complex128)
+        return self._finite_differences(lbda, self.dielectric_function)
+
+    def bake(
+        self,
+        lbda: Optional[npt.ArrayLike] = None,
+        kind: str = "cubic",
+        tolerance: float = 1e-6,
+        max_points: int = 10000,
+    ) -> "BaseDispersion":
+        """Tabulates the dispersion on an adaptively refined wavelength grid,
+        so models which are expensive to evaluate are calculated only once
+        for layers that are not varied, e.g. during fits.
+        The table is rebuilt automatically, when the parameters of this dispersion change.
+
+        Args:
+            lbda (npt.ArrayLike, optional): Wavelengths (in nm) of the initial table,
+                the table covers the range of these wavelengths.
+                Defaults to None, i.e. the default wavelength range of the dispersion.
+            kind (str, optional): Type of interpolation
+                (see scipy.interpolate.interp1d for more information). Defaults to 'cubic'.
+            tolerance (float, optional): Maximum absolute interpolation error of the
+                dielectric function (or refractive index for index dispersions)
+                at the midpoints of the table intervals. Defaults to 1e-6.
+            max_points (int, optional): Maximum number of table points. Defaults to 10000.
+
+        Returns:
+            BaseDispersion: BakedDispersion or BakedIndexDispersion
+                for refractive index based dispersions.
+        """
+        baked = (
+            dispersions.BakedIndexDispersion
+            if isinstance(self, IndexDispersion)
+            else dispersions.BakedDispersion
+        )
+        return baked(self, lbda, kind=kind, tolerance=tolerance, max_points=max_points)
 
     def get_refractive_index(self, lbda: Optional[npt.ArrayLike] = None) -> npt.NDArray:
         """Returns the refractive index for wavelength 'lbda' default unit (nm)
@@ -310,6 +686,35 @@ class IndexDispersion(BaseDispersion):
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         return self.refractive_index(lbda) ** 2
 
+    def refractive_index_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        """Returns the derivatives of the refractive index
+        with respect to each parameter of the model.
+        Models with analytic derivatives override this method,
+        for all other models the derivatives are approximated by central differences.
+
+        Args:
+            lbda (npt.ArrayLike, optional): The wavelengths (in nm) to use.
+                If None, the default spectral range is used.
+
+        Returns:
+            npt.NDArray: Jacobian of shape (wavelengths, parameters),
+                the parameters are ordered as in :meth:`get_batch_parameters`.
+        """
+        lbda = self.default_lbda_range if lbda is None else lbda
+        return self._finite_differences(lbda, self.refractive_index)
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        return (
+            2
+            * np.asarray(self.refractive_index(lbda))[..., np.newaxis]
+            * self.refractive_index_derivatives(lbda)
+        )
+
 
 class DispersionFactory:
     """A factory class for dispersion objects"""
@@ -361,6 +766,40 @@ class DispersionSum(Dispersion):
         self.dispersions.append(other)
         return self
 
+    def get_fingerprint(self) -> tuple:
+        return tuple(disp.get_fingerprint() for disp in self.dispersions)
+
+    def get_batch_parameters(self) -> List[Union[str, Tuple[str, int]]]:
+        return [
+            parameter
+            for disp in self.dispersions
+            for parameter in disp.get_batch_parameters()
+        ]
+
+    def get_batch_values(self) -> npt.NDArray:
+        return np.concatenate([disp.get_batch_values() for disp in self.dispersions])
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        return np.concatenate(
+            [disp.dielectric_derivatives(lbda) for disp in self.dispersions], axis=-1
+        )
+
+    @contextmanager
+    def _batch_parameters(self, params_array: npt.NDArray, ndim: int) -> Iterator[None]:
+        with ExitStack() as stack:
+            start = 0
+            for disp in self.dispersions:
+                stop = start + len(disp.get_batch_parameters())
+                stack.enter_context(
+                    disp._batch_parameters(params_array[:, start:stop], ndim)
+                )
+                start = stop
+
+            yield
+
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
         dielectric_function = sum(
             disp.dielectric_function(lbda) for disp in self.dispersions
@@ -406,6 +845,46 @@ class IndexDispersionSum(IndexDispersion):
         self.index_dispersions.append(other)
         return self
 
+    def get_fingerprint(self) -> tuple:
+        return tuple(disp.get_fingerprint() for disp in self.index_dispersions)
+
+    def get_batch_parameters(self) -> List[Union[str, Tuple[str, int]]]:
+        return [
+            parameter
+            for disp in self.index_dispersions
+            for parameter in disp.get_batch_parameters()
+        ]
+
+    def get_batch_values(self) -> npt.NDArray:
+        return np.concatenate(
+            [disp.get_batch_values() for disp in self.index_dispersions]
+        )
+
+    def refractive_index_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        return np.concatenate(
+            [
+                disp.refractive_index_derivatives(lbda)
+                for disp in self.index_dispersions
+            ],
+            axis=-1,
+        )
+
+    @contextmanager
+    def _batch_parameters(self, params_array: npt.NDArray, ndim: int) -> Iterator[None]:
+        with ExitStack() as stack:
+            start = 0
+            for disp in self.index_dispersions:
+                stop = start + len(disp.get_batch_parameters())
+                stack.enter_context(
+                    disp._batch_parameters(params_array[:, start:stop], ndim)
+                )
+                start = stop
+
+            yield
+
     def refractive_index(self, lbda: npt.ArrayLike) -> npt.NDArray:
         refractive_index = sum(
             disp.refractive_index(lbda) for disp in self.index_dispersions
@@ -1,6 +1,9 @@
 # Encoding: utf-8
 """Cauchy dispersion."""
 
+from typing import Optional
+
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import IndexDispersion
@@ -44,3 +47,20 @@ class Cauchy(IndexDispersion):
                 + 1e7 * self.single_params.get("k2") / lbda**4
             )
         )
+
+    def refractive_index_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        lbda = np.asarray(lbda)
+        return self._stack_derivatives(
+            lbda,
+            [
+                1,
+                1e2 / lbda**2,
+                1e7 / lbda**4,
+                1j,
+                1j * 1e2 / lbda**2,
+                1j * 1e7 / lbda**4,
+            ],
+        )
@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Cauchy dispersion with custom exponents."""
 
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import IndexDispersion
@@ -26,6 +27,7 @@ class CauchyCustomExponent(IndexDispersion):
     rep_params_template = {"f": 0, "e": 1}
 
     def refractive_index(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        return self.single_params.get("n0") + sum(
-            c.get("f") * lbda ** c.get("e") for c in self.rep_params
+        lbda = np.asarray(lbda)[..., np.newaxis]
+        return self.single_params.get("n0") + np.sum(
+            self.rep_params_dl["f"] * lbda ** self.rep_params_dl["e"], axis=-1
         )
@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Cauchy dispersion, with Urbach tail."""
 
+from typing import Optional
 import numpy as np
 import numpy.typing as npt
 
@@ -48,3 +49,26 @@ class CauchyUrbach(IndexDispersion):
                 (energy - self.single_params.get("Eg")) / self.single_params.get("Eu")
             )
         )
+
+    def refractive_index_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        energy = conversion_wavelength_energy(lbda)
+        urbach_tail = 1j * np.exp(
+            (energy - self.single_params.get("Eg")) / self.single_params.get("Eu")
+        )
+        absorption = self.single_params.get("D") * urbach_tail
+        return self._stack_derivatives(
+            lbda,
+            [
+                1,
+                energy**2,
+                energy**4,
+                urbach_tail,
+                -absorption / self.single_params.get("Eu"),
+                -absorption
+                * (energy - self.single_params.get("Eg"))
+                / self.single_params.get("Eu") ** 2,
+            ],
+        )
@@ -1,7 +1,7 @@
 # Encoding: utf-8
 """Cody-Lorentz dispersion law. Model by Ferlauto et al."""
 
-from typing import Dict
+from typing import Dict, Optional
 import numpy as np
 import numpy.typing as npt
 from scipy.interpolate import interp1d
@@ -45,6 +45,7 @@ class CodyLorentz(Dispersion):
         "Eu": 0.05,
     }
     rep_params_template: Dict[str, float] = {}
+    supports_parameter_arrays = False
 
     @staticmethod
     def eps2(E, Eg, A, Et, gamma, Ep, E0, Eu):
@@ -66,14 +67,108 @@ class CodyLorentz(Dispersion):
         )
         # fmt: on
 
-    def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        energy = conversion_wavelength_energy(lbda)
+    @staticmethod
+    def eps2_derivatives(E, Eg, A, Et, gamma, Ep, E0, Eu):
+        """The derivatives of the imaginary part of the cody lorentz dispersion
+        with respect to (Eg, A, Et, gamma, Ep, E0, Eu)"""
+
+        # pylint: disable=invalid-name
+        def G(E):
+            return (E - Eg) ** 2 / ((E - Eg) ** 2 + Ep**2)
+
+        def dG(E):
+            """Derivatives of G with respect to (E, Eg, Ep)"""
+            denominator = ((E - Eg) ** 2 + Ep**2) ** 2
+            return (
+                2 * (E - Eg) * Ep**2 / denominator,
+                -2 * (E - Eg) * Ep**2 / denominator,
+                -2 * (E - Eg) ** 2 * Ep / denominator,
+            )
+
+        def L(E):
+            return A * E0 * gamma * E / ((E**2 - E0**2) ** 2 + gamma**2 * E**2)
+
+        def dL(E):
+            """Derivatives of L with respect to (E, A, gamma, E0)"""
+            denominator = (E**2 - E0**2) ** 2 + gamma**2 * E**2
+            return (
+                A
+                * E0
+                * gamma
+                * (denominator - E * (4 * E * (E**2 - E0**2) + 2 * gamma**2 * E))
+                / denominator**2,
+                E0 * gamma * E / denominator,
+                A * E0 * E * (denominator - 2 * gamma**2 * E**2) / denominator**2,
+                A
+                * gamma
+                * E
+                * (denominator + 4 * E0**2 * (E**2 - E0**2))
+                / denominator**2,
+            )
+
+        def dGL(E):
+            """Derivatives of G * L with respect to (E, Eg, A, gamma, Ep, E0)"""
+            dG_dE, dG_dEg, dG_dEp = dG(E)
+            dL_dE, dL_dA, dL_dgamma, dL_dE0 = dL(E)
+            return (
+                dG_dE * L(E) + G(E) * dL_dE,
+                dG_dEg * L(E),
+                G(E) * dL_dA,
+                G(E) * dL_dgamma,
+                dG_dEp * L(E),
+                G(E) * dL_dE0,
+            )
+
+        E1 = Et * G(Et) * L(Et)
+        dE1_dEt, dE1_dEg, dE1_dA, dE1_dgamma, dE1_dEp, dE1_dE0 = dGL(Et)
+        dE1_dEt = G(Et) * L(Et) + Et * dE1_dEt
+
+        urbach = np.exp((E - Et) / Eu) / E * np.heaviside(Et - E, 1)
+        lorentz = np.heaviside(E - Et, 0)
+        _, dGL_dEg, dGL_dA, dGL_dgamma, dGL_dEp, dGL_dE0 = dGL(E)
 
+        return (
+            Et * dE1_dEg * urbach + dGL_dEg * lorentz,
+            Et * dE1_dA * urbach + dGL_dA * lorentz,
+            (dE1_dEt - E1 / Eu) * urbach,
+            Et * dE1_dgamma * urbach + dGL_dgamma * lorentz,
+            Et * dE1_dEp * urbach + dGL_dEp * lorentz,
+            Et * dE1_dE0 * urbach + dGL_dE0 * lorentz,
+            -E1 * (E - Et) / Eu**2 * urbach,
+        )
+
+    def _precompute(self) -> dict:
         lbda_broad = np.linspace(50, 10000, 1000)
         energy_padded = conversion_wavelength_energy(lbda_broad)
         eps1 = im2re_reciprocal(
             CodyLorentz.eps2(energy_padded, **self.single_params), lbda_broad
         )
-        eps1_interp = interp1d(lbda_broad, eps1)(lbda)
+
+        return {"eps1": interp1d(lbda_broad, eps1)}
+
+    def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        energy = conversion_wavelength_energy(lbda)
+        eps1_interp = self._get_precomputed()["eps1"](lbda)
 
         return eps1_interp + 1j * CodyLorentz.eps2(energy, **self.single_params)
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        energy = conversion_wavelength_energy(lbda)
+
+        # The Kramers-Kronig relation is linear,
+        # so the real parts are the transformations of the imaginary derivatives
+        lbda_broad = np.linspace(50, 10000, 1000)
+        energy_padded = conversion_wavelength_energy(lbda_broad)
+        deps1 = im2re_reciprocal(
+            np.array(CodyLorentz.eps2_derivatives(energy_padded, **self.single_params)),
+            lbda_broad,
+        )
+        deps1_interp = interp1d(lbda_broad, deps1)(lbda)
+        deps2 = CodyLorentz.eps2_derivatives(energy, **self.single_params)
+
+        return self._stack_derivatives(
+            lbda, [re + 1j * im for re, im in zip(deps1_interp, deps2)]
+        )
@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Drude dispersion model with parameters in units of energy."""
 
+from typing import Optional
 import numpy.typing as npt
 
 from ..utils import conversion_wavelength_energy
@@ -34,3 +35,17 @@ class DrudeEnergy(Dispersion):
         return self.single_params.get("A") / (
             energy**2 - 1j * self.single_params.get("gamma") * energy
         )
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        energy = conversion_wavelength_energy(lbda)
+        denominator = energy**2 - 1j * self.single_params.get("gamma") * energy
+        return self._stack_derivatives(
+            lbda,
+            [
+                1 / denominator,
+                1j * self.single_params.get("A") * energy / denominator**2,
+            ],
+        )
@@ -1,7 +1,7 @@
 # Encoding: utf-8
 """Constant epsilon infinity."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -26,3 +26,9 @@ class EpsilonInf(Dispersion):
 
     def dielectric_function(self, _: npt.ArrayLike) -> npt.NDArray:
         return self.single_params.get("eps")
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        return self._stack_derivatives(lbda, [1])
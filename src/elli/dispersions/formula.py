@@ -7,7 +7,7 @@ import numpy.typing as npt
 
 from elli.units import ureg
 from elli.dispersions.base_dispersion import BaseDispersion, Dispersion, IndexDispersion
-from elli.formula_parser.parser import parse_formula, FormulaTransformer
+from elli.formula_parser.parser import compile_formula, parse_formula
 
 
 class FormulaParser(BaseDispersion):
@@ -62,13 +62,6 @@ class FormulaParser(BaseDispersion):
         for rep_params_set in rep_params_sets:
             self.add(**rep_params_set)
 
-        self.rep_params_dl = {}
-        if self.rep_params:
-            self.rep_params_dl = {
-                k: np.array([dic[k] for dic in self.rep_params])
-                for k in self.rep_params[0]
-            }
-
         self.formula = formula
 
         self._check_repr()
@@ -109,12 +102,12 @@ class FormulaParser(BaseDispersion):
             )
 
     def __dispersion_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        return FormulaTransformer(
-            x_axis_name=self.f_axis_name,
-            x_axis_values=lbda,
-            single_params=self.single_params,
-            repeated_params=self.rep_params_dl,
-        ).transform(parse_formula(self.formula))[1]
+        return compile_formula(
+            self.formula,
+            self.f_axis_name,
+            tuple(self.single_params),
+            tuple(self.rep_params_dl),
+        )(lbda, self.single_params, self.rep_params_dl)
 
 
 class Formula(Dispersion, FormulaParser):
@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Dispersion law with gaussian oscillators."""
 
+from typing import Optional
 import numpy as np
 import numpy.typing as npt
 from numpy.lib.scimath import sqrt
@@ -52,22 +53,52 @@ class Gaussian(Dispersion):
     rep_params_template = {"A": 1, "E": 1, "sigma": 1}
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        energy = conversion_wavelength_energy(lbda)
+        energy = np.asarray(conversion_wavelength_energy(lbda))[..., np.newaxis]
         ftos = 2 * sqrt(np.log(2))
-        return sum(
-            2
-            * c.get("A")
-            / sqrt(np.pi)
-            * (
-                dawsn(ftos * (energy + c.get("E")) / c.get("sigma"))
-                - dawsn(ftos * (energy - c.get("E")) / c.get("sigma"))
-            )
-            + 1j
-            * (
-                c.get("A")
-                * np.exp(-((ftos * (energy - c.get("E")) / c.get("sigma")) ** 2))
-                - c.get("A")
-                * np.exp(-((ftos * (energy + c.get("E")) / c.get("sigma")) ** 2))
-            )
-            for c in self.rep_params
+        amplitude = self.rep_params_dl["A"]
+        scale = ftos / self.rep_params_dl["sigma"]
+        x_plus = (energy + self.rep_params_dl["E"]) * scale
+        x_minus = (energy - self.rep_params_dl["E"]) * scale
+        return np.sum(
+            2 * amplitude / sqrt(np.pi) * (dawsn(x_plus) - dawsn(x_minus))
+            + 1j * amplitude * (np.exp(-(x_minus**2)) - np.exp(-(x_plus**2))),
+            axis=-1,
+        )
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        energy = np.asarray(conversion_wavelength_energy(lbda))[..., np.newaxis]
+        ftos = 2 * sqrt(np.log(2))
+        amplitude = self.rep_params_dl["A"]
+        sigma = self.rep_params_dl["sigma"]
+        scale = ftos / sigma
+        x_plus = (energy + self.rep_params_dl["E"]) * scale
+        x_minus = (energy - self.rep_params_dl["E"]) * scale
+        dawsn_plus, dawsn_minus = dawsn(x_plus), dawsn(x_minus)
+        exp_plus, exp_minus = np.exp(-(x_plus**2)), np.exp(-(x_minus**2))
+
+        # The derivative of the Dawson function F(x) is 1 - 2 x F(x)
+        slope_plus = 1 - 2 * x_plus * dawsn_plus
+        slope_minus = 1 - 2 * x_minus * dawsn_minus
+
+        return self._stack_derivatives(
+            lbda,
+            [],
+            [
+                2 / sqrt(np.pi) * (dawsn_plus - dawsn_minus)
+                + 1j * (exp_minus - exp_plus),
+                2 * amplitude / sqrt(np.pi) * (slope_plus + slope_minus) * scale
+                + 2j * amplitude * (x_minus * exp_minus + x_plus * exp_plus) * scale,
+                2
+                * amplitude
+                / sqrt(np.pi)
+                * (x_minus * slope_minus - x_plus * slope_plus)
+                / sigma
+                + 2j
+                * amplitude
+                * (x_minus**2 * exp_minus - x_plus**2 * exp_plus)
+                / sigma,
+            ],
         )
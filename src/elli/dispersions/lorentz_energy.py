@@ -1,6 +1,8 @@
 # Encoding: utf-8
 """Lorentz dispersion law with parameters in units of energy."""
 
+from typing import Optional
+import numpy as np
 import numpy.typing as npt
 
 from ..utils import conversion_wavelength_energy
@@ -30,8 +32,30 @@ class LorentzEnergy(Dispersion):
     rep_params_template = {"A": 1, "E": 0, "gamma": 0}
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        energy = conversion_wavelength_energy(lbda)
-        return 1 + sum(
-            c.get("A") / (c.get("E") ** 2 - energy**2 - 1j * c.get("gamma") * energy)
-            for c in self.rep_params
+        energy = np.asarray(conversion_wavelength_energy(lbda))[..., np.newaxis]
+        amplitude = self.rep_params_dl["A"]
+        resonance = self.rep_params_dl["E"]
+        gamma = self.rep_params_dl["gamma"]
+        return 1 + np.sum(
+            amplitude / (resonance**2 - energy**2 - 1j * gamma * energy), axis=-1
+        )
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        energy = np.asarray(conversion_wavelength_energy(lbda))[..., np.newaxis]
+        amplitude = self.rep_params_dl["A"]
+        resonance = self.rep_params_dl["E"]
+        denominator = (
+            resonance**2 - energy**2 - 1j * self.rep_params_dl["gamma"] * energy
+        )
+        return self._stack_derivatives(
+            lbda,
+            [],
+            [
+                1 / denominator,
+                -2 * amplitude * resonance / denominator**2,
+                1j * amplitude * energy / denominator**2,
+            ],
         )
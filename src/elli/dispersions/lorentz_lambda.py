@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Lorentz dispersion law with parameters in units of wavelengths."""
 
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -31,9 +32,10 @@ class LorentzLambda(Dispersion):
     rep_params_template = {"A": 1, "lambda_r": 0, "gamma": 0}
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        return 1 + sum(
-            c.get("A")
-            * lbda**2
-            / (lbda**2 - c.get("lambda_r") ** 2 - 1j * c.get("gamma") * lbda)
-            for c in self.rep_params
+        lbda = np.asarray(lbda)[..., np.newaxis]
+        amplitude = self.rep_params_dl["A"]
+        lambda_r = self.rep_params_dl["lambda_r"]
+        gamma = self.rep_params_dl["gamma"]
+        return 1 + np.sum(
+            amplitude * lbda**2 / (lbda**2 - lambda_r**2 - 1j * gamma * lbda), axis=-1
         )
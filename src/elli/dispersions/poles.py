@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Dispersion law for an UV and IR pole."""
 
+from typing import Optional
 import numpy.typing as npt
 
 from ..utils import conversion_wavelength_energy
@@ -33,3 +34,21 @@ class Poles(Dispersion):
         return self.single_params.get("A_ir") / energy**2 + self.single_params.get(
             "A_uv"
         ) / (self.single_params.get("E_uv") ** 2 - energy**2)
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        energy = conversion_wavelength_energy(lbda)
+        energy_uv = self.single_params.get("E_uv")
+        return self._stack_derivatives(
+            lbda,
+            [
+                1 / energy**2,
+                1 / (energy_uv**2 - energy**2),
+                -2
+                * self.single_params.get("A_uv")
+                * energy_uv
+                / (energy_uv**2 - energy**2) ** 2,
+            ],
+        )
@@ -1,6 +1,8 @@
 # Encoding: utf-8
 """Polynomial dispersion."""
 
+from typing import Optional
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -26,6 +28,19 @@ class Polynomial(Dispersion):
     rep_params_template = {"f": 0, "e": 0}
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        return self.single_params.get("e0") + sum(
-            c.get("f") * lbda ** c.get("e") for c in self.rep_params
+        lbda = np.asarray(lbda)[..., np.newaxis]
+        return self.single_params.get("e0") + np.sum(
+            self.rep_params_dl["f"] * lbda ** self.rep_params_dl["e"], axis=-1
+        )
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        lbda_osc = np.asarray(lbda)[..., np.newaxis]
+        power = lbda_osc ** self.rep_params_dl["e"]
+        return self._stack_derivatives(
+            lbda,
+            [1],
+            [power, self.rep_params_dl["f"] * power * np.log(lbda_osc)],
         )
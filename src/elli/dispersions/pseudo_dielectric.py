@@ -4,9 +4,9 @@
 from typing import Union
 import numpy as np
 import numpy.typing as npt
-from scipy.interpolate import interp1d
 
 from .base_dispersion import Dispersion, InvalidParameters
+from .table_interpolation import TableInterpolation
 
 
 class PseudoDielectricFunction(Dispersion):
@@ -54,7 +54,7 @@ class PseudoDielectricFunction(Dispersion):
             1 + np.tan(theta) ** 2 * ((1 - rho) / (1 + rho)) ** 2
         )
 
-        self.interpolation = interp1d(
+        self.interpolation = TableInterpolation(
             self.single_params.get("lbda"),
             eps,
             kind="cubic",
@@ -1,6 +1,8 @@
 # Encoding: utf-8
 """Sellmeier dispersion."""
 
+from typing import Optional
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -28,7 +30,23 @@ class Sellmeier(Dispersion):
     rep_params_template = {"A": 0, "B": 0}
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        lbda = lbda / 1e3
-        return 1 + sum(
-            c.get("A") * lbda**2 / (lbda**2 - c.get("B")) for c in self.rep_params
+        lbda = np.asarray(lbda)[..., np.newaxis] / 1e3
+        amplitude = self.rep_params_dl["A"]
+        resonance = self.rep_params_dl["B"]
+        return 1 + np.sum(amplitude * lbda**2 / (lbda**2 - resonance), axis=-1)
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        lbda_um = np.asarray(lbda)[..., np.newaxis] / 1e3
+        amplitude = self.rep_params_dl["A"]
+        resonance = self.rep_params_dl["B"]
+        return self._stack_derivatives(
+            lbda,
+            [],
+            [
+                lbda_um**2 / (lbda_um**2 - resonance),
+                amplitude * lbda_um**2 / (lbda_um**2 - resonance) ** 2,
+            ],
         )
@@ -1,6 +1,7 @@
 # Encoding: utf-8
 """Sellmeier dispersion."""
 
+import numpy as np
 import numpy.typing as npt
 
 from .base_dispersion import Dispersion
@@ -30,8 +31,11 @@ class SellmeierCustomExponent(Dispersion):
     rep_params_template = {"A": 0, "e_A": 1, "B": 0, "e_B": 1}
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        lbda = lbda / 1e3
-        return sum(
-            c.get("A") * lbda ** c.get("e_A") / (lbda**2 - c.get("B") ** c.get("e_B"))
-            for c in self.rep_params
+        lbda = np.asarray(lbda)[..., np.newaxis] / 1e3
+        params = self.rep_params_dl
+        return np.sum(
+            params["A"]
+            * lbda ** params["e_A"]
+            / (lbda**2 - params["B"] ** params["e_B"]),
+            axis=-1,
         )
@@ -3,10 +3,10 @@
 
 from typing import Any, Dict, Union
 import numpy.typing as npt
-import scipy.interpolate
 
 from .epsilon_inf import EpsilonInf
 from .base_dispersion import Dispersion, InvalidParameters, DispersionSum
+from .table_interpolation import TableInterpolation
 
 
 class TableEpsilon(Dispersion):
@@ -46,7 +46,7 @@ class TableEpsilon(Dispersion):
                 "Wavelength and epsilon arrays must have the same length."
             )
 
-        self.interpolation = scipy.interpolate.interp1d(
+        self.interpolation = TableInterpolation(
             self.single_params.get("lbda"),
             self.single_params.get("epsilon"),
             kind=self.kind,
@@ -3,11 +3,11 @@
 
 from typing import Union
 import numpy.typing as npt
-import scipy.interpolate
 
 from elli.dispersions.constant_refractive_index import ConstantRefractiveIndex
 
 from .base_dispersion import IndexDispersion, IndexDispersionSum, InvalidParameters
+from .table_interpolation import TableInterpolation
 
 
 class Table(IndexDispersion):
@@ -45,7 +45,7 @@ class Table(IndexDispersion):
                 "Wavelength and refractive index arrays must have the same length."
             )
 
-        self.interpolation = scipy.interpolate.interp1d(
+        self.interpolation = TableInterpolation(
             self.single_params.get("lbda"),
             self.single_params.get("n"),
             kind=self.kind,
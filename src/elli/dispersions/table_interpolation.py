@@ -0,0 +1,138 @@
+# Encoding: utf-8
+"""Interpolation of tabulated dispersion values on fixed wavelength grids."""
+
+from collections import OrderedDict
+from typing import Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+import scipy.interpolate
+import scipy.sparse
+
+SPLINE_ORDERS = {"zero": 0, "slinear": 1, "quadratic": 2, "cubic": 3}
+
+
+class TableInterpolation:
+    """Interpolation of tabulated values, as done by scipy.interpolate.interp1d.
+
+    Linear and spline interpolations cache the indices of the bracketing table values
+    and their weights for the wavelength grids they are evaluated on.
+    As fits evaluate the same grid over and over again,
+    an evaluation is reduced to gathering the table values and a multiply-add,
+    or a sparse matrix product for splines.
+    Other kinds of interpolation are passed to interp1d.
+    """
+
+    def __init__(
+        self,
+        x: npt.ArrayLike,
+        y: npt.ArrayLike,
+        kind: str = "linear",
+        cache_size: int = 8,
+    ) -> None:
+        """Creates an interpolation of the table values.
+
+        Args:
+            x (npt.ArrayLike): Table wavelengths.
+            y (npt.ArrayLike): Table values.
+            kind (str, optional): Type of interpolation
+                (see scipy.interpolate.interp1d for more information). Defaults to 'linear'.
+            cache_size (int, optional): Number of wavelength grids to keep the indices
+                and weights for. Defaults to 8.
+        """
+        if cache_size < 0:
+            raise ValueError("Cache size needs to be 0 or more.")
+
+        self.kind = kind
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+        self._interp1d = scipy.interpolate.interp1d(x, y, kind=kind)
+        self.x = self._interp1d.x
+        self.y = self._interp1d.y
+
+        if kind == "linear":
+            self._values = self.y[:-1]
+            self._slopes = (self.y[1:] - self.y[:-1]) / (self.x[1:] - self.x[:-1])
+        elif kind in SPLINE_ORDERS:
+            spline = scipy.interpolate.make_interp_spline(
+                self.x, self.y, k=SPLINE_ORDERS[kind]
+            )
+            self._knots = spline.t
+            self._coefficients = spline.c
+
+    def __call__(self, x_new: npt.ArrayLike) -> npt.NDArray:
+        """Interpolates the table values.
+
+        Args:
+            x_new (npt.ArrayLike): Wavelengths to interpolate.
+
+        Returns:
+            npt.NDArray: Interpolated values.
+        """
+        if self.kind != "linear" and self.kind not in SPLINE_ORDERS:
+            return self._interp1d(x_new)
+
+        x_new = np.asarray(x_new, dtype=np.float64)
+        weights = self.get_weights(x_new)
+
+        if self.kind == "linear":
+            indices, offsets = weights
+            values = self._slopes[indices] * offsets + self._values[indices]
+        else:
+            values = weights @ self._coefficients
+
+        return values.reshape(x_new.shape)
+
+    def get_weights(
+        self, x_new: npt.NDArray
+    ) -> Union[Tuple[npt.NDArray, npt.NDArray], scipy.sparse.csr_array]:
+        """Returns the cached weights of the table values for the wavelengths.
+        For linear interpolation these are the indices of the intervals
+        and the offsets of the wavelengths inside them,
+        for splines the sparse matrix of the basis functions at the wavelengths.
+
+        Args:
+            x_new (npt.NDArray): Wavelengths to interpolate.
+
+        Returns:
+            Union[Tuple[npt.NDArray, npt.NDArray], scipy.sparse.csr_array]:
+                Indices and offsets or basis function matrix.
+        """
+        key = (x_new.shape, x_new.tobytes())
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        x_flat = x_new.ravel()
+        self._check_bounds(x_flat)
+
+        if self.kind == "linear":
+            indices = np.searchsorted(self.x, x_flat).clip(1, len(self.x) - 1) - 1
+            weights = (indices, x_flat - self.x[indices])
+        else:
+            weights = scipy.interpolate.BSpline.design_matrix(
+                x_flat, self._knots, SPLINE_ORDERS[self.kind]
+            )
+
+        if self.cache_size > 0:
+            self._cache[key] = weights
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return weights
+
+    def _check_bounds(self, x_new: npt.NDArray) -> None:
+        below_bounds = x_new < self.x[0]
+        if below_bounds.any():
+            raise ValueError(
+                f"A value ({x_new[np.argmax(below_bounds)]}) in x_new is below "
+                f"the interpolation range's minimum value ({self.x[0]})."
+            )
+
+        above_bounds = x_new > self.x[-1]
+        if above_bounds.any():
+            raise ValueError(
+                f"A value ({x_new[np.argmax(above_bounds)]}) in x_new is above "
+                f"the interpolation range's maximum value ({self.x[-1]})."
+            )
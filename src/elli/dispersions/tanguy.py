@@ -1,6 +1,8 @@
 # Encoding: utf-8
 """Fractional dimensional Tanguy model."""
 
+from typing import Callable, Optional
+
 import numpy as np
 import numpy.typing as npt
 from numpy.lib.scimath import sqrt
@@ -12,6 +14,54 @@ from ..utils import conversion_wavelength_energy
 from .base_dispersion import Dispersion
 
 
+def _digamma(z: npt.ArrayLike) -> npt.NDArray:
+    """Digamma function for complex arguments, several times faster than
+    scipy.special.digamma for arrays. Uses the recurrence relation to shift the argument
+    to the asymptotic expansion and the reflection formula for Re(z) < 1/2."""
+    z = np.asarray(z, dtype=np.complex128)
+    reflect = z.real < 0.5
+    w = np.where(reflect, 1 - z, z)
+
+    result = np.zeros_like(w)
+    for _ in range(10):
+        result -= 1 / w
+        w = w + 1
+    w2 = 1 / w**2
+    result += (
+        np.log(w)
+        - 1 / (2 * w)
+        - w2 * (1 / 12 - w2 * (1 / 120 - w2 * (1 / 252 - w2 * (1 / 240 - w2 / 132))))
+    )
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        return np.where(reflect, result - np.pi / np.tan(np.pi * z), result)
+
+
+def _trigamma(z: npt.ArrayLike) -> npt.NDArray:
+    """Trigamma function for complex arguments, which are not supported by
+    scipy.special.polygamma. Uses the recurrence relation to shift the argument
+    to the asymptotic expansion and the reflection formula for Re(z) < 1/2."""
+    z = np.asarray(z, dtype=np.complex128)
+    reflect = z.real < 0.5
+    w = np.where(reflect, 1 - z, z)
+
+    result = np.zeros_like(w)
+    for _ in range(10):
+        result += 1 / w**2
+        w = w + 1
+    result += (
+        1 / w
+        + 1 / (2 * w**2)
+        + 1 / (6 * w**3)
+        - 1 / (30 * w**5)
+        + 1 / (42 * w**7)
+        - 1 / (30 * w**9)
+    )
+
+    with np.errstate(over="ignore"):
+        return np.where(reflect, np.pi**2 / np.sin(np.pi * z) ** 2 - result, result)
+
+
 class Tanguy(Dispersion):
     r"""Fractional dimensional Tanguy model.
     This model is an analytical expression of Wannier excitons, including
@@ -51,40 +101,151 @@ class Tanguy(Dispersion):
     }
     rep_params_template = {}
 
-    def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        E = conversion_wavelength_energy(lbda)
+    def _precompute(self) -> dict:
         A = self.single_params.get("A")
         d = self.single_params.get("d")
+        R = self.single_params.get("R")
+        Eg = self.single_params.get("Eg")
+        g = Tanguy.g_function(d)
+
+        return {
+            "amplitude": A * R ** (d / 2 - 1),
+            "g": g,
+            "g_0": g(Tanguy.xsi(0, R, Eg)),
+        }
+
+    def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        E = conversion_wavelength_energy(lbda)
         gam = self.single_params.get("gamma")
         R = self.single_params.get("R")
         Eg = self.single_params.get("Eg")
         a = self.single_params.get("a")
         b = self.single_params.get("b")
+        precomputed = self._get_precomputed()
+        g = precomputed["g"]
 
+        z = E + 1j * gam
         return (
             1
             + a / (b - E**2)
-            + A
-            * R ** (d / 2 - 1)
-            / (E + 1j * gam) ** 2
+            + precomputed["amplitude"]
+            / z**2
             * (
-                Tanguy.g(Tanguy.xsi(E + 1j * gam, R, Eg), d)
-                + Tanguy.g(Tanguy.xsi(-E - 1j * gam, R, Eg), d)
-                - 2 * Tanguy.g(Tanguy.xsi(E * 0, R, Eg), d)
+                g(Tanguy.xsi(z, R, Eg))
+                + g(Tanguy.xsi(-z, R, Eg))
+                - 2 * precomputed["g_0"]
             )
         )
 
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        E = conversion_wavelength_energy(lbda)
+        A = self.single_params.get("A")
+        d = self.single_params.get("d")
+        gam = self.single_params.get("gamma")
+        R = self.single_params.get("R")
+        Eg = self.single_params.get("Eg")
+        a = self.single_params.get("a")
+        b = self.single_params.get("b")
+
+        points = (E + 1j * gam, -E - 1j * gam, E * 0)
+        weights = (1, 1, -2)
+        xsis = [Tanguy.xsi(z, R, Eg) for z in points]
+        exciton = sum(w * Tanguy.g(xsi, d) for w, xsi in zip(weights, xsis))
+        prefactor = R ** (d / 2 - 1) / (E + 1j * gam) ** 2
+
+        # dxsi/dz = xsi / (2 (Eg - z)), dxsi/dEg = -dxsi/dz and dxsi/dR = xsi / (2 R)
+        slopes = [
+            w * Tanguy.g_derivative(xsi, d) * xsi / 2 for w, xsi in zip(weights, xsis)
+        ]
+        dexciton_dR = sum(slopes) / R
+        dexciton_dEg = -sum(slope / (Eg - z) for slope, z in zip(slopes, points))
+        dexciton_dgamma = 1j * (
+            slopes[0] / (Eg - points[0]) - slopes[1] / (Eg - points[1])
+        )
+
+        if d in (2, 3):
+            # The derivative follows the non-integer form, which is used around d.
+            # For d = 2 its limit is the closed form divided by pi.
+            exciton_d = exciton / np.pi if d == 2 else exciton
+            g_d_derivative = Tanguy.g_integer_d_derivative
+        else:
+            exciton_d = exciton
+            g_d_derivative = Tanguy.g_fractional_d_derivative
+        dexciton_dd = sum(w * g_d_derivative(xsi, d) for w, xsi in zip(weights, xsis))
+
+        return self._stack_derivatives(
+            lbda,
+            [
+                prefactor * exciton,
+                A * prefactor * (np.log(R) / 2 * exciton_d + dexciton_dd),
+                A * prefactor * (dexciton_dgamma - 2j / (E + 1j * gam) * exciton),
+                A * prefactor * ((d / 2 - 1) / R * exciton + dexciton_dR),
+                A * prefactor * dexciton_dEg,
+                1 / (b - E**2),
+                -a / (b - E**2) ** 2,
+            ],
+        )
+
     @staticmethod
     def xsi(z, R, Eg):
         return sqrt(R / (Eg - z))
 
     @staticmethod
     def g(xsi, d):
+        return Tanguy.g_function(d)(xsi)
+
+    @staticmethod
+    def g_function(d) -> Callable[[npt.NDArray], npt.NDArray]:
+        """Returns g as a function of xsi for the dimensionality d,
+        with the terms depending only on d calculated in advance."""
+        if np.ndim(d) > 0:
+            # Arrays of dimensionalities, e.g. for batches of parameter sets
+            g_2, g_3, g_fractional = (
+                Tanguy.g_function(2),
+                Tanguy.g_function(3),
+                Tanguy.g_fractional_function(np.where((d == 2) | (d == 3), 2.5, d)),
+            )
+
+            def g_select(xsi):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    return np.select(
+                        [d == 2, d == 3], [g_2(xsi), g_3(xsi)], g_fractional(xsi)
+                    )
+
+            return g_select
+
         if d == 2:
-            return 2 * np.log(xsi) - 2 * digamma(0.5 - xsi)
+            return lambda xsi: 2 * np.log(xsi) - 2 * _digamma(0.5 - xsi)
         if d == 3:
-            return 2 * np.log(xsi) - 2 * digamma(1 - xsi) - 1 / xsi
+            return lambda xsi: 2 * np.log(xsi) - 2 * _digamma(1 - xsi) - 1 / xsi
 
+        return Tanguy.g_fractional_function(d)
+
+    @staticmethod
+    def g_fractional(xsi, d):
+        return Tanguy.g_fractional_function(d)(xsi)
+
+    @staticmethod
+    def g_fractional_function(d) -> Callable[[npt.NDArray], npt.NDArray]:
+        """Returns g as a function of xsi for non-integer d"""
+        D = d - 1
+        factor = 2 * np.pi / gamma(D / 2) ** 2
+        cot_D = 1 / np.tan(np.pi * D)
+
+        return lambda xsi: (
+            factor
+            * gamma(D / 2 + xsi)
+            / gamma(1 - D / 2 + xsi)
+            / xsi ** (d - 2)
+            * (1 / np.tan(np.pi * (D / 2 - xsi)) - cot_D)
+        )
+
+    @staticmethod
+    def g_prefactor(xsi, d):
+        """Prefactor of g for non-integer d"""
         D = d - 1
         return (
             2
@@ -93,5 +254,61 @@ class Tanguy(Dispersion):
             / gamma(D / 2) ** 2
             / gamma(1 - D / 2 + xsi)
             / xsi ** (d - 2)
-            * (1 / np.tan(np.pi * (D / 2 - xsi)) - 1 / np.tan(np.pi * D))
+        )
+
+    @staticmethod
+    def g_derivative(xsi, d):
+        """Derivative of g with respect to xsi"""
+        if d == 2:
+            return 2 / xsi + 2 * _trigamma(0.5 - xsi)
+        if d == 3:
+            return 2 / xsi + 2 * _trigamma(1 - xsi) + 1 / xsi**2
+
+        D = d - 1
+        return (
+            Tanguy.g_fractional(xsi, d)
+            * (digamma(D / 2 + xsi) - digamma(1 - D / 2 + xsi) - (d - 2) / xsi)
+            + Tanguy.g_prefactor(xsi, d) * np.pi / np.sin(np.pi * (D / 2 - xsi)) ** 2
+        )
+
+    @staticmethod
+    def g_integer_d_derivative(xsi, d):
+        """Derivative of g with respect to the dimensionality d for d = 2 or d = 3,
+        up to terms independent of xsi, which cancel in the dielectric function.
+
+        The non-integer g diverges for integer d by a term independent of xsi.
+        Expanding it around d to second order yields the derivative
+        P (L' C + C' - (L'' + L'^2) / (2 pi)),
+        with the constant prefactor P, the first and second derivatives L', L''
+        of its logarithm and the cotangent C with its derivative C'."""
+        D = d - 1
+        P = 2 if d == 2 else 2 * np.pi
+        L_1 = (
+            _digamma(D / 2 + xsi) / 2
+            - _digamma(D / 2)
+            + _digamma(1 - D / 2 + xsi) / 2
+            - np.log(xsi)
+        )
+        L_2 = (
+            _trigamma(D / 2 + xsi) / 4
+            - _trigamma(D / 2) / 2
+            - _trigamma(1 - D / 2 + xsi) / 4
+        )
+        C = 1 / np.tan(np.pi * (D / 2 - xsi))
+        C_1 = -np.pi / 2 / np.sin(np.pi * (D / 2 - xsi)) ** 2
+
+        return P * (L_1 * C + C_1 - (L_2 + L_1**2) / (2 * np.pi))
+
+    @staticmethod
+    def g_fractional_d_derivative(xsi, d):
+        """Derivative of g with respect to the dimensionality d for non-integer d"""
+        D = d - 1
+        return Tanguy.g_fractional(xsi, d) * (
+            digamma(D / 2 + xsi) / 2
+            - digamma(D / 2)
+            + digamma(1 - D / 2 + xsi) / 2
+            - np.log(xsi)
+        ) + Tanguy.g_prefactor(xsi, d) * (
+            np.pi / np.sin(np.pi * D) ** 2
+            - np.pi / 2 / np.sin(np.pi * (D / 2 - xsi)) ** 2
         )
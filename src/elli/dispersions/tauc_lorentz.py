@@ -1,6 +1,8 @@
 # Encoding: utf-8
 """Tauc-Lorentz dispersion law. Model by Jellison and Modine."""
 
+from typing import Optional
+
 import numpy as np
 import numpy.typing as npt
 from numpy.lib.scimath import sqrt
@@ -34,39 +36,224 @@ class TaucLorentz(Dispersion):
 
     @staticmethod
     def eps1(E, Eg, Ai, Ei, Ci):
-        gamma2 = sqrt(Ei**2 - Ci**2 / 2) ** 2
+        return TaucLorentz.eps1_kernel(E, TaucLorentz.eps1_constants(Eg, Ai, Ei, Ci))
+
+    @staticmethod
+    def eps1_constants(Eg, Ai, Ei, Ci) -> dict:
+        """The terms of the real part, which don't depend on the energy"""
+        gamma2 = Ei**2 - Ci**2 / 2
+        alpha = sqrt(4 * Ei**2 - Ci**2)
+        log_root = np.log(sqrt((Ei**2 - Eg**2) ** 2 + Eg**2 * Ci**2))
+
+        # fmt: off
+        k1 = Ai*Ci/2.0/np.pi/alpha/Ei*np.log((Ei**2 + Eg**2 + alpha*Eg)/(Ei**2 + Eg**2 - alpha*Eg))
+        k2 = Ai/np.pi/Ei*(np.pi - np.arctan((2.0*Eg + alpha)/Ci) + np.arctan((alpha - 2.0*Eg)/Ci))
+        k3 = 2.0*Ai*Ei*Eg/np.pi/alpha*(np.pi + 2.0*np.arctan(2.0/alpha/Ci*(gamma2 - Eg**2)))
+        k4 = Ai*Ei*Ci/np.pi
+        k5 = 2.0*Ai*Ei*Ci*Eg/np.pi
+        # fmt: on
+
+        # aL and aA are quadratic in E
+        return {
+            "Eg": Eg,
+            "gamma2": gamma2,
+            "zeta4_offset": alpha**2 * Ci**2 / 4,
+            "E2_coefficient": (Eg**2 - Ei**2) * k1 - (Ei**2 + Eg**2) * k2 + k3,
+            "offset": (Eg**2 * Ci**2 - Ei**2 * (Ei**2 + 3 * Eg**2)) * k1
+            - (Eg**2 * Ci**2 - Ei**2 * (Ei**2 + Eg**2)) * k2
+            - gamma2 * k3
+            - k5 * log_root,
+            "k4": k4,
+            "k5": k5,
+        }
+
+    @staticmethod
+    def eps1_kernel(E, constants: dict):
+        """The real part for the terms precalculated by :meth:`eps1_constants`"""
+        Eg = constants["Eg"]
+        E2 = E**2
+        log_minus = np.log(abs(E - Eg))
+        log_plus = np.log(E + Eg)
+        zeta4 = (E2 - constants["gamma2"]) ** 2 + constants["zeta4_offset"]
+
+        return (
+            constants["E2_coefficient"] * E2
+            + constants["offset"]
+            - constants["k4"] * (E2 + Eg**2) / E * (log_minus - log_plus)
+            + constants["k5"] * (log_minus + log_plus)
+        ) / zeta4
+
+    @staticmethod
+    def eps2(E, Eg, Ai, Ei, Ci):
+        return (
+            Ai
+            * Ei
+            * Ci
+            * (E - Eg) ** 2
+            / ((E**2 - Ei**2) ** 2 + Ci**2 * E**2)
+            / E
+            * np.heaviside(E - Eg, 0)
+        )
+
+    @staticmethod
+    def eps_derivative(E, Eg, Ai, Ei, Ci, dEg, dEi, dCi):
+        """Derivative of the dielectric function of the oscillators
+        in the direction (dEg, dEi, dCi) of the parameters (Eg, Ei, Ci)."""
+
+        def quotient(N, dN, D, dD):
+            return (dN - N / D * dD) / D
+
+        gamma2 = Ei**2 - Ci**2 / 2
+        dgamma2 = 2 * Ei * dEi - Ci * dCi
         alpha = sqrt(4 * Ei**2 - Ci**2)
+        dalpha = (4 * Ei * dEi - Ci * dCi) / alpha
         aL = (Eg**2 - Ei**2) * E**2 + Eg**2 * Ci**2 - Ei**2 * (Ei**2 + 3 * Eg**2)
+        daL = (
+            2 * (Eg * dEg - Ei * dEi) * E**2
+            + 2 * Eg * Ci * (dEg * Ci + Eg * dCi)
+            - 4 * Ei**3 * dEi
+            - 6 * Ei * Eg * (dEi * Eg + Ei * dEg)
+        )
         aA = (E**2 - Ei**2) * (Ei**2 + Eg**2) + Eg**2 * Ci**2
+        daA = (
+            -2 * Ei * dEi * (Ei**2 + Eg**2)
+            + 2 * (E**2 - Ei**2) * (Ei * dEi + Eg * dEg)
+            + 2 * Eg * Ci * (dEg * Ci + Eg * dCi)
+        )
         zeta4 = (E**2 - gamma2) ** 2 + alpha**2 * Ci**2 / 4
+        dzeta4 = (
+            -2 * (E**2 - gamma2) * dgamma2
+            + alpha * Ci * (dalpha * Ci + alpha * dCi) / 2
+        )
 
-        # fmt: off
-        return (
-            Ai*Ci*aL/2.0/np.pi/zeta4/alpha/Ei*np.log((Ei**2 + Eg**2 + alpha*Eg)/(Ei**2 + Eg**2 - alpha*Eg)) - \
-            Ai*aA/np.pi/zeta4/Ei*(np.pi - np.arctan((2.0*Eg + alpha)/Ci) + np.arctan((alpha - 2.0*Eg)/Ci)) + \
-            2.0*Ai*Ei*Eg/np.pi/zeta4/alpha*(E**2 - gamma2)*(np.pi + 2.0*np.arctan(2.0/alpha/Ci*(gamma2 - Eg**2))) - \
-            Ai*Ei*Ci*(E**2 + Eg**2)/np.pi/zeta4/E*np.log(abs(E - Eg)/(E + Eg)) + \
-            2.0*Ai*Ei*Ci*Eg/np.pi/zeta4 * \
-            np.log(abs(E - Eg) * (E + Eg) / sqrt((Ei**2 - Eg**2)**2 + Eg**2 * Ci**2))
+        sum_plus = Ei**2 + Eg**2 + alpha * Eg
+        sum_minus = Ei**2 + Eg**2 - alpha * Eg
+        log1 = np.log(sum_plus / sum_minus)
+        dlog1 = (2 * Ei * dEi + 2 * Eg * dEg + dalpha * Eg + alpha * dEg) / sum_plus - (
+            2 * Ei * dEi + 2 * Eg * dEg - dalpha * Eg - alpha * dEg
+        ) / sum_minus
+        term1 = quotient(
+            Ai * Ci * aL * log1,
+            Ai * ((dCi * aL + Ci * daL) * log1 + Ci * aL * dlog1),
+            2 * np.pi * zeta4 * alpha * Ei,
+            2
+            * np.pi
+            * (dzeta4 * alpha * Ei + zeta4 * dalpha * Ei + zeta4 * alpha * dEi),
+        )
+
+        w1 = (2 * Eg + alpha) / Ci
+        dw1 = (2 * dEg + dalpha - w1 * dCi) / Ci
+        w2 = (alpha - 2 * Eg) / Ci
+        dw2 = (dalpha - 2 * dEg - w2 * dCi) / Ci
+        atan2 = np.pi - np.arctan(w1) + np.arctan(w2)
+        datan2 = -dw1 / (1 + w1**2) + dw2 / (1 + w2**2)
+        term2 = quotient(
+            Ai * aA * atan2,
+            Ai * (daA * atan2 + aA * datan2),
+            np.pi * zeta4 * Ei,
+            np.pi * (dzeta4 * Ei + zeta4 * dEi),
+        )
+
+        w3 = 2 * (gamma2 - Eg**2) / (alpha * Ci)
+        dw3 = (2 * (dgamma2 - 2 * Eg * dEg) - w3 * (dalpha * Ci + alpha * dCi)) / (
+            alpha * Ci
+        )
+        atan3 = np.pi + 2 * np.arctan(w3)
+        datan3 = 2 * dw3 / (1 + w3**2)
+        term3 = quotient(
+            2 * Ai * Ei * Eg * (E**2 - gamma2) * atan3,
+            2
+            * Ai
+            * (
+                (dEi * Eg + Ei * dEg) * (E**2 - gamma2) * atan3
+                - Ei * Eg * dgamma2 * atan3
+                + Ei * Eg * (E**2 - gamma2) * datan3
+            ),
+            np.pi * zeta4 * alpha,
+            np.pi * (dzeta4 * alpha + zeta4 * dalpha),
+        )
+
+        log4 = np.log(abs(E - Eg) / (E + Eg))
+        dlog4 = -dEg / (E - Eg) - dEg / (E + Eg)
+        term4 = quotient(
+            Ai * Ei * Ci * (E**2 + Eg**2) * log4,
+            Ai
+            * (
+                (dEi * Ci + Ei * dCi) * (E**2 + Eg**2) * log4
+                + Ei * Ci * (2 * Eg * dEg * log4 + (E**2 + Eg**2) * dlog4)
+            ),
+            np.pi * zeta4 * E,
+            np.pi * dzeta4 * E,
+        )
+
+        root = (Ei**2 - Eg**2) ** 2 + Eg**2 * Ci**2
+        droot = 4 * (Ei**2 - Eg**2) * (Ei * dEi - Eg * dEg) + 2 * Eg * Ci * (
+            dEg * Ci + Eg * dCi
+        )
+        log5 = np.log(abs(E - Eg) * (E + Eg) / sqrt(root))
+        dlog5 = -dEg / (E - Eg) + dEg / (E + Eg) - droot / root / 2
+        term5 = quotient(
+            2 * Ai * Ei * Ci * Eg * log5,
+            2
+            * Ai
+            * (
+                (dEi * Ci * Eg + Ei * dCi * Eg + Ei * Ci * dEg) * log5
+                + Ei * Ci * Eg * dlog5
+            ),
+            np.pi * zeta4,
+            np.pi * dzeta4,
+        )
+
+        deps2 = quotient(
+            Ai * Ei * Ci * (E - Eg) ** 2,
+            Ai * ((dEi * Ci + Ei * dCi) * (E - Eg) ** 2 - 2 * Ei * Ci * (E - Eg) * dEg),
+            ((E**2 - Ei**2) ** 2 + Ci**2 * E**2) * E,
+            (-4 * (E**2 - Ei**2) * Ei * dEi + 2 * Ci * dCi * E**2) * E,
+        ) * np.heaviside(E - Eg, 0)
+
+        return term1 - term2 + term3 - term4 + term5 + 1j * deps2
+
+    def _precompute(self) -> dict:
+        return self.eps1_constants(
+            np.asarray(self.single_params.get("Eg"))[..., np.newaxis],
+            self.rep_params_dl["A"],
+            self.rep_params_dl["E"],
+            self.rep_params_dl["C"],
         )
-        # fmt: on
 
     def dielectric_function(self, lbda: npt.ArrayLike) -> npt.NDArray:
-        energy = conversion_wavelength_energy(lbda)
-        energy_g = self.single_params.get("Eg")
-        return sum(
-            (
-                1j
-                * (
-                    c.get("A")
-                    * c.get("E")
-                    * c.get("C")
-                    * (energy - energy_g) ** 2
-                    / ((energy**2 - c.get("E") ** 2) ** 2 + c.get("C") ** 2 * energy**2)
-                    / energy
-                )
-                * np.heaviside(energy - energy_g, 0)
-                + self.eps1(energy, energy_g, c.get("A"), c.get("E"), c.get("C"))
-            )
-            for c in self.rep_params
+        energy = np.asarray(conversion_wavelength_energy(lbda))[..., np.newaxis]
+        energy_g = np.asarray(self.single_params.get("Eg"))[..., np.newaxis]
+        amplitude = self.rep_params_dl["A"]
+        resonance = self.rep_params_dl["E"]
+        broadening = self.rep_params_dl["C"]
+        return np.sum(
+            1j * self.eps2(energy, energy_g, amplitude, resonance, broadening)
+            + self.eps1_kernel(energy, self._get_precomputed()),
+            axis=-1,
+        )
+
+    def dielectric_derivatives(
+        self, lbda: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray:
+        lbda = self.default_lbda_range if lbda is None else lbda
+        energy = np.asarray(conversion_wavelength_energy(lbda))[..., np.newaxis]
+        energy_g = np.asarray(self.single_params.get("Eg"))[..., np.newaxis]
+        params = (
+            energy,
+            energy_g,
+            self.rep_params_dl["A"],
+            self.rep_params_dl["E"],
+            self.rep_params_dl["C"],
+        )
+        unit_amplitude = params[:2] + (1,) + params[3:]
+
+        return self._stack_derivatives(
+            lbda,
+            [np.sum(self.eps_derivative(*params, 1, 0, 0), axis=-1)],
+            [
+                1j * self.eps2(*unit_amplitude) + self.eps1(*unit_amplitude),
+                self.eps_derivative(*params, 0, 1, 0),
+                self.eps_derivative(*params, 0, 0, 1),
+            ],
         )
@@ -0,0 +1,348 @@
+# Encoding: utf-8
+"""Ensembles evaluate many structures, which only differ in layer thicknesses
+and dispersion parameters, in one batched calculation.
+
+A :class:`StructureEnsemble` takes a template :class:`Structure<elli.structure.Structure>`
+and arrays of N values for the varied thicknesses and parameters.
+The members of the ensemble are stacked along the wavelength axis,
+so the permittivity profiles and Jones matrices of all members are calculated
+with the same array operations as a single structure.
+The :class:`Result<elli.result.Result>` of an ensemble has a leading ensemble axis.
+
+Example:
+    .. code-block:: python
+
+        ensemble = elli.StructureEnsemble(
+            structure,
+            thicknesses={layer: np.random.normal(100, 2, 1000)},
+            parameters={(cauchy, "n0"): np.random.normal(1.45, 0.01, 1000)},
+        )
+        result = ensemble.evaluate(lbda, 70)
+        result.psi  # shape (1000, len(lbda))
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.scimath import sqrt
+
+from .dispersions.base_dispersion import BaseDispersion, InvalidParameters
+from .experiment import Experiment, ExperimentSnapshot, _read_only
+from .materials import IsotropicMaterial
+from .result import Result
+from .solver import Solver
+from .solver2x2 import Solver2x2
+from .solver4x4 import Solver4x4
+from .structure import Layer, Structure
+from .utils import SpectralAxis, tensor_diagonal
+
+ParameterKey = Union[Tuple[BaseDispersion, str], Tuple[BaseDispersion, str, int]]
+
+
+class StructureEnsemble:
+    """Ensemble of structures with the layer succession of a template structure,
+    differing in layer thicknesses and dispersion parameters.
+
+    The ensemble values are set in the layers and dispersions of the template
+    during an evaluation and restored afterwards,
+    so the template must not be used concurrently with the ensemble."""
+
+    structure = None
+    thicknesses = None
+    parameters = None
+    size = None
+
+    def __init__(
+        self,
+        structure: Structure,
+        thicknesses: Dict[Layer, npt.ArrayLike] = None,
+        parameters: Dict[ParameterKey, npt.ArrayLike] = None,
+    ) -> None:
+        """Creates an ensemble of structures from a template structure.
+
+        Args:
+            structure (Structure): Template structure, all values not given
+                in 'thicknesses' and 'parameters' are taken from this structure.
+            thicknesses (Dict[Layer, npt.ArrayLike], optional):
+                Arrays of N thicknesses (in nm) for Layer objects of the structure.
+                Defaults to None.
+            parameters (Dict[ParameterKey, npt.ArrayLike], optional):
+                Arrays of N parameter values. The keys are tuples (dispersion, name)
+                for single parameters and (dispersion, name, index) for repeated parameters
+                of the oscillator with the given index. Defaults to None.
+        """
+        if not isinstance(structure, Structure):
+            raise TypeError(
+                f"Expected a Structure object but found type {type(structure)}."
+            )
+
+        self.structure = structure
+        self.thicknesses = {}
+        self.parameters = {}
+
+        for layer, values in (thicknesses or {}).items():
+            if not isinstance(layer, Layer):
+                raise TypeError(
+                    f"Only thicknesses of Layer objects can be varied, found type {type(layer)}."
+                )
+            values = self._check_values(values)
+            if np.any(values < 0):
+                raise ValueError("Thickness value can't be negative.")
+            self.thicknesses[layer] = values
+
+        for key, values in (parameters or {}).items():
+            self._get_params_dict(key)
+            self.parameters[key] = self._check_values(values)
+
+        if self.size is None:
+            raise ValueError("Provide at least one array of thicknesses or parameters.")
+
+    def _check_values(self, values: npt.ArrayLike) -> npt.NDArray:
+        """Checks that an array of values matches the size of the ensemble.
+
+        Args:
+            values (npt.ArrayLike): Values of the ensemble members.
+
+        Returns:
+            npt.NDArray: Values as array.
+        """
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("Ensemble values must be one dimensional arrays.")
+
+        if self.size is None:
+            self.size = values.size
+        elif values.size != self.size:
+            raise ValueError(
+                f"Expected {self.size} values for each ensemble variable, got {values.size}."
+            )
+
+        return values
+
+    @staticmethod
+    def _get_params_dict(key: ParameterKey) -> dict:
+        """Returns the parameter dictionary of the dispersion, which contains the parameter.
+
+        Args:
+            key (ParameterKey): (dispersion, name) or (dispersion, name, index)
+
+        Returns:
+            dict: Single or repeated parameter dictionary of the dispersion.
+        """
+        dispersion, name, *index = key
+        if not isinstance(dispersion, BaseDispersion):
+            raise TypeError(
+                f"Expected dispersion to be an Dispersion object but found type {type(dispersion)}."
+            )
+
+        if index:
+            if not 0 <= index[0] < len(dispersion.rep_params):
+                raise InvalidParameters(f"Invalid oscillator index: {index[0]}")
+            params = dispersion.rep_params[index[0]]
+        else:
+            params = dispersion.single_params
+
+        if name not in params:
+            raise InvalidParameters(f"Invalid parameter(s): {name}")
+
+        return params
+
+    @contextmanager
+    def _substituted(self, index: Union[int, slice], points: int) -> Iterator[None]:
+        """Temporarily sets the ensemble values in the template structure.
+        The template must not be evaluated elsewhere, e.g. in another thread,
+        while the values are substituted.
+
+        Args:
+            index (Union[int, slice]): Ensemble member or members to set.
+                A single member is set to scalar values.
+            points (int): Number of wavelengths per member.
+                Arrays of values are repeated for each wavelength of a member.
+
+        Yields:
+            Iterator[None]: Context with substituted values.
+        """
+
+        def member_values(values: npt.NDArray) -> Union[float, npt.NDArray]:
+            if isinstance(index, slice):
+                return np.repeat(values[index], points)
+            return values[index].item()
+
+        originals = []
+        try:
+            for layer, values in self.thicknesses.items():
+                originals.append((layer.__dict__, "thickness", layer.thickness))
+                layer.thickness = member_values(values)
+
+            for key, values in self.parameters.items():
+                params = self._get_params_dict(key)
+                originals.append((params, key[1], params[key[1]]))
+                params[key[1]] = member_values(values)
+
+            yield
+        finally:
+            for target, name, value in reversed(originals):
+                target[name] = value
+
+    def get_permittivity_blocks(
+        self, lbda: npt.ArrayLike
+    ) -> List[Tuple[int, List[Tuple[npt.ArrayLike, npt.NDArray]]]]:
+        """Returns the permittivity profile of all members on the flattened
+        (member, wavelength) grid, grouped into blocks of repeated slices.
+
+        The dispersions are evaluated for all members at once.
+        If a varied dispersion can't be evaluated with a parameter value per wavelength
+        (see ``supports_parameter_arrays``, e.g. models using Kramers-Kronig relations
+        on their own wavelength grid), the members are evaluated separately.
+
+        Args:
+            lbda (npt.ArrayLike): Array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[int, List[Tuple[npt.ArrayLike, npt.NDArray]]]]:
+                Returns list of tuples [(repetitions, permittivity profile), ...],
+                with a single thickness or one thickness per grid point for each slice.
+        """
+        lbda = SpectralAxis(lbda)
+
+        if all(key[0].supports_parameter_arrays for key in self.parameters):
+            lbda_grid = SpectralAxis(np.tile(lbda, self.size))
+            with self._substituted(slice(None), lbda.size):
+                return self.structure.get_permittivity_blocks(lbda_grid)
+
+        members = []
+        for i in range(self.size):
+            with self._substituted(i, lbda.size):
+                members.append(self.structure.get_permittivity_blocks(lbda))
+
+        return [
+            (
+                repetitions,
+                [
+                    (
+                        np.concatenate(
+                            [
+                                np.broadcast_to(blocks[i][1][j][0], lbda.shape)
+                                for blocks in members
+                            ]
+                        ),
+                        np.concatenate([blocks[i][1][j][1] for blocks in members]),
+                    )
+                    for j in range(len(block))
+                ],
+            )
+            for i, (repetitions, block) in enumerate(members[0])
+        ]
+
+    def evaluate(
+        self,
+        lbda: npt.ArrayLike,
+        theta_i: Union[float, npt.ArrayLike],
+        solver: Solver = Solver4x4,
+        vector: npt.ArrayLike = None,
+        **solver_kwargs,
+    ) -> Result:
+        """Evaluates all members of the ensemble.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles (in degrees).
+            solver (Solver, optional): Choose which solver class is used. Defaults to Solver4x4.
+            vector (npt.ArrayLike, optional):
+                Jones or Stokes vector of incident light. Defaults to diagonal polarization ([1, 0, 1, 0]).
+            solver_kwargs (optional): Keyword arguments for the Solver can be appended as arguments.
+
+        Returns:
+            Result: Result of the ensemble, with a leading ensemble axis
+                before the angle and wavelength axes.
+        """
+        experiment = Experiment(self.structure, lbda, theta_i, vector)
+        points = experiment.lbda.size
+
+        snapshot = ExperimentSnapshot(
+            lbda=_read_only(np.tile(experiment.lbda, self.size)),
+            theta_i=experiment.theta_i,
+            jones_vector=_read_only(experiment.jones_vector),
+            stokes_vector=_read_only(experiment.stokes_vector),
+            permittivity_blocks=self.get_permittivity_blocks(experiment.lbda),
+            back_isotropic=isinstance(self.structure.back_material, IsotropicMaterial),
+        )
+
+        if issubclass(solver, Solver2x2):
+            return self._evaluate_2x2(snapshot, points)
+
+        result = solver(snapshot, **solver_kwargs).calculate()
+
+        def to_members(values: npt.NDArray) -> npt.NDArray:
+            angle_shape = np.shape(snapshot.theta_i)
+            values = np.reshape(
+                values,
+                angle_shape
+                + (self.size, points)
+                + values.shape[1 + len(angle_shape) :],
+            )
+            return np.moveaxis(values, len(angle_shape), 0)
+
+        return Result(
+            snapshot,
+            to_members(result.jones_matrix_r),
+            to_members(result.jones_matrix_t),
+            to_members(result._power_correction),
+        )
+
+    def _evaluate_2x2(self, snapshot: ExperimentSnapshot, points: int) -> Result:
+        """Evaluates all members with the 2x2 transfer matrix method,
+        using a leading batch axis for the members.
+
+        Args:
+            snapshot (ExperimentSnapshot): Snapshot of the ensemble on the flattened
+                (member, wavelength) grid.
+            points (int): Number of wavelengths per member.
+
+        Returns:
+            Result: Result of the ensemble, with a leading ensemble axis.
+        """
+        angles = int(np.prod(np.shape(snapshot.theta_i)))
+        lbda = np.tile(snapshot.lbda[:points], angles)
+        theta_i = (
+            np.repeat(snapshot.theta_i, points) if angles > 1 else snapshot.theta_i
+        )
+
+        profile = snapshot.permittivity_profile
+        d_list = np.array(
+            [
+                np.broadcast_to(thickness, snapshot.lbda.shape)[::points]
+                for thickness, _ in profile[1:-1]
+            ]
+        ).reshape(-1, self.size)
+        n_list = sqrt(
+            np.array([tensor_diagonal(epsilon)[:, 0] for _, epsilon in profile])
+        )
+
+        # Members along a leading batch axis, the angles are tiled along the points
+        n_list = np.tile(n_list.reshape(len(profile), self.size, points), angles)
+
+        jones_matrix_r, jones_matrix_t, power_correction = (
+            Solver2x2.calculate_jones_matrices(
+                np.swapaxes(n_list, 0, 1), d_list.T, lbda, theta_i
+            )
+        )
+
+        def to_members(values: npt.NDArray) -> npt.NDArray:
+            return np.reshape(
+                values,
+                (self.size,)
+                + np.shape(snapshot.theta_i)
+                + (points,)
+                + values.shape[2:],
+            )
+
+        return Result(
+            snapshot,
+            to_members(jones_matrix_r),
+            to_members(jones_matrix_t),
+            to_members(power_correction),
+        )
@@ -5,7 +5,7 @@ It requires a Structure to evaluate and includes the information about
 the incident light beam:
 
 * the wavelengths :math:`\lambda`
-* the incidence angle :math:`\theta_\text{i}`
+* the incidence angle :math:`\theta_\text{i}`, or an array of incidence angles
 * and the polarization, which can be given by a Jones or Stokes vector
 
 The evaluate method can be called, to start the calculation of the optical properties.
@@ -14,14 +14,67 @@ as an argument and an object will be created automatically.
 
 The experiment class is only needed in special cases an can be skipped by calling
 :meth:`elli.structure.Structure.evaluate`.
+
+On evaluation the solvers take an immutable :class:`ExperimentSnapshot` of the experiment,
+containing the experimental parameters and the evaluated permittivity profile.
+It is stored in the :class:`Result<elli.result.Result>` instead of a copy of the whole structure.
 """
 
+from dataclasses import dataclass
+from typing import List, Tuple, Union
+
 import numpy as np
 import numpy.typing as npt
 
+from .materials import IsotropicMaterial
 from .result import Result
 from .solver import Solver
 from .solver4x4 import Solver4x4
+from .utils import SpectralAxis
+
+
+def _read_only(values: npt.ArrayLike) -> npt.NDArray:
+    """Returns a read-only copy of an array."""
+    values = np.array(values)
+    values.setflags(write=False)
+    return values
+
+
+@dataclass(frozen=True)
+class ExperimentSnapshot:
+    """Immutable state of an experiment, as evaluated by the solvers.
+
+    Only contains the experimental parameters and the permittivity profile
+    of the structure evaluated for the wavelengths of the experiment,
+    so later changes of the structure do not affect it.
+    Thicknesses are single values or, for structure ensembles,
+    one value per wavelength.
+    """
+
+    lbda: npt.NDArray
+    theta_i: Union[float, npt.NDArray]
+    jones_vector: npt.NDArray
+    stokes_vector: npt.NDArray
+    permittivity_blocks: List[Tuple[int, List[Tuple[npt.ArrayLike, npt.NDArray]]]]
+    back_isotropic: bool
+
+    def snapshot(self) -> "ExperimentSnapshot":
+        """Returns the snapshot itself, so it can be evaluated by the solvers like an experiment.
+
+        Returns:
+            ExperimentSnapshot: This snapshot.
+        """
+        return self
+
+    @property
+    def permittivity_profile(self) -> List[Tuple[npt.ArrayLike, npt.NDArray]]:
+        """Permittivity profile of the complete structure,
+        as list of tuples [(thickness, dielectric tensor), ...]."""
+        return [
+            layer
+            for repetitions, block in self.permittivity_blocks
+            for layer in repetitions * block
+        ]
 
 
 class Experiment:
@@ -37,7 +90,7 @@ class Experiment:
         self,
         structure: "Structure",
         lbda: npt.ArrayLike,
-        theta_i: float,
+        theta_i: Union[float, npt.ArrayLike],
         vector: npt.ArrayLike = None,
     ) -> None:
         """Creates a virtual experiment to simulate the behavior of a structure.
@@ -45,7 +98,8 @@ class Experiment:
         Args:
             structure (Structure): Structure object to evaluate.
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            theta_i (float): Incident angle (in degrees).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles (in degrees).
             vector (npt.ArrayLike, optional):
                 Jones or Stokes vector of incident light. Defaults to diagonal polarization ([1, 0, 1, 0]).
         """
@@ -130,16 +184,31 @@ class Experiment:
 
             self.jones_vector = np.array([a, b])
 
-    def set_theta(self, theta_i: float) -> None:
+    def set_theta(self, theta_i: Union[float, npt.ArrayLike]) -> None:
         """Set incident angle to evaluate.
 
+        If an array of angles is given, all angles are evaluated at once
+        and the arrays of the result get an additional leading angle axis.
+
         Args:
-            theta_i (float): Incident angle (in degrees).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles (in degrees).
         """
-        self.theta_i = theta_i
+        if np.ndim(theta_i) == 0:
+            self.theta_i = theta_i
+            return
+
+        theta_array = np.asarray(theta_i, dtype=np.float64)
+        if theta_array.ndim > 1:
+            raise ValueError(
+                "Incident angles must be a single value or a one dimensional array."
+            )
+        self.theta_i = theta_array
 
     def set_lbda(self, lbda: npt.ArrayLike) -> None:
         """Set experiment wavelengths.
+        They are stored as :class:`SpectralAxis<elli.utils.SpectralAxis>`,
+        so the dispersions of all layers share the conversions to energy.
 
         Args:
             lbda (npt.ArrayLike): single value or array of wavelengths (in nm).
@@ -147,7 +216,49 @@ class Experiment:
         lbda_array = np.asarray(lbda)
         if np.shape(lbda_array) == ():
             lbda_array = np.asarray([lbda])
-        self.lbda = lbda_array
+        self.lbda = SpectralAxis(lbda_array)
+
+    def snapshot(self) -> ExperimentSnapshot:
+        """Evaluates the permittivity profile of the structure
+        and returns it together with the experimental parameters.
+
+        Returns:
+            ExperimentSnapshot: Immutable state of the experiment.
+        """
+        # Permittivities shared between layers are only copied once
+        copies = {}
+
+        def copy(epsilon: npt.NDArray) -> npt.NDArray:
+            if id(epsilon) not in copies:
+                copies[id(epsilon)] = (epsilon, _read_only(epsilon))
+            return copies[id(epsilon)][1]
+
+        def copy_thickness(thickness: npt.ArrayLike) -> npt.ArrayLike:
+            if np.ndim(thickness) == 0:
+                return float(thickness)
+            return _read_only(thickness)
+
+        permittivity_blocks = [
+            (
+                repetitions,
+                [
+                    (copy_thickness(thickness), copy(epsilon))
+                    for thickness, epsilon in block
+                ],
+            )
+            for repetitions, block in self.structure.get_permittivity_blocks(self.lbda)
+        ]
+
+        return ExperimentSnapshot(
+            lbda=_read_only(self.lbda),
+            theta_i=self.theta_i
+            if np.ndim(self.theta_i) == 0
+            else _read_only(self.theta_i),
+            jones_vector=_read_only(self.jones_vector),
+            stokes_vector=_read_only(self.stokes_vector),
+            permittivity_blocks=permittivity_blocks,
+            back_isotropic=isinstance(self.structure.back_material, IsotropicMaterial),
+        )
 
     def evaluate(self, solver: Solver = Solver4x4, **solver_kwargs) -> Result:
         """Evaluates the experiment with the given solver.
@@ -1,15 +1,38 @@
 """This modules creates a formula parser"""
 
+from collections import Counter
+from dataclasses import dataclass
+from enum import IntEnum
 from functools import lru_cache
 import os
 from operator import add, mul, neg, sub, truediv
-from typing import Dict
+from typing import Any, Callable, Dict, Tuple
 
 import numpy as np
 import scipy.constants as sc
 from lark import Lark, Transformer, v_args
 from scipy.special import dawsn  # pylint: disable=no-name-in-module
 
+FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "sqrt": np.emath.sqrt,
+    "dawsn": dawsn,
+    "ln": np.log,
+    "log": np.log10,
+    "heaviside": np.heaviside,
+}
+
+BUILTINS = {
+    "1j": 1j,
+    "pi": sc.pi,
+    "eps_0": sc.epsilon_0,
+    "hbar": sc.hbar,
+    "h": sc.h,
+    "c": sc.c,
+}
+
 
 @v_args(inline=True)
 class FormulaTransformer(Transformer):
@@ -95,35 +118,15 @@ class FormulaTransformer(Transformer):
 
     def func(self, name, val):
         """Evaluates a function"""
-        names = {
-            "sin": np.sin,
-            "cos": np.cos,
-            "tan": np.tan,
-            "sqrt": np.emath.sqrt,
-            "dawsn": dawsn,
-            "ln": np.log,
-            "log": np.log10,
-            "heaviside": np.heaviside,
-        }
-
-        if name in names:
-            return names[name](val)
+        if name in FUNCTIONS:
+            return FUNCTIONS[name](val)
 
         raise ValueError(f"Unknown function: {name}")
 
     def builtin(self, name):
         """Returns the values for builtin tokens"""
-        names = {
-            "1j": 1j,
-            "pi": sc.pi,
-            "eps_0": sc.epsilon_0,
-            "hbar": sc.hbar,
-            "h": sc.h,
-            "c": sc.c,
-        }
-
-        if name in names:
-            return names[name]
+        if name in BUILTINS:
+            return BUILTINS[name]
 
         raise ValueError(f"Unknown constant: {name}")
 
@@ -157,6 +160,264 @@ class FormulaTransformer(Transformer):
         raise ValueError(f"No such parameter {name}")
 
 
+class Dependency(IntEnum):
+    """Quantities an expression of a compiled formula depends on"""
+
+    CONSTANT = 0
+    PARAMETERS = 1
+    X_AXIS = 2
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """Expression node of a compiled formula"""
+
+    source: str
+    dependency: Dependency
+    children: Tuple["CompiledExpression", ...] = ()
+    template: str = "{}"
+    value: Any = None
+
+    @property
+    def is_constant(self) -> bool:
+        """True if the value of the expression is known at compile time"""
+        return self.dependency == Dependency.CONSTANT and not self.children
+
+
+@v_args(inline=True)
+class FormulaCompiler(Transformer):
+    """Transformer class translating formulas into the source code of a python function.
+
+    The function evaluates the formula with the same operations as the
+    :class:`FormulaTransformer`, but without walking the parse tree.
+    Parameters are bound by name to local variables at the start of the function.
+    The expression is optimized without changing its numerical result:
+
+    * Subexpressions of constants and builtins are evaluated at compile time.
+    * Subexpressions, which only depend on parameters, are evaluated first.
+    * Subexpressions occurring multiple times are only evaluated once.
+    """
+
+    x_axis_name: str
+    single_param_names: Tuple[str, ...]
+    repeated_param_names: Tuple[str, ...]
+    variables: Dict[str, str]
+    constants: Dict[Tuple[str, str], str]
+    namespace: Dict[str, Any]
+    occurrences: Counter
+
+    def __init__(
+        self,
+        x_axis_name: str,
+        single_param_names: Tuple[str, ...],
+        repeated_param_names: Tuple[str, ...],
+    ):
+        super().__init__()
+        self.x_axis_name = x_axis_name
+        self.single_param_names = single_param_names
+        self.repeated_param_names = repeated_param_names
+        self.variables = {}
+        self.constants = {}
+        self.namespace = {}
+        self.occurrences = Counter()
+
+    def _variable(self, name: str, source: str) -> CompiledExpression:
+        """Returns a local variable, which is assigned the source at the function start"""
+        self.variables.setdefault(name, source)
+        return CompiledExpression(
+            name, Dependency.X_AXIS if name == "x_repeated" else Dependency.PARAMETERS
+        )
+
+    def _constant(self, value: Any) -> CompiledExpression:
+        """Returns a constant, which is inlined as literal or bound in the namespace"""
+        if type(value) in (float, complex) and np.isfinite(value):
+            return CompiledExpression(repr(value), Dependency.CONSTANT, value=value)
+
+        key = (type(value).__name__, repr(value))
+        if key not in self.constants:
+            self.constants[key] = f"const_{len(self.constants)}"
+            self.namespace[self.constants[key]] = value
+
+        return CompiledExpression(self.constants[key], Dependency.CONSTANT, value=value)
+
+    def _operation(
+        self, template: str, operation: Callable, *operands: CompiledExpression
+    ) -> CompiledExpression:
+        """Returns an expression applying an operation to the operands.
+        Operations on constants are evaluated directly."""
+        if all(operand.is_constant for operand in operands):
+            try:
+                return self._constant(
+                    operation(*(operand.value for operand in operands))
+                )
+            except (ArithmeticError, ValueError):
+                # Keep the operation, so the error is raised on evaluation
+                pass
+
+        expression = CompiledExpression(
+            template.format(*(operand.source for operand in operands)),
+            max(Dependency.PARAMETERS, *(operand.dependency for operand in operands)),
+            operands,
+            template,
+        )
+        self.occurrences[expression.source] += 1
+        return expression
+
+    def number(self, value):
+        """Return a number literal"""
+        return self._constant(float(value))
+
+    def add(self, left, right):
+        """Return an addition"""
+        return self._operation("({} + {})", add, left, right)
+
+    def sub(self, left, right):
+        """Return a subtraction"""
+        return self._operation("({} - {})", sub, left, right)
+
+    def mul(self, left, right):
+        """Return a multiplication"""
+        return self._operation("({} * {})", mul, left, right)
+
+    def div(self, left, right):
+        """Return a division"""
+        return self._operation("({} / {})", truediv, left, right)
+
+    def neg(self, value):
+        """Return a negation"""
+        return self._operation("(-{})", neg, value)
+
+    def power(self, base, exponent):
+        """Return a power"""
+        return self._operation("({} ** {})", pow, base, exponent)
+
+    def eps(self, inp):
+        """Return an epsilon type formula"""
+        return inp
+
+    # pylint: disable=invalid-name
+    def n(self, inp):
+        """Return an index type formula"""
+        return inp
+
+    def kkr_term(self, term):
+        """Calculate the kramers kronig transformation on the function"""
+        raise NotImplementedError("kkr transformation not yet implemented")
+
+    def func(self, name, val):
+        """Return a function call"""
+        if name in FUNCTIONS:
+            self.namespace[f"func_{name}"] = FUNCTIONS[name]
+            return self._operation(f"func_{name}({{}})", FUNCTIONS[name], val)
+
+        raise ValueError(f"Unknown function: {name}")
+
+    def builtin(self, name):
+        """Return the value of a builtin token"""
+        if name in BUILTINS:
+            return self._constant(BUILTINS[name])
+
+        raise ValueError(f"Unknown constant: {name}")
+
+    def sum_expr(self, expr):
+        """Sum an expression"""
+        expression = CompiledExpression(
+            f"{expr.source}.sum(axis=-1)",
+            max(expr.dependency, Dependency.PARAMETERS),
+            (expr,),
+            "{}.sum(axis=-1)",
+        )
+        self.occurrences[expression.source] += 1
+        return expression
+
+    def _single_param(self, name):
+        index = self.single_param_names.index(name)
+        return self._variable(f"single_{index}", f"single_params[{str(name)!r}]")
+
+    def single_param_name(self, name):
+        """Return a parameter inside a non-repeated section"""
+        if name == self.x_axis_name:
+            return CompiledExpression("x", Dependency.X_AXIS)
+
+        if name in self.single_param_names:
+            return self._single_param(name)
+
+        raise ValueError(f"No such parameter {name}")
+
+    def param_name(self, name):
+        """Return a parameter inside a repeated section"""
+        if name == self.x_axis_name:
+            no_repeated_params = (
+                f"np.shape(repeated_params[{self.repeated_param_names[0]!r}])[-1]"
+                if self.repeated_param_names
+                else "0"
+            )
+            return self._variable(
+                "x_repeated",
+                f"np.multiply.outer(x, np.ones({no_repeated_params}))",
+            )
+
+        if name in self.single_param_names:
+            # Single parameters get an oscillator axis to broadcast against batches
+            index = self.single_param_names.index(name)
+            return self._variable(
+                f"single_{index}_repeated",
+                f"np.asarray(single_params[{str(name)!r}])[..., np.newaxis]",
+            )
+
+        if name in self.repeated_param_names:
+            index = self.repeated_param_names.index(name)
+            return self._variable(
+                f"repeated_{index}", f"repeated_params[{str(name)!r}]"
+            )
+
+        raise ValueError(f"No such parameter {name}")
+
+    def generate(self, expression: CompiledExpression) -> str:
+        """Generates the source code of the formula function for a compiled expression.
+
+        Args:
+            expression (CompiledExpression): Compiled expression of the formula.
+
+        Returns:
+            str: Source code of the function 'formula(x, single_params, repeated_params)'.
+        """
+        parameter_lines = []
+        x_axis_lines = []
+        shared = {}
+
+        def emit(node: CompiledExpression) -> str:
+            if not node.children:
+                return node.source
+            if node.source in shared:
+                return shared[node.source]
+
+            source = node.template.format(*(emit(child) for child in node.children))
+            if (
+                node.dependency == Dependency.PARAMETERS
+                or self.occurrences[node.source] > 1
+            ):
+                shared[node.source] = f"term_{len(shared)}"
+                lines = (
+                    parameter_lines
+                    if node.dependency == Dependency.PARAMETERS
+                    else x_axis_lines
+                )
+                lines.append(f"    {shared[node.source]} = {source}")
+                return shared[node.source]
+
+            return source
+
+        result = emit(expression)
+        return "\n".join(
+            ["def formula(x, single_params, repeated_params):"]
+            + [f"    {name} = {value}" for name, value in self.variables.items()]
+            + parameter_lines
+            + x_axis_lines
+            + [f"    return {result}"]
+        )
+
+
 __location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
 
 with open(
@@ -182,3 +443,33 @@ def parse_formula(formula: str):
         Lark.Tree: The parsed formula Tree.
     """
     return grammar.parse(formula)
+
+
+@lru_cache(maxsize=128)
+def compile_formula(
+    formula: str,
+    x_axis_name: str,
+    single_param_names: Tuple[str, ...],
+    repeated_param_names: Tuple[str, ...],
+) -> Callable:
+    """
+    Compiles a dispersion formula string into a python function.
+    Uses caching to compile each formula only once.
+
+    Args:
+        formula (str): The formula string to compile.
+        x_axis_name (str): Name of the wavelength or energy axis in the formula.
+        single_param_names (Tuple[str, ...]): Names of the single parameters.
+        repeated_param_names (Tuple[str, ...]): Names of the repeated parameters.
+
+    Returns:
+        Callable: Function evaluating the formula with the signature
+            (x_axis_values, single_params, repeated_params).
+    """
+    compiler = FormulaCompiler(x_axis_name, single_param_names, repeated_param_names)
+    source = compiler.generate(compiler.transform(parse_formula(formula)))
+
+    namespace = {"np": np, **compiler.namespace}
+    exec(compile(source, "<formula>", "exec"), namespace)  # pylint: disable=exec-used
+
+    return namespace["formula"]
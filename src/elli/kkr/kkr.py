@@ -33,84 +33,79 @@ from typing import Callable
 import numpy as np
 
 
-def _integrate_im(im: np.ndarray, x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
-    """Calculate the discrete imaginary sum (integral) for the kkr.
+def _kernel_im(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete imaginary sum (integral) for the kkr.
 
     Args:
-        im (numpy.ndarray): The imaginary values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The x-axis on which to calculate. (shape (1, n))
         x_i (numpy.ndarray): The current points around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The integral sum. (shape (m,))
+        numpy.ndarray: The weights of the imaginary values. (shape (m, n))
     """
 
-    return np.sum(x * im / (x * x - x_i * x_i), axis=1)
+    return x / (x * x - x_i * x_i)
 
 
-def _integrate_im_reciprocal(
-    im: np.ndarray, x: np.ndarray, x_i: np.ndarray
-) -> np.ndarray:
-    """Calculate the discrete imaginary sum (integral) for the kkr.
+def _kernel_im_reciprocal(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete imaginary sum (integral) for the kkr.
     This formulation uses an 1/x axis to transform a wavelength axis.
 
     Args:
-        im (numpy.ndarray): The imaginary values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The reciprocal x-axis on which to calculate. (shape (1, n))
         x_i (numpy.ndarray): The current point around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The integral sum. (shape (m,))
+        numpy.ndarray: The weights of the imaginary values. (shape (m, n))
     """
 
-    return np.sum(im / (x * (1.0 - x * x / (x_i * x_i))), axis=1)
+    return 1 / (x * (1.0 - x * x / (x_i * x_i)))
 
 
-def _integrate_re(re: np.ndarray, x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
-    """Calculate the discrete real sum (integral) for the kkr.
+def _kernel_re(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete real sum (integral) for the kkr.
 
     Args:
-        re (numpy.ndarray): The real values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The x-axis on which to calculate. (shape (1, n))
         x_i (numpy.ndarray): The current point around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The real sum. (shape (m,))
+        numpy.ndarray: The weights of the real values. (shape (m, n))
     """
-    return np.sum(x_i * re / (x * x - x_i * x_i), axis=1)
+    return x_i / (x * x - x_i * x_i)
 
 
-def _integrate_re_reciprocal(
-    re: np.ndarray, x: np.ndarray, x_i: np.ndarray
-) -> np.ndarray:
-    """Calculate the discrete real sum (integral) for the kkr.
+def _kernel_re_reciprocal(x: np.ndarray, x_i: np.ndarray) -> np.ndarray:
+    """Calculate the weights of the discrete real sum (integral) for the kkr.
     This formulation uses an 1/x axis to transform a wavelength axis.
 
     Args:
-        re (numpy.ndarray): The real values from which to calculate. (shape (1, n))
         x (numpy.ndarray): The reciprocal x-axis on which to calculate. (shape (1, n))
         x_i (float): The current point around which to integrate. (shape (m, 1))
 
     Returns:
-        numpy.ndarray: The real sum. (shape (m,))
+        numpy.ndarray: The weights of the real values. (shape (m, n))
     """
 
-    return np.sum(re / (x_i - x * x / x_i), axis=1)
+    return 1 / (x_i - x * x / x_i)
 
 
 def _calc_kkr(
     t: np.ndarray,
     x: np.ndarray,
-    trafo: Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray],
+    kernel: Callable[[np.ndarray, np.ndarray], np.ndarray],
 ) -> np.ndarray:
     """Calculates the Kramers-Kronig relation
     according to Maclaurin's formula.
+    The sums are calculated as matrix products,
+    so multiple spectra can be transformed at once.
 
     Args:
         t (numpy.ndarray): The y-axis on which to transform.
+            Multiple spectra can be stacked along leading axes.
         x (numpy.ndarray): The x-axis on which to transform.
-        trafo (Callable[[numpy.ndarray, numpy.ndarray, numpy.ndarray], numpy.ndarray]):
-            The transformation function.
+        kernel (Callable[[numpy.ndarray, numpy.ndarray], numpy.ndarray]):
+            The weights of the transformation.
 
     Raises:
         ValueError: y and x axis must have the same length.
@@ -119,26 +114,25 @@ def _calc_kkr(
         np.ndarray: The kkr transformed y-axis
     """
 
-    if len(t) != len(x):
+    t = np.asarray(t)
+    if t.shape[-1] != len(x):
         raise ValueError(
             "y- and x-axes arrays must have the same length, "
-            f"but have lengths {len(t)} and {len(x)}."
+            f"but have lengths {t.shape[-1]} and {len(x)}."
         )
 
-    integral = np.empty(len(t))
+    integral = np.empty(t.shape)
     interval = np.diff(x, prepend=x[1] - x[0])
     odd_slice = slice(1, None, 2)
     even_slice = slice(0, None, 2)
 
-    integral[even_slice] = trafo(
-        t[np.newaxis, odd_slice],
-        x[np.newaxis, odd_slice],
-        x[even_slice, np.newaxis],
+    integral[..., even_slice] = (
+        t[..., odd_slice]
+        @ kernel(x[np.newaxis, odd_slice], x[even_slice, np.newaxis]).T
     )
-    integral[odd_slice] = trafo(
-        t[np.newaxis, even_slice],
-        x[np.newaxis, even_slice],
-        x[odd_slice, np.newaxis],
+    integral[..., odd_slice] = (
+        t[..., even_slice]
+        @ kernel(x[np.newaxis, even_slice], x[odd_slice, np.newaxis]).T
     )
 
     return 4 / np.pi * interval * integral
@@ -163,7 +157,7 @@ def re2im(re: np.ndarray, x: np.ndarray) -> np.ndarray:
         numpy.ndarray: The transformed imaginary part.
     """
 
-    return _calc_kkr(re, x, _integrate_re)
+    return _calc_kkr(re, x, _kernel_re)
 
 
 def im2re(im: np.ndarray, x: np.ndarray) -> np.ndarray:
@@ -185,7 +179,7 @@ def im2re(im: np.ndarray, x: np.ndarray) -> np.ndarray:
         numpy.ndarray: The transformed real part.
     """
 
-    return _calc_kkr(im, x, _integrate_im)
+    return _calc_kkr(im, x, _kernel_im)
 
 
 def re2im_reciprocal(re: np.ndarray, x: np.ndarray) -> np.ndarray:
@@ -208,7 +202,7 @@ def re2im_reciprocal(re: np.ndarray, x: np.ndarray) -> np.ndarray:
         numpy.ndarray: The transformed imaginary part.
     """
 
-    return _calc_kkr(re, x, _integrate_re_reciprocal)
+    return _calc_kkr(re, x, _kernel_re_reciprocal)
 
 
 def im2re_reciprocal(im: np.ndarray, x: np.ndarray) -> np.ndarray:
@@ -231,4 +225,4 @@ def im2re_reciprocal(im: np.ndarray, x: np.ndarray) -> np.ndarray:
         numpy.ndarray: The transformed real part.
     """
 
-    return _calc_kkr(im, x, _integrate_im_reciprocal)
+    return _calc_kkr(im, x, _kernel_im_reciprocal)
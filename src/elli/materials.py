@@ -28,12 +28,39 @@ to create mixtures or account for interface roughness.
 """
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
 from numpy.lib.scimath import sqrt, power
 
 from .dispersions.base_dispersion import BaseDispersion
+from .utils import broadcast_tensors, expand_tensor
+
+_shared_tensors: ContextVar[Optional[Dict]] = ContextVar("shared_tensors", default=None)
+
+
+@contextmanager
+def shared_tensors() -> Iterator[None]:
+    """Context in which :meth:`Material.get_tensor_shared` evaluates every material
+    only once for each wavelength array, e.g. for all layers of a structure,
+    which consist of the same material. The permittivities are shared read-only.
+    Parameters of the materials must not change inside the context.
+
+    Yields:
+        Iterator[None]: Context with shared permittivities.
+    """
+    if _shared_tensors.get() is not None:
+        yield
+        return
+
+    token = _shared_tensors.set({})
+    try:
+        yield
+    finally:
+        _shared_tensors.reset(token)
 
 
 class Material(ABC):
@@ -50,6 +77,44 @@ class Material(ABC):
             npt.NDArray: Permittivity tensor.
         """
 
+    def get_tensor_compact(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form:
+        one value per wavelength for isotropic materials, the diagonal elements for materials
+        with their principal axes along x, y and z, or the full permittivity tensor.
+        Defaults to the full permittivity tensor.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3).
+        """
+        return self.get_tensor(lbda)
+
+    def get_tensor_shared(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form.
+        Inside a :func:`shared_tensors` context, the permittivity is only calculated once
+        for the same wavelength array and returned read-only.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3).
+        """
+        shared = _shared_tensors.get()
+        if shared is None:
+            return self.get_tensor_compact(lbda)
+
+        key = (id(self), id(lbda))
+        if key not in shared:
+            epsilon = np.asarray(self.get_tensor_compact(lbda)).view()
+            epsilon.setflags(write=False)
+            # Keep references, so the ids are not reused inside the context
+            shared[key] = (self, lbda, epsilon)
+
+        return shared[key][2]
+
     def get_refractive_index(self, lbda: npt.ArrayLike) -> npt.NDArray:
         """Gets the refractive index tensor for wavelength 'lbda'.
 
@@ -94,23 +159,39 @@ class SingleMaterial(Material):
         Returns:
             npt.NDArray: Permittivity tensor.
         """
-        # Check for shape of lbda
-        shape = np.shape(lbda)
-        if shape == ():
-            length = 1
-        else:
-            length = shape[0]
+        return expand_tensor(self.get_tensor_compact(lbda))
 
-        # create empty tensor
-        epsilon = np.zeros((length, 3, 3), dtype=np.complex128)
+    def get_tensor_compact(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form.
+        Dispersions shared by several crystal axes are only evaluated once.
 
-        # get get dielectric functions from dispersion
-        epsilon[:, 0, 0] = self.dispersion_x.get_dielectric(lbda)
-        epsilon[:, 1, 1] = self.dispersion_y.get_dielectric(lbda)
-        epsilon[:, 2, 2] = self.dispersion_z.get_dielectric(lbda)
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity of shape (N,) for isotropic materials,
+                (N, 3) for unrotated anisotropic materials and (N, 3, 3) otherwise.
+        """
+        # Constant dispersions return single values
+        shape = np.shape(lbda)[:1] or (1,)
+
+        epsilon_x = np.broadcast_to(self.dispersion_x.get_dielectric(lbda), shape)
+        if self.dispersion_x is self.dispersion_y is self.dispersion_z:
+            # Rotations don't change isotropic tensors
+            return epsilon_x
+
+        epsilon_z = np.broadcast_to(self.dispersion_z.get_dielectric(lbda), shape)
+        epsilon_y = (
+            epsilon_x
+            if self.dispersion_y is self.dispersion_x
+            else np.broadcast_to(self.dispersion_y.get_dielectric(lbda), shape)
+        )
+        epsilon = np.stack([epsilon_x, epsilon_y, epsilon_z], axis=-1)
 
         if self.rotated:
-            epsilon = self.rotation_matrix @ epsilon @ self.rotation_matrix.T
+            return (
+                self.rotation_matrix @ expand_tensor(epsilon) @ self.rotation_matrix.T
+            )
 
         return epsilon
 
@@ -278,17 +359,40 @@ class MixtureMaterial(Material):
         self.fraction = fraction
 
     @abstractmethod
-    def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
+    def get_tensor_fraction_compact(
+        self, lbda: npt.ArrayLike, fraction: Union[float, npt.ArrayLike]
+    ) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form,
+        while overwriting the set fraction. Used in VaryingMixtureLayers.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+            fraction (Union[float, npt.ArrayLike]): Fraction of the guest material
+                used for evaluation or array of S fractions. (Range 0 - 1).
+
+        Returns:
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3),
+                with a leading axis of length S for an array of fractions.
+        """
+
+    def get_tensor_fraction(
+        self, lbda: npt.ArrayLike, fraction: Union[float, npt.ArrayLike]
+    ) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda',
         while overwriting the set fraction. Used in VaryingMixtureLayers.
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            fraction (float): Fraction of the guest material used for evaluation. (Range 0 - 1).
+            fraction (Union[float, npt.ArrayLike]): Fraction of the guest material
+                used for evaluation or array of S fractions. (Range 0 - 1).
 
         Returns:
-            npt.NDArray: Permittivity tensor.
+            npt.NDArray: Permittivity tensor of shape (N, 3, 3) or (S, N, 3, 3).
         """
+        epsilon = self.get_tensor_fraction_compact(lbda, fraction)
+        if np.ndim(fraction) == 0:
+            return expand_tensor(epsilon)
+        return np.stack([expand_tensor(eps) for eps in epsilon])
 
     def get_tensor(self, lbda: npt.ArrayLike) -> npt.NDArray:
         """Gets the permittivity tensor of the material for wavelength 'lbda'.
@@ -301,6 +405,50 @@ class MixtureMaterial(Material):
         """
         return self.get_tensor_fraction(lbda, self.fraction)
 
+    def get_tensor_compact(self, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3).
+        """
+        return self.get_tensor_fraction_compact(lbda, self.fraction)
+
+    def get_constituents_compact(
+        self, lbda: npt.ArrayLike
+    ) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Gets the permittivities of the host and guest material in their common compact form.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]: Permittivities of host and guest material.
+        """
+        e_h, e_g = broadcast_tensors(
+            self.host_material.get_tensor_shared(lbda),
+            self.guest_material.get_tensor_shared(lbda),
+        )
+        return e_h, e_g
+
+    @staticmethod
+    def _fraction_axes(
+        fraction: Union[float, npt.ArrayLike], epsilon: npt.NDArray
+    ) -> npt.NDArray:
+        """Appends axes to the fractions to broadcast them against a compact permittivity.
+
+        Args:
+            fraction (Union[float, npt.ArrayLike]): Single fraction or array of S fractions.
+            epsilon (npt.NDArray): Compact permittivity of the constituents.
+
+        Returns:
+            npt.NDArray: Fractions of shape (1, ...) or (S, 1, ...).
+        """
+        fraction = np.asarray(fraction, dtype=float)
+        return fraction.reshape(fraction.shape + (1,) * epsilon.ndim)
+
 
 class VCAMaterial(MixtureMaterial):
     r"""Mixture Material approximated with a simple virtual crystal like average.
@@ -316,21 +464,24 @@ class VCAMaterial(MixtureMaterial):
     * :math:`f` is the volume fraction of the guest in the host material.
     """
 
-    def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
-        """Gets the permittivity tensor of the marterial for wavelength 'lbda',
+    def get_tensor_fraction_compact(
+        self, lbda: npt.ArrayLike, fraction: Union[float, npt.ArrayLike]
+    ) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form,
         while overwriting the set fraction.
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            fraction (float): Fraction of the guest material used for evaluation. (Range 0 - 1).
+            fraction (Union[float, npt.ArrayLike]): Fraction of the guest material
+                used for evaluation or array of S fractions. (Range 0 - 1).
 
         Returns:
-            npt.NDArray: Permittivity tensor.
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3),
+                with a leading axis of length S for an array of fractions.
         """
-        epsilon = (
-            self.host_material.get_tensor(lbda) * (1 - fraction)
-            + self.guest_material.get_tensor(lbda) * fraction
-        )
+        e_h, e_g = self.get_constituents_compact(lbda)
+        fraction = self._fraction_axes(fraction, e_h)
+        epsilon = e_h * (1 - fraction) + e_g * fraction
         return epsilon
 
 
@@ -352,21 +503,24 @@ class LooyengaEMA(MixtureMaterial):
         Looyenga, H. (1965). Physica, 31(3), 401–406.
     """
 
-    def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
-        """Gets the permittivity tensor of the material for wavelength 'lbda',
+    def get_tensor_fraction_compact(
+        self, lbda: npt.ArrayLike, fraction: Union[float, npt.ArrayLike]
+    ) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form,
         while overwriting the set fraction.
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            fraction (float): Fraction of the guest material used for evaluation. (Range 0 - 1).
+            fraction (Union[float, npt.ArrayLike]): Fraction of the guest material
+                used for evaluation or array of S fractions. (Range 0 - 1).
 
         Returns:
-            npt.NDArray: Permittivity tensor.
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3),
+                with a leading axis of length S for an array of fractions.
         """
-        epsilon = (
-            self.host_material.get_tensor(lbda) ** (1 / 3) * (1 - fraction)
-            + self.guest_material.get_tensor(lbda) ** (1 / 3) * fraction
-        ) ** 3
+        e_h, e_g = self.get_constituents_compact(lbda)
+        fraction = self._fraction_axes(fraction, e_h)
+        epsilon = (e_h ** (1 / 3) * (1 - fraction) + e_g ** (1 / 3) * fraction) ** 3
         return epsilon
 
 
@@ -387,19 +541,23 @@ class MaxwellGarnettEMA(MixtureMaterial):
     * :math:`f` is the volume fraction of the guest in the host material.
     """
 
-    def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
-        """Gets the permittivity tensor of the material for wavelength 'lbda',
+    def get_tensor_fraction_compact(
+        self, lbda: npt.ArrayLike, fraction: Union[float, npt.ArrayLike]
+    ) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form,
         while overwriting the set fraction.
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            fraction (float): Fraction of the guest material used for evaluation. (Range 0 - 1).
+            fraction (Union[float, npt.ArrayLike]): Fraction of the guest material
+                used for evaluation or array of S fractions. (Range 0 - 1).
 
         Returns:
-            npt.NDArray: Permittivity tensor.
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3),
+                with a leading axis of length S for an array of fractions.
         """
-        e_h = self.host_material.get_tensor(lbda)
-        e_g = self.guest_material.get_tensor(lbda)
+        e_h, e_g = self.get_constituents_compact(lbda)
+        fraction = self._fraction_axes(fraction, e_h)
 
         # Catch calculation warnings
         old_settings = np.geterr()
@@ -438,25 +596,31 @@ class BruggemanEMA(MixtureMaterial):
         * Ph.J. Rouseel; J. Vanhellemont; H.E. Maes. (1993) Thin Solid Films, 234, 423-427
     """
 
-    def get_tensor_fraction(self, lbda: npt.ArrayLike, fraction: float) -> npt.NDArray:
-        """Gets the permittivity tensor of the material for wavelength 'lbda',
+    def get_tensor_fraction_compact(
+        self, lbda: npt.ArrayLike, fraction: Union[float, npt.ArrayLike]
+    ) -> npt.NDArray:
+        """Gets the permittivity of the material for wavelength 'lbda' in its most compact form,
         while overwriting the set fraction.
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            fraction (float): Fraction of the guest material used for evaluation. (Range 0 - 1).
+            fraction (Union[float, npt.ArrayLike]): Fraction of the guest material
+                used for evaluation or array of S fractions. (Range 0 - 1).
 
         Returns:
-            npt.NDArray: Permittivity tensor.
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3),
+                with a leading axis of length S for an array of fractions.
         """
-        e_h = self.host_material.get_tensor(lbda)
-        e_g = self.guest_material.get_tensor(lbda)
-        f = fraction
+        e_h, e_g = self.get_constituents_compact(lbda)
+        f = self._fraction_axes(fraction, e_h)
+        shape = np.broadcast_shapes(f.shape, e_h.shape)
+        e_h, e_g, f = (np.broadcast_to(value, shape) for value in (e_h, e_g, f))
 
         mask_equal = np.nonzero(np.equal(e_h, e_g))
         mask_different = np.nonzero(np.not_equal(e_h, e_g))
 
         p = sqrt(e_h[mask_different]) / sqrt(e_g[mask_different])
+        f = f[mask_different]
         b = 0.25 * ((3 * f - 1) * (1 / p - p) + p)
         z = b + sqrt(power(b, 2) + 0.5)
 
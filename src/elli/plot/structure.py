@@ -11,14 +11,17 @@ except ImportError as e:
         "i.e. pip install pyElli[fitting]"
     ) from e
 
-from ..utils import E_X
+from ..utils import E_X, expand_tensor
 
 
 def get_permittivity_profile(structure, lbda):
     """Returns permittivity tensor profile."""
     layers = []
     for L in structure.layers:
-        layers.extend(L.get_permittivity_profile(lbda))
+        layers.extend(
+            (thickness, expand_tensor(epsilon))
+            for thickness, epsilon in L.get_permittivity_profile(lbda)
+        )
     front = (float("inf"), structure.front_material.get_tensor(lbda))
     back = (float("inf"), structure.back_material.get_tensor(lbda))
     return sum([[front], layers, [back]], [])
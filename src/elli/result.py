@@ -6,7 +6,9 @@ Jones matrices and ellipsometric parameters (psi, delta, rho, mueller matrices).
 A list of all properties is given below.
 
 All properties will return an array in the length of the provided wavelength array
-of the requested property.
+of the requested property. If the experiment was evaluated for an array of
+incident angles, the arrays get an additional leading angle axis,
+i.e. they are of shape (angles, wavelengths, ...).
 
 These can be accessed by different methods:
 
@@ -66,7 +68,7 @@ class Result:
             M_{\text{$\rho$, exp}} = M_\rho \cdot \vec{E}
         """
         rho = np.dot(self.rho_matrix, self.experiment.jones_vector)
-        rho = rho[:, 0] / rho[:, 1]
+        rho = rho[..., 0] / rho[..., 1]
 
         if self._delta_range.lower == 0 and self._delta_range.upper == 180:
             rho.imag = -np.abs(rho.imag)
@@ -76,7 +78,7 @@ class Result:
     def rho_t(self) -> npt.NDArray:
         r"""Returns the ellipsometric parameter :math:`\rho_\text{t}` in transmission direction."""
         rho_t = np.dot(self.rho_matrix_t, self.experiment.jones_vector)
-        rho_t = rho_t[:, 0] / rho_t[:, 1]
+        rho_t = rho_t[..., 0] / rho_t[..., 1]
         if self._delta_range.lower == 0 and self._delta_range.upper == 180:
             rho_t.imag = -np.abs(rho_t.imag)
         return rho_t
@@ -145,7 +147,7 @@ class Result:
             \end{bmatrix}
         """
         r_ss = self.jones_matrix_r[..., 1, 1]
-        return self.jones_matrix_r / r_ss[:, None, None]
+        return self.jones_matrix_r / r_ss[..., None, None]
 
     @property
     def rho_matrix_t(self) -> npt.NDArray:
@@ -161,7 +163,7 @@ class Result:
             \end{bmatrix}
         """
         t_ss = self.jones_matrix_t[..., 1, 1]
-        return self.jones_matrix_t / t_ss[:, None, None]
+        return self.jones_matrix_t / t_ss[..., None, None]
 
     @property
     def psi_matrix(self) -> npt.NDArray:
@@ -226,13 +228,13 @@ class Result:
 
         # Kronecker product of S and S*
         s_kron_s_star = np.einsum(
-            "aij,akl->aikjl", self.rho_matrix, np.conjugate(self.rho_matrix)
-        ).reshape([self.rho_matrix.shape[0], 4, 4])
+            "...ij,...kl->...ikjl", self.rho_matrix, np.conjugate(self.rho_matrix)
+        ).reshape([*self.rho_matrix.shape[:-2], 4, 4])
 
         mueller_matrix = np.real(a @ s_kron_s_star @ np.linalg.inv(a))
-        mm11 = mueller_matrix[:, 0, 0]
+        mm11 = mueller_matrix[..., 0, 0]
 
-        return mueller_matrix / mm11[:, None, None]
+        return mueller_matrix / mm11[..., None, None]
 
     @property
     def jones_matrix_r(self) -> npt.NDArray:
@@ -294,7 +296,7 @@ class Result:
         .. math::
             R = (R_{pp} + R_{ss}) / 2
         """
-        return (self.R_matrix[:, 0, 0] + self.R_matrix[:, 1, 1]) / 2
+        return (self.R_matrix[..., 0, 0] + self.R_matrix[..., 1, 1]) / 2
 
     @property
     def R_matrix(self) -> npt.NDArray:
@@ -312,7 +314,7 @@ class Result:
         .. math::
             T = (T_{pp} / T_{ss}) / 2
         """
-        return (self.T_matrix[:, 0, 0] + self.T_matrix[:, 1, 1]) / 2
+        return (self.T_matrix[..., 0, 0] + self.T_matrix[..., 1, 1]) / 2
 
     @property
     def T_matrix(self) -> npt.NDArray:
@@ -321,7 +323,9 @@ class Result:
         .. math::
             M_T = \begin{bmatrix} T_{pp} & T_{ps} \\ T_{sp} & T_{ss} \end{bmatrix}
         """
-        return np.abs(self._jones_matrix_t) ** 2 * self._power_correction[:, None, None]
+        return (
+            np.abs(self._jones_matrix_t) ** 2 * self._power_correction[..., None, None]
+        )
 
     @property
     def Rc_matrix(self) -> npt.NDArray:
@@ -339,11 +343,13 @@ class Result:
         .. math::
             M_{Tc} = \begin{bmatrix} T_{LL} & T_{LR} \\ T_{RL} & T_{RR} \end{bmatrix}
         """
-        return np.abs(self.jones_matrix_tc) ** 2 * self._power_correction[:, None, None]
+        return (
+            np.abs(self.jones_matrix_tc) ** 2 * self._power_correction[..., None, None]
+        )
 
     def __init__(
         self,
-        experiment: "Experiment",
+        experiment: "ExperimentSnapshot",
         jones_matrix_r: npt.NDArray,
         jones_matrix_t: npt.NDArray,
         power_correction: npt.NDArray = None,
@@ -351,8 +357,9 @@ class Result:
         """Creates result object, to store simulation data. Gets called by solvers.
 
         Args:
-            experiment (Experiment):
-                Evaluated experiment, with structure and experimental parameters.
+            experiment (ExperimentSnapshot):
+                Snapshot of the evaluated experiment,
+                with experimental parameters and permittivity profile.
             jones_matrix_r (npt.NDArray): Jones matrix for the reflection direction.
             jones_matrix_t (npt.NDArray): Jones matrix for the transmission direction.
             power_correction (npt.NDArray):
@@ -363,7 +370,7 @@ class Result:
         self._jones_matrix_t = jones_matrix_t
         self._delta_range = DeltaRange(-180, 180)
         if power_correction is None:
-            self._power_correction = np.ones_like(self.experiment.lbda)
+            self._power_correction = np.ones(np.shape(jones_matrix_t)[:-2])
         else:
             self._power_correction = power_correction
 
@@ -424,19 +431,19 @@ class Result:
         if names[0] in ["psi", "delta", "rho", "R", "T"]:
             if len(names) == 1:
                 return self.__getattribute__(names[0])
-            return self.__getattribute__(names[0] + "_matrix")[:, i, j]
+            return self.__getattribute__(names[0] + "_matrix")[..., i, j]
 
         if names[0] in ["r", "rc", "t", "tc"]:
             if len(names) == 1:
                 return self.__getattribute__("jones_matrix_" + names[0])
-            return self.__getattribute__("jones_matrix_" + names[0])[:, i, j]
+            return self.__getattribute__("jones_matrix_" + names[0])[..., i, j]
 
         if names[0] in ["Rc", "Tc"]:
             if len(names) == 1:
                 return self.__getattribute__(names[0] + "_matrix")
-            return self.__getattribute__(names[0] + "_matrix")[:, i, j]
+            return self.__getattribute__(names[0] + "_matrix")[..., i, j]
 
-        return self.__getattribute__(names[0])[:, i, j]
+        return self.__getattribute__(names[0])[..., i, j]
 
     def as_delta_range(self, lower: int, upper: int):
         """Returns this result in another delta range
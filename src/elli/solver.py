@@ -1,6 +1,9 @@
 # Encoding: utf-8
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
 
 from .result import Result
 
@@ -16,20 +19,84 @@ class Solver(ABC):
     """
 
     experiment = None
-    structure = None
     lbda = None
     theta_i = None
     jones_vector = None
     permittivity_profile = None
+    permittivity_blocks = None
 
     @abstractmethod
     def calculate(self) -> Result:
         pass
 
     def __init__(self, experiment: "Experiment") -> None:
-        self.experiment = deepcopy(experiment)
-        self.structure = self.experiment.structure
-        self.lbda = self.experiment.lbda
-        self.theta_i = self.experiment.theta_i
-        self.jones_vector = self.experiment.jones_vector
-        self.permittivity_profile = self.structure.get_permittivity_profile(self.lbda)
+        self.set_snapshot(experiment.snapshot())
+
+    def set_snapshot(self, snapshot: "ExperimentSnapshot") -> None:
+        """Unpacks the immutable state of the experiment to evaluate.
+
+        Args:
+            snapshot (ExperimentSnapshot): Snapshot of the experiment.
+        """
+        self.experiment = snapshot
+        self.lbda = snapshot.lbda
+        self.theta_i = snapshot.theta_i
+        self.jones_vector = snapshot.jones_vector
+        self.permittivity_blocks = snapshot.permittivity_blocks
+        self.permittivity_profile = snapshot.permittivity_profile
+
+    @property
+    def angle_shape(self) -> Tuple[int, ...]:
+        """Shape of the angle axis, empty if a single incident angle is evaluated."""
+        return np.shape(self.theta_i)
+
+    def get_angle_grid(self) -> Tuple[npt.NDArray, npt.NDArray]:
+        """Returns wavelengths and incident angles
+        flattened over the (angle, wavelength) grid of the experiment.
+
+        The permittivity profile is only evaluated once for all angles
+        and gets expanded to the grid with :meth:`broadcast_to_angles`,
+        so the solvers can treat every grid point as an independent wavelength point.
+
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray]: Wavelengths (in nm) and incident angles (in degrees).
+        """
+        if self.angle_shape == ():
+            return self.lbda, self.theta_i
+
+        lbda = np.tile(self.lbda, np.size(self.theta_i))
+        theta_i = np.repeat(self.theta_i, np.size(self.lbda))
+        return lbda, theta_i
+
+    def broadcast_to_angles(self, values: npt.NDArray, axis: int = 0) -> npt.NDArray:
+        """Expands an array given for the wavelengths of the experiment
+        to the flattened (angle, wavelength) grid. Single values are returned unchanged.
+
+        Args:
+            values (npt.NDArray): Array with the wavelengths along 'axis'.
+            axis (int, optional): Wavelength axis of the array. Defaults to 0.
+
+        Returns:
+            npt.NDArray: Array with the flattened grid along 'axis'.
+        """
+        if self.angle_shape == () or np.ndim(values) == 0:
+            return values
+
+        reps = np.ones(np.ndim(values), dtype=int)
+        reps[axis] = np.size(self.theta_i)
+        return np.tile(values, reps)
+
+    def reshape_to_angles(self, values: npt.NDArray) -> npt.NDArray:
+        """Reshapes an array calculated on the flattened (angle, wavelength) grid
+        to an array with a leading angle axis.
+
+        Args:
+            values (npt.NDArray): Array with the flattened grid as first axis.
+
+        Returns:
+            npt.NDArray: Array with shape (angles, wavelengths, ...)
+                or (wavelengths, ...) for a single incident angle.
+        """
+        return np.reshape(
+            values, self.angle_shape + (np.size(self.lbda),) + np.shape(values)[1:]
+        )
@@ -1,11 +1,14 @@
 # Encoding: utf-8
 import warnings
+from typing import Tuple
 
 import numpy as np
-from numpy.lib.scimath import arcsin, sqrt
+import numpy.typing as npt
+from numpy.lib.scimath import arccos, sqrt
 
 from .result import Result
 from .solver import Solver
+from .utils import tensor_diagonal
 
 
 class Solver2x2(Solver):
@@ -17,101 +20,164 @@ class Solver2x2(Solver):
     """
 
     def list_snell(self, n_list):
-        angles = arcsin(n_list[0] * np.sin(np.deg2rad(self.theta_i)) / n_list)
+        """Calculates the propagation angles in all layers with Snell's law.
 
-        angles[0] = np.where(
-            np.invert(Solver2x2.is_forward_angle(n_list[0], angles[0])),
-            np.pi - angles[0],
-            angles[0],
-        )
-        angles[-1] = np.where(
-            np.invert(Solver2x2.is_forward_angle(n_list[-1], angles[-1])),
-            np.pi - angles[-1],
-            angles[-1],
-        )
+        Args:
+            n_list: Refractive indices with the layers along the first axis
 
-        return angles
+        Returns:
+            Propagation angles in the layers (in radians)
+        """
+        return arccos(self.snell_cos(n_list, self.theta_i))
 
-    def calculate(self) -> Result:
-        """Calculates the transfer matrix for the given material stack"""
-        if len(self.permittivity_profile) > 2:
-            d, eps = list(zip(*self.permittivity_profile[1:-1]))
-            d_list = np.array(d)
-            n_list = sqrt(
-                np.vstack(
-                    [
-                        self.permittivity_profile[0][1][:, 0, 0],
-                        np.array(eps)[..., 0, 0],
-                        self.permittivity_profile[-1][1][:, 0, 0],
-                    ]
-                )
-            )
-        else:
-            d_list = np.array([])
-            n_list = sqrt(
-                np.vstack(
-                    [
-                        self.permittivity_profile[0][1][:, 0, 0],
-                        self.permittivity_profile[-1][1][:, 0, 0],
-                    ]
-                )
-            )
+    @staticmethod
+    def snell_cos(n_list, theta_i):
+        """Calculates the cosines of the propagation angles in all layers with Snell's law,
+        equal to the cosines of the angles returned by :meth:`list_snell`.
 
-        for layer in n_list:
-            if np.any(np.logical_and(layer.real > 0, layer.imag < 0)):
-                warnings.warn(
-                    """Solver2x2 can't handle active media (n > 0 and k < 0).
-                    Check if all materials are defined correctly or switch to Solver4x4 instead."""
-                )
-            elif np.any(np.logical_and(layer.real < 0, layer.imag > 0)):
-                warnings.warn(
-                    """Solver2x2 can't handle media with n < 0 and k > 0.
-                    Check if all materials are defined correctly or switch to Solver4x4 instead."""
-                )
+        Args:
+            n_list: Refractive indices with the layers along the first axis
+            theta_i: Incident angle (in degrees)
 
-        num_layers = n_list.shape[0]
-        th_list = self.list_snell(n_list)
-        kz_list = 2 * np.pi * n_list * np.cos(th_list) / self.lbda
+        Returns:
+            Cosines of the propagation angles in the layers
+        """
+        cos_list = sqrt(1 - (n_list[0] * np.sin(np.deg2rad(theta_i)) / n_list) ** 2)
 
-        delta = kz_list[1:-1] * (d_list if n_list.ndim == 1 else d_list[:, None])
+        # Backward propagating waves in the half-spaces, i.e. angles of pi - theta
+        for i in [0, -1]:
+            ncostheta = n_list[i] * cos_list[i]
+            forward = np.where(
+                abs(ncostheta.imag) > 1e-10, ncostheta.imag > 0, ncostheta.real > 0
+            )
+            cos_list[i] = np.where(forward, cos_list[i], -cos_list[i])
 
-        esum = "ij...,jk...->ik..."
-        ones = np.repeat(1, n_list.shape[1]) if n_list.ndim > 1 else 1
+        return cos_list
 
-        rs, rp, ts, tp = Solver2x2.fresnel(n_list[0], n_list[1], th_list[0], th_list[1])
-        Ms = np.array([[ones, rs], [rs, ones]], dtype=complex) / ts
-        Mp = np.array([[ones, rp], [rp, ones]], dtype=complex) / tp
+    @staticmethod
+    def calculate_jones_matrices(
+        n_list: npt.ArrayLike,
+        d_list: npt.ArrayLike,
+        lbda: npt.ArrayLike,
+        theta_i: npt.ArrayLike,
+    ) -> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+        """Calculates the Jones matrices of layer stacks with the 2x2 transfer matrix method.
+
+        The interface matrices of all layers are calculated at once and the chain
+        is reduced by pairwise batched matrix multiplications.
+        Leading axes of the refractive indices and thicknesses are treated as batch axes,
+        so multiple parameter sets of structures with the same number of layers
+        are evaluated in one call.
 
-        for i in range(1, num_layers - 1):
-            rs, rp, ts, tp = Solver2x2.fresnel(
-                n_list[i], n_list[i + 1], th_list[i], th_list[i + 1]
-            )
-            em = np.exp(-1j * delta[i - 1])
-            ep = np.exp(1j * delta[i - 1])
+        Args:
+            n_list (npt.ArrayLike): Refractive indices including the front and back half-space,
+                with shape (..., layers, points).
+            d_list (npt.ArrayLike): Thicknesses of the layers (in nm),
+                with shape (..., layers - 2).
+            lbda (npt.ArrayLike): Wavelengths (in nm) for each point.
+            theta_i (npt.ArrayLike): Single value or incident angles (in degrees) for each point.
 
-            Ms = np.einsum(
-                esum, Ms, np.array([[em, rs * em], [rs * ep, ep]], dtype=complex) / ts
+        Returns:
+            Tuple[npt.NDArray, npt.NDArray, npt.NDArray]: Jones matrices for reflection and
+                transmission with shape (..., points, 2, 2) and the power correction factors
+                with shape (..., points).
+        """
+        n_list = np.moveaxis(np.asarray(n_list, dtype=complex), -2, 0)
+        d_list = np.moveaxis(np.asarray(d_list, dtype=float), -1, 0)[..., None]
+
+        if np.any(np.logical_and(n_list.real > 0, n_list.imag < 0)):
+            warnings.warn(
+                """Solver2x2 can't handle active media (n > 0 and k < 0).
+                Check if all materials are defined correctly or switch to Solver4x4 instead."""
+            )
+        if np.any(np.logical_and(n_list.real < 0, n_list.imag > 0)):
+            warnings.warn(
+                """Solver2x2 can't handle media with n < 0 and k > 0.
+                Check if all materials are defined correctly or switch to Solver4x4 instead."""
             )
-            Mp = np.einsum(
-                esum, Mp, np.array([[em, rp * em], [rp * ep, ep]], dtype=complex) / tp
+
+        cos_list = Solver2x2.snell_cos(n_list, theta_i)
+        kz_list = 2 * np.pi * n_list * cos_list / lbda
+
+        # The first interface has no preceding layer, i.e. a phase of zero
+        delta = np.concatenate([np.zeros_like(kz_list[:1]), kz_list[1:-1] * d_list])
+        ep = np.exp(1j * delta)[:, None]
+        em = 1 / ep
+
+        # Fresnel coefficients of all interfaces (see fresnel),
+        # for p and s polarization along the second axis
+        n_i, n_t = n_list[:-1], n_list[1:]
+        cos_i, cos_t = cos_list[:-1], cos_list[1:]
+        denominator = np.stack(
+            [n_t * cos_i + n_i * cos_t, n_i * cos_i + n_t * cos_t], axis=1
+        )
+        r = (
+            np.stack([n_t * cos_i - n_i * cos_t, n_i * cos_i - n_t * cos_t], axis=1)
+            / denominator
+        )
+        inv_t = denominator / (2 * n_i * cos_i)[:, None]
+
+        # Interface matrices with shape (2, 2, layers - 1, 2, ..., points)
+        m = np.empty((2, 2) + r.shape, dtype=complex)
+        np.multiply(em, inv_t, out=m[0, 0])
+        np.multiply(ep, inv_t, out=m[1, 1])
+        np.multiply(r, m[0, 0], out=m[0, 1])
+        np.multiply(r, m[1, 1], out=m[1, 0])
+
+        esum = "ij...,jk...->ik..."
+        while m.shape[2] > 1:
+            num_matrices = m.shape[2]
+            paired = np.einsum(esum, m[:, :, : num_matrices - 1 : 2], m[:, :, 1::2])
+            m = (
+                np.concatenate([paired, m[:, :, -1:]], axis=2)
+                if num_matrices % 2
+                else paired
             )
+        m = m[:, :, 0]
 
-        rtots = Ms[1, 0] / Ms[0, 0]
-        ttots = 1 / Ms[0, 0]
-        rtotp = Mp[1, 0] / Mp[0, 0]
-        ttotp = 1 / Mp[0, 0]
+        r_tot = m[1, 0] / m[0, 0]
+        t_tot = 1 / m[0, 0]
 
-        zeros = np.repeat(0, n_list.shape[1]) if n_list.ndim > 1 else 1
+        jones_matrix_r = np.zeros(r_tot.shape[1:] + (2, 2), dtype=complex)
+        jones_matrix_r[..., 0, 0] = r_tot[0]
+        jones_matrix_r[..., 1, 1] = r_tot[1]
 
-        jones_matrix_r = np.moveaxis(np.array([[rtotp, zeros], [zeros, rtots]]), 2, 0)
-        jones_matrix_t = np.moveaxis(np.array([[ttotp, zeros], [zeros, ttots]]), 2, 0)
+        jones_matrix_t = np.zeros(t_tot.shape[1:] + (2, 2), dtype=complex)
+        jones_matrix_t[..., 0, 0] = t_tot[0]
+        jones_matrix_t[..., 1, 1] = t_tot[1]
 
         # TODO: Test if p and s correction formulas are needed.
-        power_correction = ((n_list[-1] * np.cos(th_list[-1])).real) / (
-            n_list[0] * np.cos(th_list[0])
+        power_correction = (n_list[-1] * cos_list[-1]).real / (
+            n_list[0] * cos_list[0]
         ).real
 
-        return Result(self.experiment, jones_matrix_r, jones_matrix_t, power_correction)
+        return jones_matrix_r, jones_matrix_t, power_correction
+
+    def calculate(self) -> Result:
+        """Calculates the transfer matrix for the given material stack"""
+        lbda, theta_i = self.get_angle_grid()
+
+        d_list = [thickness for thickness, _ in self.permittivity_profile[1:-1]]
+        n_list = sqrt(
+            np.array(
+                [
+                    tensor_diagonal(epsilon)[:, 0]
+                    for _, epsilon in self.permittivity_profile
+                ]
+            )
+        )
+        n_list = self.broadcast_to_angles(n_list, axis=1)
+
+        jones_matrix_r, jones_matrix_t, power_correction = (
+            self.calculate_jones_matrices(n_list, d_list, lbda, theta_i)
+        )
+
+        return Result(
+            self.experiment,
+            self.reshape_to_angles(jones_matrix_r),
+            self.reshape_to_angles(jones_matrix_t),
+            self.reshape_to_angles(power_correction),
+        )
 
     @staticmethod
     def fresnel(n_i, n_t, th_i, th_t):
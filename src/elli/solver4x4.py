@@ -1,6 +1,8 @@
 # Encoding: utf-8
 from abc import ABC, abstractmethod
-from typing import Literal
+from collections import OrderedDict
+from functools import reduce
+from typing import Callable, List, Literal, Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
@@ -16,9 +18,9 @@ else:
 from numpy.lib.scimath import sqrt
 from scipy.linalg import expm as scipy_expm
 
-from .materials import IsotropicMaterial
 from .result import Result
 from .solver import Solver
+from .utils import tensor_diagonal
 
 
 class Propagator(ABC):
@@ -26,13 +28,13 @@ class Propagator(ABC):
 
     @abstractmethod
     def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
+        self, delta: npt.NDArray, thickness: npt.ArrayLike, lbda: npt.ArrayLike
     ) -> npt.NDArray:
         """Calculates propagation for a given Delta matrix and layer thickness.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
+            thickness (npt.ArrayLike): Thickness of layer (nm), single value or one per wavelength
             lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
@@ -44,20 +46,20 @@ class PropagatorLinear(Propagator):
     """Propagator class using a simple linear approximation of the matrix exponential."""
 
     def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
+        self, delta: npt.NDArray, thickness: npt.ArrayLike, lbda: npt.ArrayLike
     ) -> npt.NDArray:
         """Calculates propagation for a given Delta matrix and layer thickness with a linear approximation of the matrix exponential.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
+            thickness (npt.ArrayLike): Thickness of layer (nm), single value or one per wavelength
             lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
             npt.NDArray: Propagator for the given layer
         """
-        p_hs_lin = np.identity(4) + 1j * thickness * np.einsum(
-            "nij,n->nij", delta, 2 * sc.pi / lbda
+        p_hs_lin = np.identity(4) + 1j * np.einsum(
+            "nij,n->nij", delta, thickness * 2 * sc.pi / lbda
         )
         return p_hs_lin
 
@@ -98,19 +100,19 @@ class PropagatorExpm(Propagator):
         self.expm = backends[backend]
 
     def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
+        self, delta: npt.NDArray, thickness: npt.ArrayLike, lbda: npt.ArrayLike
     ) -> npt.NDArray:
         """Calculates propagation for a given Delta matrix and layer thickness with the Padé approximation of the matrix exponential.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
+            thickness (npt.ArrayLike): Thickness of layer (nm), single value or one per wavelength
             lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
             npt.NDArray: Propagator for the given layer
         """
-        mats = 1j * thickness * np.einsum("nij,n->nij", delta, 2 * sc.pi / lbda)
+        mats = 1j * np.einsum("nij,n->nij", delta, thickness * 2 * sc.pi / lbda)
 
         propagator = self.expm(mats)
 
@@ -120,19 +122,46 @@ class PropagatorExpm(Propagator):
 class PropagatorEig(Propagator):
     """Propagator class using the eigenvalue decomposition method."""
 
-    def calculate_propagation(
-        self, delta: npt.NDArray, thickness: float, lbda: npt.ArrayLike
-    ) -> npt.NDArray:
-        """Calculates propagation for a given Delta matrix and layer thickness with eigenvalue decomposition.
+    def __init__(self, cache_size: int = 0) -> None:
+        """The eigendecomposition of a Delta matrix does not depend on the layer thickness.
+        It can be cached, so repeated calculations for layers differing only in thickness,
+        e.g. during thickness fits, only need to evaluate the exponential.
+
+        Every cache entry keeps the bytes of a Delta matrix of shape (N, 4, 4) with
+        its eigenvalues, eigenvectors and inverse eigenvectors, i.e. roughly
+        N * 832 bytes for N wavelengths, and each lookup hashes the Delta matrix.
+        The cache is only hit if the same propagator instance is passed to the solver
+        for every evaluation, e.g. ``Solver4x4(experiment, propagator=propagator)``.
+
+        Args:
+            cache_size (int, optional): Number of eigendecompositions kept in the cache.
+                Defaults to 0, which disables caching.
+        """
+        if cache_size < 0:
+            raise ValueError("Cache size needs to be 0 or more.")
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def get_eigendecomposition(
+        self, delta: npt.NDArray
+    ) -> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+        """Returns the eigenvalues and eigenvectors of the Delta matrix,
+        sorted according to the z propagation direction, and the inverse eigenvector matrix.
 
         Args:
             delta (npt.NDArray): Delta Matrix
-            thickness (float): Thickness of layer (nm)
-            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
 
         Returns:
-            npt.NDArray: Propagator for the given layer
+            Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+                Eigenvalues, eigenvector matrix and its inverse
         """
+        if self.cache_size > 0:
+            key = (delta.shape, delta.tobytes())
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
         q, w = np.linalg.eig(delta)
 
         # Sort according to z propagation direction, by Re(q) first, then Im(q)
@@ -143,13 +172,115 @@ class PropagatorEig(Propagator):
 
         w_i = np.linalg.inv(w)
 
-        q = np.exp(q * 2j * thickness * sc.pi / lbda[:, None])
+        if self.cache_size > 0:
+            self._cache[key] = (q, w, w_i)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return q, w, w_i
+
+    def clear_cache(self) -> None:
+        """Removes all cached eigendecompositions."""
+        self._cache.clear()
+
+    def calculate_propagation(
+        self, delta: npt.NDArray, thickness: npt.ArrayLike, lbda: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Calculates propagation for a given Delta matrix and layer thickness with eigenvalue decomposition.
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            thickness (npt.ArrayLike): Thickness of layer (nm), single value or one per wavelength
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            npt.NDArray: Propagator for the given layer
+        """
+        q, w, w_i = self.get_eigendecomposition(delta)
+
+        q = np.exp(q * (2j * thickness * sc.pi / lbda)[:, None])
+
+        return (w * q[:, np.newaxis, :]) @ w_i
+
 
-        p = np.zeros((lbda.shape[0], 4, 4), dtype=np.complex128)
-        for i in range(4):
-            p[:, i, i] = q[:, i]
+class PropagatorIsotropic(Propagator):
+    r"""Propagator class using the closed-form matrix exponential of isotropic layers.
+
+    For an isotropic layer the Delta matrix fulfills :math:`\Delta^2 = k_z^2 I`,
+    so the matrix exponential reduces to
+
+    .. math::
+        P = \cos(k_0 d k_z) I + i \frac{\sin(k_0 d k_z)}{k_z} \Delta
+
+    This propagator is only valid for Delta matrices of isotropic layers.
+    """
+
+    def calculate_propagation(
+        self, delta: npt.NDArray, thickness: npt.ArrayLike, lbda: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Calculates propagation for a given Delta matrix of an isotropic layer
+        and layer thickness with the closed-form matrix exponential.
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            thickness (npt.ArrayLike): Thickness of layer (nm), single value or one per wavelength
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            npt.NDArray: Propagator for the given layer
+        """
+        # Kz² = ε - Kx², which is found in the Delta matrix as -Δ21
+        k_z = sqrt(-delta[:, 2, 1])
+        phase = thickness * 2 * sc.pi / lbda
+
+        cos_kz = np.cos(phase * k_z)
+        sin_kz = phase * np.sinc(phase * k_z / sc.pi)
+
+        return (
+            cos_kz[:, None, None] * np.identity(4) + 1j * sin_kz[:, None, None] * delta
+        )
 
-        return w @ p @ w_i
+
+class PropagatorDiagonal(Propagator):
+    r"""Propagator class using the closed-form matrix exponential of layers
+    with a diagonal permittivity tensor, i.e. isotropic layers and uniaxial or biaxial layers
+    with their principal axes aligned to the sample coordinate system.
+
+    For these layers the Delta matrix splits into a p-polarized block (indices 0 and 3)
+    and an s-polarized block (indices 1 and 2), which fulfill :math:`\Delta_j^2 = k_{z,j}^2 I`
+    with :math:`k_{z,p}^2 = \varepsilon_{xx} (1 - K_x^2 / \varepsilon_{zz})` and
+    :math:`k_{z,s}^2 = \varepsilon_{yy} - K_x^2`. Each block is propagated by
+
+    .. math::
+        P_j = \cos(k_0 d k_{z,j}) I + i \frac{\sin(k_0 d k_{z,j})}{k_{z,j}} \Delta_j
+
+    This propagator is only valid for Delta matrices of layers with a diagonal permittivity tensor.
+    """
+
+    def calculate_propagation(
+        self, delta: npt.NDArray, thickness: npt.ArrayLike, lbda: npt.ArrayLike
+    ) -> npt.NDArray:
+        """Calculates propagation for a given Delta matrix of a layer with a diagonal
+        permittivity tensor and layer thickness with the closed-form matrix exponential.
+
+        Args:
+            delta (npt.NDArray): Delta Matrix
+            thickness (npt.ArrayLike): Thickness of layer (nm), single value or one per wavelength
+            lbda (npt.ArrayLike): Wavelengths to evaluate (nm)
+
+        Returns:
+            npt.NDArray: Propagator for the given layer
+        """
+        k_z_p = sqrt(delta[:, 0, 3] * delta[:, 3, 0])
+        k_z_s = sqrt(delta[:, 1, 2] * delta[:, 2, 1])
+        # Rows sorted as in the Delta matrix: p, s, s, p
+        k_z = np.stack([k_z_p, k_z_s, k_z_s, k_z_p], axis=-1)
+        phase = (thickness * 2 * sc.pi / lbda)[:, None]
+
+        cos_kz = np.cos(phase * k_z)
+        sin_kz = phase * np.sinc(phase * k_z / sc.pi)
+
+        return cos_kz[:, :, None] * np.identity(4) + 1j * sin_kz[:, :, None] * delta
 
 
 class Solver4x4(Solver):
@@ -161,7 +292,7 @@ class Solver4x4(Solver):
 
         Args:
             k_x (npt.ArrayLike): reduce wave number, Kx = kx/k0
-            eps (npt.NDArray): permittivity tensor
+            eps (npt.NDArray): permittivity tensor, in full or compact form
 
         Returns:
             npt.NDArray: Delta 4x4 matrix: infinitesimal propagation matrix
@@ -171,6 +302,16 @@ class Solver4x4(Solver):
         else:
             length = np.shape(k_x)[0]
 
+        if np.ndim(eps) < 3:
+            # Diagonal permittivity, only the p and s blocks are occupied
+            eps_xx, eps_yy, eps_zz = tensor_diagonal(eps).T
+            delta = np.zeros((length, 4, 4), dtype=np.complex128)
+            delta[:, 0, 3] = 1 - k_x**2 / eps_zz
+            delta[:, 1, 2] = -1
+            delta[:, 2, 1] = k_x**2 - eps_yy
+            delta[:, 3, 0] = eps_xx
+            return delta
+
         zeros = np.tile(0, length)
         ones = np.tile(1, length)
 
@@ -272,7 +413,7 @@ class Solver4x4(Solver):
         Returns:
             npt.NDArray: transition matrix L
         """
-        n_x = sqrt(epsilon[:, 0, 0])
+        n_x = sqrt(tensor_diagonal(epsilon)[:, 0])
         sin_phi = k_x / n_x
         cos_phi = sqrt(1 - sin_phi**2)
 
@@ -317,48 +458,165 @@ class Solver4x4(Solver):
         Returns:
             npt.NDArray: value of Kz in the material
         """
-        nx = material.get_refractive_index(lbda)[:, 0, 0]
-        k_z2 = nx**2 - k_x**2
-        return sqrt(k_z2)
+        return Solver4x4.k_z_iso_halfspace(k_x, material.get_tensor_compact(lbda))
+
+    @staticmethod
+    def k_z_iso_halfspace(k_x: npt.ArrayLike, epsilon: npt.ArrayLike) -> npt.NDArray:
+        """Calculates Kz in an isotropic half-space from its permittivity.
+
+        Args:
+            k_x (npt.ArrayLike): Reduced wavenumber, Kx = kx/k0
+            epsilon (npt.ArrayLike): dielectric tensor, in full or compact form
+
+        Returns:
+            npt.NDArray: value of Kz in the half-space
+        """
+        return sqrt(tensor_diagonal(epsilon)[:, 0] - k_x**2)
+
+    @staticmethod
+    def is_isotropic(epsilon: npt.NDArray) -> bool:
+        """Checks if a permittivity tensor is isotropic for all wavelengths.
+
+        Args:
+            epsilon (npt.NDArray): permittivity tensor, in full or compact form
+
+        Returns:
+            bool: True if the tensor is a multiple of the identity matrix.
+        """
+        if np.ndim(epsilon) == 1:
+            return True
+        if np.ndim(epsilon) == 2:
+            return not np.any(epsilon - epsilon[:, :1])
+        return not np.any(epsilon - epsilon[:, :1, :1] * np.identity(3))
+
+    @staticmethod
+    def is_diagonal(epsilon: npt.NDArray) -> bool:
+        """Checks if a permittivity tensor is diagonal for all wavelengths,
+        i.e. the principal axes of the material are aligned to the sample.
+
+        Args:
+            epsilon (npt.NDArray): permittivity tensor, in full or compact form
+
+        Returns:
+            bool: True if all off-diagonal elements of the tensor are zero.
+        """
+        if np.ndim(epsilon) < 3:
+            return True
+        return not np.any(epsilon - epsilon * np.identity(3))
+
+    def get_propagator(self, epsilon: npt.NDArray) -> Propagator:
+        """Returns the propagator used for a layer with the permittivity tensor 'epsilon'.
+
+        If analytic propagation is enabled and no propagator was given to the solver,
+        isotropic layers are propagated by the closed-form :class:`PropagatorIsotropic`
+        and layers with a diagonal permittivity tensor by the closed-form :class:`PropagatorDiagonal`.
+        All other layers use the solver's propagator.
+
+        Args:
+            epsilon (npt.NDArray): permittivity tensor of the layer
+
+        Returns:
+            Propagator: Propagator for the layer
+        """
+        if self.analytic_propagation and not self.explicit_propagator:
+            if self.is_isotropic(epsilon):
+                return self.isotropic_propagator
+            if self.is_diagonal(epsilon):
+                return self.diagonal_propagator
+
+        return self.propagator
 
     def __init__(
-        self, experiment: "Experiment", propagator: Propagator = PropagatorExpm()
+        self,
+        experiment: "Experiment",
+        propagator: Optional[Propagator] = None,
+        analytic_propagation: bool = True,
     ) -> None:
+        """Creates a Berreman 4x4 solver for the experiment.
+
+        Args:
+            experiment (Experiment): Experiment to evaluate.
+            propagator (Propagator, optional):
+                Propagator used for all layers. Defaults to None, i.e. PropagatorExpm()
+                for general layers and the closed-form propagators, where they apply.
+            analytic_propagation (bool, optional):
+                Use closed-form propagators for layers where they are exact,
+                e.g. isotropic layers or anisotropic layers with principal axes
+                aligned to the sample, if no propagator is given. An explicitly given
+                propagator always takes precedence. Defaults to True.
+        """
         super().__init__(experiment)
-        self.propagator = propagator
+        self.explicit_propagator = propagator is not None
+        self.propagator = PropagatorExpm() if propagator is None else propagator
+        self.analytic_propagation = analytic_propagation
+        self.isotropic_propagator = PropagatorIsotropic()
+        self.diagonal_propagator = PropagatorDiagonal()
+
+    def calculate_layer_propagation(
+        self,
+        k_x: npt.NDArray,
+        lbda: npt.NDArray,
+        thickness: npt.ArrayLike,
+        epsilon: npt.NDArray,
+    ) -> npt.NDArray:
+        """Calculates the propagator through a homogeneous slice of the structure.
 
-    def calculate(self) -> Result:
-        """Calculates transition matrices for every element in the structure and resulting Jones matrices.
+        Args:
+            k_x (npt.NDArray): Reduced wavenumber on the (angle, wavelength) grid
+            lbda (npt.NDArray): Wavelengths on the (angle, wavelength) grid (nm)
+            thickness (npt.ArrayLike): Thickness of the slice (nm),
+                single value or one per wavelength of the experiment
+            epsilon (npt.NDArray): Permittivity tensor of the slice for the experiment's wavelengths
 
         Returns:
-            Result: Result object with calculation results
+            npt.NDArray: Propagator for the given slice
         """
-        # Kx = kx/k0 = n sin(Φ) : Reduced wavenumber.
-        nx = self.structure.front_material.get_refractive_index(self.lbda)[:, 0, 0]
-        k_x = nx * np.sin(np.deg2rad(self.theta_i))
+        return self.get_propagator(epsilon).calculate_propagation(
+            self.build_delta_matrix(k_x, self.broadcast_to_angles(epsilon)),
+            -self.broadcast_to_angles(thickness),
+            lbda,
+        )
 
-        layers = reversed(self.permittivity_profile[1:-1])
+    def calculate_back_transition(
+        self, k_x: npt.NDArray, epsilon_back: npt.NDArray
+    ) -> npt.NDArray:
+        """Calculates the transition matrix of the back half-space.
 
-        if isinstance(self.structure.back_material, IsotropicMaterial):
-            m_t = self.transition_matrix_iso_halfspace(
-                k_x, self.permittivity_profile[-1][1]
-            )
-        else:
-            m_t = self.transition_matrix_halfspace(
-                self.build_delta_matrix(k_x, self.permittivity_profile[-1][1])
-            )
+        Args:
+            k_x (npt.NDArray): Reduced wavenumber on the (angle, wavelength) grid
+            epsilon_back (npt.NDArray): Permittivity tensor of the back half-space
+                on the (angle, wavelength) grid
 
-        for thickness, epsilon in layers:
-            m_p = self.propagator.calculate_propagation(
-                self.build_delta_matrix(k_x, epsilon), -thickness, self.lbda
-            )
-            m_t = m_p @ m_t
+        Returns:
+            npt.NDArray: Transition matrix of the back half-space
+        """
+        if self.experiment.back_isotropic:
+            return self.transition_matrix_iso_halfspace(k_x, epsilon_back)
 
-        m_lf = self.transition_matrix_iso_halfspace(
-            k_x, self.permittivity_profile[0][1], inv=True
+        return self.transition_matrix_halfspace(
+            self.build_delta_matrix(k_x, epsilon_back)
         )
-        m_t = m_lf @ m_t
 
+    def build_result(
+        self,
+        m_t: npt.NDArray,
+        k_x: npt.NDArray,
+        epsilon_front: npt.NDArray,
+        epsilon_back: npt.NDArray,
+    ) -> Result:
+        """Extracts the Jones matrices from the total transfer matrix of the structure.
+
+        Args:
+            m_t (npt.NDArray): Transfer matrix of the structure including both half-spaces
+            k_x (npt.NDArray): Reduced wavenumber on the (angle, wavelength) grid
+            epsilon_front (npt.NDArray): Permittivity tensor of the front half-space
+                on the (angle, wavelength) grid
+            epsilon_back (npt.NDArray): Permittivity tensor of the back half-space
+                on the (angle, wavelength) grid
+
+        Returns:
+            Result: Result object with calculation results
+        """
         # Extraction of t_it out of m_t. "2::-2" means integers {2,0}.
         t_it = m_t[:, 2::-2, 2::-2]
         # Calculate the inverse and make sure it is a matrix.
@@ -370,20 +628,273 @@ class Solver4x4(Solver):
         # Then we have t_ri = t_rt * t_ti
         t_ri = t_rt @ t_ti
 
-        jones_matrix_t = t_ti
-        jones_matrix_r = t_ri
+        jones_matrix_t = self.reshape_to_angles(t_ti)
+        jones_matrix_r = self.reshape_to_angles(t_ri)
 
         # The power transmission coefficient is the ratio of the 'z' components
         # of the Poynting vector:       t = P_t_z / P_i_z
         # For isotropic media, we have: t = kb'/kf' |t_bf|^2
         # The correction coefficient is kb'/kf'
         # Note : For the moment it is only meaningful for isotropic half spaces.
-        if isinstance(self.structure.back_material, IsotropicMaterial):
-            k_z_f = self.get_k_z(self.structure.front_material, self.lbda, k_x)
-            k_z_b = self.get_k_z(self.structure.back_material, self.lbda, k_x)
-            power_correction = k_z_b.real / k_z_f.real
+        if self.experiment.back_isotropic:
+            k_z_f = self.k_z_iso_halfspace(k_x, epsilon_front)
+            k_z_b = self.k_z_iso_halfspace(k_x, epsilon_back)
+            power_correction = self.reshape_to_angles(k_z_b.real / k_z_f.real)
             return Result(
                 self.experiment, jones_matrix_r, jones_matrix_t, power_correction
             )
 
         return Result(self.experiment, jones_matrix_r, jones_matrix_t)
+
+    def calculate(self) -> Result:
+        """Calculates transition matrices for every element in the structure and resulting Jones matrices.
+
+        Returns:
+            Result: Result object with calculation results
+        """
+        lbda, theta_i = self.get_angle_grid()
+        epsilon_front = self.broadcast_to_angles(self.permittivity_profile[0][1])
+        epsilon_back = self.broadcast_to_angles(self.permittivity_profile[-1][1])
+
+        # Kx = kx/k0 = n sin(Φ) : Reduced wavenumber.
+        nx = sqrt(tensor_diagonal(epsilon_front)[:, 0])
+        k_x = nx * np.sin(np.deg2rad(theta_i))
+
+        m_t = self.calculate_back_transition(k_x, epsilon_back)
+
+        # Repeated blocks are propagated by the matrix power of one period,
+        # which is calculated by repeated squaring.
+        for repetitions, block in reversed(self.permittivity_blocks[1:-1]):
+            if not block:
+                continue
+
+            m_block = reduce(
+                np.matmul,
+                (
+                    self.calculate_layer_propagation(k_x, lbda, thickness, epsilon)
+                    for thickness, epsilon in block
+                ),
+            )
+            m_t = np.linalg.matrix_power(m_block, repetitions) @ m_t
+
+        m_lf = self.transition_matrix_iso_halfspace(k_x, epsilon_front, inv=True)
+        m_t = m_lf @ m_t
+
+        return self.build_result(m_t, k_x, epsilon_front, epsilon_back)
+
+
+class Solver4x4Session(Solver4x4):
+    """Reusable Berreman 4x4 solver bound to the structure of an experiment.
+
+    In contrast to the other solvers, the experiment is not only evaluated on creation.
+    Every call of :meth:`calculate` takes a new snapshot of the experiment,
+    e.g. after changing layer thicknesses or dispersion parameters during a fit.
+
+    The propagators of all slices are cached by thickness and permittivity tensor
+    for a reference state and the last `cache_size` calculations.
+    The cache is cleared, when the wavelengths, incident angles or front material change.
+    Additionally, the prefix and suffix products of the transfer matrix chain
+    of the reference state are stored.
+    If only one block of the structure differs from the reference state,
+    only the propagators of this block are calculated and combined with the stored products.
+    Otherwise the reference state is rebuilt from the current structure.
+    """
+
+    def __init__(
+        self,
+        experiment: "Experiment",
+        propagator: Optional[Propagator] = None,
+        analytic_propagation: bool = True,
+        cache_size: int = 1,
+    ) -> None:
+        """Creates a reusable Berreman 4x4 solver for the experiment.
+
+        Args:
+            experiment (Experiment): Experiment to evaluate, the structure is evaluated
+                in its current state on every calculation.
+            propagator (Propagator, optional):
+                Propagator used for all layers. Defaults to None, i.e. PropagatorExpm()
+                for general layers and the closed-form propagators, where they apply.
+            analytic_propagation (bool, optional):
+                Use closed-form propagators for layers where they are exact,
+                e.g. isotropic layers or anisotropic layers with principal axes
+                aligned to the sample, if no propagator is given. An explicitly given
+                propagator always takes precedence. Defaults to True.
+            cache_size (int, optional): Number of calculations for which
+                the propagators are kept in the cache,
+                in addition to the propagators of the reference state. Defaults to 1.
+        """
+        if cache_size < 1:
+            raise ValueError("Cache size needs to be at least 1.")
+
+        super().__init__(experiment, propagator, analytic_propagation)
+        self.source_experiment = experiment
+        self.cache_size = cache_size
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """Removes all cached propagators and transfer matrix products."""
+        self._front_key = None
+        self._generations = [{}]
+        self._reference = {}
+        self._chain = []
+        self._prefix = []
+        self._suffix = []
+
+    def _cached(self, key: tuple, calculate: Callable[[], npt.NDArray]) -> npt.NDArray:
+        """Returns the cached matrix for 'key' or calculates and caches it.
+
+        Args:
+            key (tuple): Hashable key describing the matrix
+            calculate (Callable[[], npt.NDArray]): Function to calculate the matrix
+
+        Returns:
+            npt.NDArray: Matrix for 'key'
+        """
+        current = self._generations[-1]
+        if key not in current:
+            for generation in [self._reference, *self._generations[:-1]]:
+                if key in generation:
+                    current[key] = generation[key]
+                    break
+            else:
+                current[key] = calculate()
+        return current[key]
+
+    def _rebuild_reference(self, chain: List[npt.NDArray]) -> None:
+        """Stores the transfer matrix chain and its prefix and suffix products.
+
+        Args:
+            chain (List[npt.NDArray]): Transfer matrices from front to back half-space
+        """
+        identity = np.broadcast_to(np.identity(4), chain[0].shape)
+
+        self._prefix = [identity]
+        for matrix in chain:
+            self._prefix.append(self._prefix[-1] @ matrix)
+
+        self._suffix = [identity]
+        for matrix in reversed(chain):
+            self._suffix.insert(0, matrix @ self._suffix[0])
+
+        self._chain = chain
+        self._reference = self._generations[-1]
+
+    def _block_matrix(
+        self,
+        k_x: npt.NDArray,
+        lbda: npt.NDArray,
+        repetitions: int,
+        block: List[Tuple[float, npt.NDArray]],
+    ) -> npt.NDArray:
+        """Returns the transfer matrix of a block of repeated slices,
+        calculating only the propagators of slices missing in the cache.
+
+        Args:
+            k_x (npt.NDArray): Reduced wavenumber on the (angle, wavelength) grid
+            lbda (npt.NDArray): Wavelengths on the (angle, wavelength) grid (nm)
+            repetitions (int): Number of repetitions of the block
+            block (List[Tuple[float, npt.NDArray]]): Permittivity profile of the block
+
+        Returns:
+            npt.NDArray: Transfer matrix of the block
+        """
+        keys = [
+            (
+                np.shape(thickness),
+                np.asarray(thickness, dtype=float).tobytes(),
+                epsilon.shape,
+                epsilon.tobytes(),
+            )
+            for thickness, epsilon in block
+        ]
+
+        def calculate_block():
+            m_block = reduce(
+                np.matmul,
+                (
+                    self._cached(
+                        key,
+                        lambda thickness=thickness, epsilon=epsilon: (
+                            self.calculate_layer_propagation(
+                                k_x, lbda, thickness, epsilon
+                            )
+                        ),
+                    )
+                    for key, (thickness, epsilon) in zip(keys, block)
+                ),
+            )
+            return np.linalg.matrix_power(m_block, repetitions)
+
+        return self._cached((repetitions, *keys), calculate_block)
+
+    def calculate(self) -> Result:
+        """Calculates the Jones matrices for the current state of the structure,
+        reusing cached propagators and transfer matrix products where possible.
+
+        Returns:
+            Result: Result object with calculation results
+        """
+        self.set_snapshot(self.source_experiment.snapshot())
+
+        lbda, theta_i = self.get_angle_grid()
+        epsilon_front = self.permittivity_blocks[0][1][0][1]
+        epsilon_back = self.permittivity_blocks[-1][1][0][1]
+
+        # All matrices depend on the wavelengths and the reduced wavenumber,
+        # i.e. the incident angles and the front material
+        front_key = tuple(
+            (np.shape(value), np.asarray(value).tobytes())
+            for value in (lbda, theta_i, epsilon_front)
+        )
+        if front_key != self._front_key:
+            self.clear_cache()
+            self._front_key = front_key
+        self._generations.append({})
+        del self._generations[: -self.cache_size - 1]
+
+        epsilon_front = self.broadcast_to_angles(epsilon_front)
+        epsilon_back_grid = self.broadcast_to_angles(epsilon_back)
+
+        # Kx = kx/k0 = n sin(Φ) : Reduced wavenumber.
+        nx = sqrt(tensor_diagonal(epsilon_front)[:, 0])
+        k_x = nx * np.sin(np.deg2rad(theta_i))
+
+        chain = [
+            self._cached(
+                ("front",),
+                lambda: self.transition_matrix_iso_halfspace(
+                    k_x, epsilon_front, inv=True
+                ),
+            )
+        ]
+        for repetitions, block in self.permittivity_blocks[1:-1]:
+            if not block:
+                continue
+
+            chain.append(self._block_matrix(k_x, lbda, repetitions, block))
+        chain.append(
+            self._cached(
+                (
+                    "back",
+                    self.experiment.back_isotropic,
+                    epsilon_back.shape,
+                    epsilon_back.tobytes(),
+                ),
+                lambda: self.calculate_back_transition(k_x, epsilon_back_grid),
+            )
+        )
+
+        changed = [
+            i for i, (new, old) in enumerate(zip(chain, self._chain)) if new is not old
+        ]
+        if len(chain) != len(self._chain) or len(changed) > 1:
+            self._rebuild_reference(chain)
+            m_t = self._suffix[0]
+        elif changed:
+            i = changed[0]
+            m_t = self._prefix[i] @ chain[i] @ self._suffix[i + 1]
+        else:
+            m_t = self._suffix[0]
+
+        return self.build_result(m_t, k_x, epsilon_front, epsilon_back_grid)
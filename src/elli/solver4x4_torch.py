@@ -0,0 +1,316 @@
+# Encoding: utf-8
+from typing import List, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+try:
+    import torch
+except ImportError:
+    TORCH_AVAILABLE = False
+else:
+    TORCH_AVAILABLE = True
+
+from .result import Result
+from .solver4x4 import Solver4x4
+from .utils import expand_tensor
+
+
+class Solver4x4Torch(Solver4x4):
+    """Solver class to evaluate Experiment objects. Based on Berreman's 4x4 method.
+
+    The complete calculation, from the permittivity profile to the Jones matrices,
+    is done with PyTorch tensors on the CPU and only the results are converted to NumPy.
+    PyTorch parallelizes the calculation over the available cores,
+    the number of threads can be set with ``torch.set_num_threads``.
+    """
+
+    def __init__(
+        self,
+        experiment: "Experiment",
+        analytic_propagation: bool = True,
+    ) -> None:
+        """Creates a Berreman 4x4 solver using PyTorch for the experiment.
+
+        Args:
+            experiment (Experiment): Experiment to evaluate.
+            analytic_propagation (bool, optional):
+                Use closed-form propagators for layers where they are exact,
+                e.g. isotropic layers or anisotropic layers with principal axes
+                aligned to the sample, instead of the matrix exponential. Defaults to True.
+        """
+        if not TORCH_AVAILABLE:
+            raise ImportError(
+                "PyTorch is not installed. If you want to use the PyTorch solver, \
+            please follow the install instructions on https://pytorch.org/get-started/locally/"
+            )
+
+        super().__init__(experiment, analytic_propagation=analytic_propagation)
+
+    @staticmethod
+    def build_delta_matrix(k_x: "torch.Tensor", eps: "torch.Tensor") -> "torch.Tensor":
+        """Calculates Delta matrix for given permittivity and reduced wave number.
+
+        Args:
+            k_x (torch.Tensor): reduce wave number, Kx = kx/k0
+            eps (torch.Tensor): permittivity tensor
+
+        Returns:
+            torch.Tensor: Delta 4x4 matrix: infinitesimal propagation matrix
+        """
+        delta = torch.zeros((eps.shape[0], 4, 4), dtype=torch.complex128)
+
+        delta[:, 0, 0] = -k_x * eps[:, 2, 0] / eps[:, 2, 2]
+        delta[:, 0, 1] = -k_x * eps[:, 2, 1] / eps[:, 2, 2]
+        delta[:, 0, 3] = 1 - k_x**2 / eps[:, 2, 2]
+        delta[:, 1, 2] = -1
+        delta[:, 2, 0] = eps[:, 1, 2] * eps[:, 2, 0] / eps[:, 2, 2] - eps[:, 1, 0]
+        delta[:, 2, 1] = (
+            k_x**2 - eps[:, 1, 1] + eps[:, 1, 2] * eps[:, 2, 1] / eps[:, 2, 2]
+        )
+        delta[:, 2, 3] = k_x * eps[:, 1, 2] / eps[:, 2, 2]
+        delta[:, 3, 0] = eps[:, 0, 0] - eps[:, 0, 2] * eps[:, 2, 0] / eps[:, 2, 2]
+        delta[:, 3, 1] = eps[:, 0, 1] - eps[:, 0, 2] * eps[:, 2, 1] / eps[:, 2, 2]
+        delta[:, 3, 3] = -k_x * eps[:, 0, 2] / eps[:, 2, 2]
+
+        return delta
+
+    @staticmethod
+    def transition_matrix_halfspace(delta: "torch.Tensor") -> "torch.Tensor":
+        """Returns transition exit matrix L for any half-space.
+
+        Sort eigenvectors of the Delta matrix according to propagation
+        direction first, then according to $y$ component.
+
+        Returns eigenvectors ordered like (s+,s-,p+,p-)
+
+        Args:
+            delta (torch.Tensor): Delta 4x4 matrix: infinitesimal propagation matrix
+
+        Returns:
+            torch.Tensor: Translation matrix for semi-infinite half-spaces
+        """
+
+        def take(p: "torch.Tensor", i: "torch.Tensor") -> "torch.Tensor":
+            return torch.gather(p, -1, i[:, None, :].expand(-1, p.shape[1], -1))
+
+        q, p = torch.linalg.eig(delta)
+
+        # Sort according to z propagation direction, by Re(q) first, then Im(q)
+        idx = torch.argsort(-q.real, dim=-1, stable=True)
+        idx = torch.gather(
+            idx,
+            -1,
+            torch.argsort(-torch.gather(q.imag, -1, idx), dim=-1, stable=True),
+        )
+
+        p = take(p, idx)
+        # Result should be (+,+,-,-)
+
+        # For each direction, sort according to Ey component, highest Ey first
+        i1 = torch.argsort(-p[:, 1, :2].abs(), dim=-1, stable=True)
+        i2 = 2 + torch.argsort(-p[:, 1, 2:].abs(), dim=-1, stable=True)
+        # Result should be (s+,p+,s-,p-), reorder to (s+,s-,p+,p-)
+        i = torch.cat((i1, i2), dim=-1)[:, [0, 2, 1, 3]]
+
+        p = take(p, i)
+
+        # Adjust Ey in ℝ⁺ for 's', and Ex in ℝ⁺ for 'p'
+        e = torch.cat((p[:, 1, :2], p[:, 0, 2:]), dim=-1)
+
+        ne = e.abs()
+        c = torch.where(ne != 0.0, e / ne, torch.ones_like(e))
+
+        p = p * c[:, None, :]
+
+        # Normalize so that Ey = c1 + c2, analog to Ey = Eis + Ers
+        c = p[:, 1, 0] + p[:, 1, 1]
+
+        return 2 * p / c[:, None, None]
+
+    @staticmethod
+    def transition_matrix_iso_halfspace(
+        k_x: "torch.Tensor", epsilon: "torch.Tensor", inv: bool = False
+    ) -> "torch.Tensor":
+        """Returns transition incident or exit matrix L for isotropic half-spaces.
+
+        Args:
+            k_x (torch.Tensor): Reduced wavenumber, Kx = kx/k0
+            epsilon (torch.Tensor): dielectric tensor
+            inv (bool, optional): If True, returns inverse transition matrix L^-1, used for the incident Matrix Li. Defaults to False.
+
+        Returns:
+            torch.Tensor: transition matrix L
+        """
+        n_x = torch.sqrt(epsilon[:, 0, 0])
+        cos_phi = torch.sqrt(1 - (k_x / n_x) ** 2)
+
+        sp_to_xy = torch.zeros((k_x.shape[0], 4, 4), dtype=torch.complex128)
+
+        if inv:
+            sp_to_xy[:, 0, 1] = 0.5
+            sp_to_xy[:, 0, 2] = -0.5 / cos_phi / n_x
+            sp_to_xy[:, 1, 1] = 0.5
+            sp_to_xy[:, 1, 2] = 0.5 / cos_phi / n_x
+            sp_to_xy[:, 2, 0] = 0.5 / cos_phi
+            sp_to_xy[:, 2, 3] = 0.5 / n_x
+            sp_to_xy[:, 3, 0] = -0.5 / cos_phi
+            sp_to_xy[:, 3, 3] = 0.5 / n_x
+            return sp_to_xy
+
+        sp_to_xy[:, 0, 2] = cos_phi
+        sp_to_xy[:, 0, 3] = -cos_phi
+        sp_to_xy[:, 1, 0] = 1
+        sp_to_xy[:, 1, 1] = 1
+        sp_to_xy[:, 2, 0] = -n_x * cos_phi
+        sp_to_xy[:, 2, 1] = n_x * cos_phi
+        sp_to_xy[:, 3, 2] = n_x
+        sp_to_xy[:, 3, 3] = n_x
+        return sp_to_xy
+
+    def to_tensor(self, values: npt.ArrayLike) -> "torch.Tensor":
+        """Converts an array given for the wavelengths of the experiment
+        to a complex tensor on the flattened (angle, wavelength) grid.
+
+        Args:
+            values (npt.ArrayLike): Array with the wavelengths along the first axis.
+
+        Returns:
+            torch.Tensor: Complex tensor with the flattened grid along the first axis.
+        """
+        return torch.tensor(self.broadcast_to_angles(values), dtype=torch.complex128)
+
+    def calculate_layer_propagation(
+        self,
+        k_x: "torch.Tensor",
+        lbda: "torch.Tensor",
+        thickness: npt.ArrayLike,
+        epsilon: npt.NDArray,
+    ) -> "torch.Tensor":
+        """Calculates the propagator through a homogeneous slice of the structure.
+
+        Args:
+            k_x (torch.Tensor): Reduced wavenumber on the (angle, wavelength) grid
+            lbda (torch.Tensor): Wavelengths on the (angle, wavelength) grid (nm)
+            thickness (npt.ArrayLike): Thickness of the slice (nm), single value or one per wavelength
+            epsilon (npt.NDArray): Permittivity tensor of the slice for the experiment's wavelengths
+
+        Returns:
+            torch.Tensor: Propagator for the given slice
+        """
+        delta = self.build_delta_matrix(k_x, self.to_tensor(expand_tensor(epsilon)))
+        thickness = torch.as_tensor(
+            self.broadcast_to_angles(thickness), dtype=torch.float64
+        )
+        phase = -thickness * 2 * np.pi / lbda
+
+        if self.analytic_propagation and self.is_diagonal(epsilon):
+            # Closed form for the p block (indices 0 and 3) and s block (indices 1 and 2),
+            # see PropagatorIsotropic and PropagatorDiagonal
+            k_z_p = torch.sqrt(delta[:, 0, 3] * delta[:, 3, 0])
+            k_z_s = torch.sqrt(delta[:, 1, 2] * delta[:, 2, 1])
+            k_z = torch.stack([k_z_p, k_z_s, k_z_s, k_z_p], dim=-1)
+
+            cos_kz = torch.cos(phase[:, None] * k_z)
+            sin_kz = phase[:, None] * torch.sinc(phase[:, None] * k_z / np.pi)
+
+            return torch.diag_embed(cos_kz) + 1j * sin_kz[:, :, None] * delta
+
+        return torch.linalg.matrix_exp(1j * phase[:, None, None] * delta)
+
+    def calculate_back_transition(
+        self, k_x: "torch.Tensor", epsilon_back: "torch.Tensor"
+    ) -> "torch.Tensor":
+        """Calculates the transition matrix of the back half-space.
+
+        Args:
+            k_x (torch.Tensor): Reduced wavenumber on the (angle, wavelength) grid
+            epsilon_back (torch.Tensor): Permittivity tensor of the back half-space
+                on the (angle, wavelength) grid
+
+        Returns:
+            torch.Tensor: Transition matrix of the back half-space
+        """
+        if self.experiment.back_isotropic:
+            return self.transition_matrix_iso_halfspace(k_x, epsilon_back)
+
+        return self.transition_matrix_halfspace(
+            self.build_delta_matrix(k_x, epsilon_back)
+        )
+
+    def calculate_block(
+        self,
+        k_x: "torch.Tensor",
+        lbda: "torch.Tensor",
+        repetitions: int,
+        block: List[Tuple[float, npt.NDArray]],
+    ) -> "torch.Tensor":
+        """Calculates the transfer matrix of a block of repeated slices.
+
+        Args:
+            k_x (torch.Tensor): Reduced wavenumber on the (angle, wavelength) grid
+            lbda (torch.Tensor): Wavelengths on the (angle, wavelength) grid (nm)
+            repetitions (int): Number of repetitions of the block
+            block (List[Tuple[float, npt.NDArray]]): Permittivity profile of the block
+
+        Returns:
+            torch.Tensor: Transfer matrix of the block
+        """
+        m_block = self.calculate_layer_propagation(k_x, lbda, *block[0])
+        for thickness, epsilon in block[1:]:
+            m_block = m_block @ self.calculate_layer_propagation(
+                k_x, lbda, thickness, epsilon
+            )
+
+        return torch.linalg.matrix_power(m_block, repetitions)
+
+    def calculate(self) -> Result:
+        """Calculates transition matrices for every element in the structure and resulting Jones matrices.
+
+        Returns:
+            Result: Result object with calculation results
+        """
+        lbda, theta_i = self.get_angle_grid()
+        lbda = torch.tensor(lbda, dtype=torch.float64)
+
+        epsilon_front = self.to_tensor(expand_tensor(self.permittivity_profile[0][1]))
+        epsilon_back = self.to_tensor(expand_tensor(self.permittivity_profile[-1][1]))
+
+        # Kx = kx/k0 = n sin(Φ) : Reduced wavenumber.
+        nx = torch.sqrt(epsilon_front[:, 0, 0])
+        k_x = nx * torch.tensor(np.sin(np.deg2rad(theta_i)), dtype=torch.float64)
+
+        m_t = self.calculate_back_transition(k_x, epsilon_back)
+
+        # Repeated blocks are propagated by the matrix power of one period,
+        # which is calculated by repeated squaring.
+        for repetitions, block in reversed(self.permittivity_blocks[1:-1]):
+            if not block:
+                continue
+
+            m_t = self.calculate_block(k_x, lbda, repetitions, block) @ m_t
+
+        m_lf = self.transition_matrix_iso_halfspace(k_x, epsilon_front, inv=True)
+        m_t = m_lf @ m_t
+
+        # Extraction of t_it and t_rt out of m_t, with the indices {2,0} and {3,1}.
+        t_it = m_t[:, [2, 0]][:, :, [2, 0]]
+        t_rt = m_t[:, [3, 1]][:, :, [2, 0]]
+
+        t_ti = torch.linalg.inv(t_it)
+        t_ri = t_rt @ t_ti
+
+        jones_matrix_t = self.reshape_to_angles(t_ti.numpy())
+        jones_matrix_r = self.reshape_to_angles(t_ri.numpy())
+
+        # The correction coefficient for the power transmission is kb'/kf',
+        # only meaningful for isotropic half spaces.
+        if self.experiment.back_isotropic:
+            k_z_f = torch.sqrt(epsilon_front[:, 0, 0] - k_x**2)
+            k_z_b = torch.sqrt(epsilon_back[:, 0, 0] - k_x**2)
+            power_correction = self.reshape_to_angles((k_z_b.real / k_z_f.real).numpy())
+            return Result(
+                self.experiment, jones_matrix_r, jones_matrix_t, power_correction
+            )
+
+        return Result(self.experiment, jones_matrix_r, jones_matrix_t)
@@ -16,20 +16,24 @@ There are also classes to approximate layers with varying properties along the z
 
 * :class:`TwistedLayer` is able to represent rotating materials, like twisted nematic materials.
 * :class:`VaryingMixtureLayer` takes an :class:`MixtureMaterial<elli.materials.MixtureMaterial>` and uses a gradient as mixture fraction.
+
+Instead of a fixed number of uniform slices, the slicing can be adapted to an error tolerance
+with :meth:`InhomogeneousLayer.set_tolerance`, using thin slices only where the permittivity changes quickly.
 """
 
+import warnings
 from abc import ABC, abstractmethod
-from typing import Callable, List, Tuple
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
 
 from .experiment import Experiment
-from .materials import IsotropicMaterial, Material, MixtureMaterial
+from .materials import IsotropicMaterial, Material, MixtureMaterial, shared_tensors
 from .result import Result
 from .solver import Solver
-from .solver4x4 import Solver4x4
-from .utils import E_Z, rotation_v_theta
+from .solver4x4 import Solver4x4, Solver4x4Session
+from .utils import broadcast_tensors, expand_tensor
 
 
 class AbstractLayer(ABC):
@@ -40,6 +44,8 @@ class AbstractLayer(ABC):
         self, lbda: npt.ArrayLike
     ) -> List[Tuple[float, npt.NDArray]]:
         """Returns the permittivity profile of the layer for the given wavelengths.
+        The dielectric tensors are given in their most compact form, see
+        :meth:`Material.get_tensor_compact<elli.materials.Material.get_tensor_compact>`.
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
@@ -49,6 +55,21 @@ class AbstractLayer(ABC):
                 Returns list of tuples [(thickness, dielectric tensor), ...]
         """
 
+    def get_permittivity_blocks(
+        self, lbda: npt.ArrayLike
+    ) -> List[Tuple[int, List[Tuple[float, npt.NDArray]]]]:
+        """Returns the permittivity profile of the layer for the given wavelengths,
+        grouped into blocks of repeated slices.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[int, List[Tuple[float, npt.NDArray]]]]:
+                Returns list of tuples [(repetitions, permittivity profile), ...]
+        """
+        return [(1, self.get_permittivity_profile(lbda))]
+
 
 class RepeatedLayers(AbstractLayer):
     """Repeated structure of layers."""
@@ -133,15 +154,38 @@ class RepeatedLayers(AbstractLayer):
             List[Tuple[float, npt.NDArray]]:
                 Returns list of tuples [(thickness, dielectric tensor), ...]
         """
+        return [
+            layer
+            for repetitions, block in self.get_permittivity_blocks(lbda)
+            for layer in repetitions * block
+        ]
+
+    def get_permittivity_blocks(
+        self, lbda: npt.ArrayLike
+    ) -> List[Tuple[int, List[Tuple[float, npt.NDArray]]]]:
+        """Returns the permittivity profile of the layer for the given wavelengths,
+        grouped into blocks of repeated slices.
+        The period is only evaluated once and returned as one block,
+        so solvers can propagate through all repetitions at once.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[int, List[Tuple[float, npt.NDArray]]]]:
+                Returns list of tuples [(repetitions, permittivity profile), ...]
+        """
         layers = []
         for layer in self.layers:
             layers += layer.get_permittivity_profile(lbda)
 
+        blocks = []
         if self.before > 0:
-            before = layers[-self.before :]
-        else:
-            before = []
-        return before + self.repetitions * layers + layers[: self.after]
+            blocks.append((1, layers[-self.before :]))
+        blocks.append((self.repetitions, layers))
+        if self.after > 0:
+            blocks.append((1, layers[: self.after]))
+        return blocks
 
 
 class Layer(AbstractLayer):
@@ -195,7 +239,7 @@ class Layer(AbstractLayer):
             List[Tuple[float, npt.NDArray]]:
                 Returns a list containing one tuple [(thickness, dielectric tensor)]
         """
-        return [(self.thickness, self.material.get_tensor(lbda))]
+        return [(self.thickness, self.material.get_tensor_shared(lbda))]
 
 
 #########################################################
@@ -208,6 +252,8 @@ class InhomogeneousLayer(AbstractLayer):
     thickness = None
     material = None
     div = None
+    tolerance = None
+    max_div = None
 
     def set_thickness(self, thickness: float) -> None:
         """Defines the thickness of the layer in nm.
@@ -244,18 +290,145 @@ class InhomogeneousLayer(AbstractLayer):
 
         self.div = div
 
-    def get_slices(self) -> npt.NDArray:
+    def set_tolerance(self, tolerance: Optional[float], max_div: int = 1000) -> None:
+        """Enables adaptive slicing of the layer.
+
+        The uniform slicing set by :meth:`set_divisions` is used as starting point.
+        Slices are bisected where their estimated error is larger than the tolerance
+        and neighbouring slices are merged where the merged slice stays below it.
+        The error of a slice is estimated as 2π h / λ · Δε, with the thickness h of the slice,
+        the shortest wavelength λ and the variation Δε of the permittivity over the slice
+        (sum of the real and imaginary range of the largest varying tensor element).
+        It bounds the change of the slice's propagator by the variation of the permittivity.
+
+        Args:
+            tolerance (Optional[float]): Maximum estimated error of a slice.
+                None disables adaptive slicing.
+            max_div (int, optional): Maximum number of slices. If the tolerance is not
+                reached with this number of slices, a warning is issued. Defaults to 1000.
+        """
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError("Tolerance needs to be larger than 0.")
+        if max_div < 1:
+            raise ValueError("Number of slices need to be at least 1.")
+
+        self.tolerance = tolerance
+        self.max_div = max_div
+
+    def get_slices(self, lbda: Optional[npt.ArrayLike] = None) -> npt.NDArray:
         """Returns z slicing with the position relative to this layer, not to the whole structure.
 
+        Args:
+            lbda (npt.ArrayLike, optional): Wavelengths (in nm) to adapt the slicing to,
+                if a tolerance is set. Defaults to None, i.e. uniform slicing.
+
         Returns:
             npt.NDArray: array of 'z' positions [z0, z1,... , zmax], with z0 = 0 and zmax = z{d+1}
         """
-        return np.linspace(0, self.thickness, self.div + 1)
+        z = np.linspace(0, self.thickness, self.div + 1)
+        if self.tolerance is None or lbda is None:
+            return z
+
+        return self._adapt_slices(z, lbda)
+
+    def get_divisions(self, lbda: Optional[npt.ArrayLike] = None) -> int:
+        """Returns the number of slices used to simulate the layer.
+
+        Args:
+            lbda (npt.ArrayLike, optional): Wavelengths (in nm) of the adaptive slicing.
+                Defaults to None, i.e. uniform slicing.
+
+        Returns:
+            int: Number of slices.
+        """
+        return self.get_slices(lbda).size - 1
+
+    def _adapt_slices(self, z: npt.NDArray, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Refines and merges slices until the estimated error of each slice
+        is below the tolerance, see :meth:`set_tolerance`.
+
+        Args:
+            z (npt.NDArray): Initial slice boundaries.
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Adapted slice boundaries.
+        """
+        wavenumber = 2 * np.pi / np.min(lbda)
+        epsilon = self._stacked_tensors(z, lbda)
+
+        while True:
+            variation = np.abs(np.diff(epsilon, axis=0)).sum(1)
+            errors = wavenumber * np.diff(z) * variation.reshape(z.size - 1, -1).max(1)
+            refine = errors > self.tolerance
+
+            if not refine.any():
+                break
+
+            if z.size - 1 + np.count_nonzero(refine) > self.max_div:
+                warnings.warn(
+                    f"Adaptive slicing stopped at {z.size - 1} slices with an estimated error "
+                    f"of {errors.max()}, which exceeds the tolerance of {self.tolerance}."
+                )
+                break
+
+            midpoints = (z[:-1] + z[1:])[refine] / 2
+            z = np.concatenate([z, midpoints])
+            epsilon = np.concatenate([epsilon, self._stacked_tensors(midpoints, lbda)])
+            order = np.argsort(z)
+            z, epsilon = z[order], epsilon[order]
+
+        # Merge neighbouring slices, while the range of the permittivity
+        # over the merged slice stays within the tolerance
+        boundaries = [0]
+        lower, upper = epsilon[0], epsilon[0]
+        for i in range(1, z.size):
+            lower = np.minimum(lower, epsilon[i])
+            upper = np.maximum(upper, epsilon[i])
+            variation = (upper - lower).sum(0).max()
+
+            if (
+                i - boundaries[-1] > 1
+                and wavenumber * (z[i] - z[boundaries[-1]]) * variation > self.tolerance
+            ):
+                boundaries.append(i - 1)
+                lower = np.minimum(epsilon[i - 1], epsilon[i])
+                upper = np.maximum(epsilon[i - 1], epsilon[i])
+
+        boundaries.append(z.size - 1)
+        return z[boundaries]
+
+    def _stacked_tensors(self, z: npt.NDArray, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Returns the real and imaginary parts of the permittivities for the positions 'z'
+        in their common compact form, stacked to shape (len(z), 2, N, ...)."""
+        epsilon = np.stack(broadcast_tensors(*self.get_tensors_compact(z, lbda)))
+        return np.stack([epsilon.real, epsilon.imag], axis=1)
 
     @abstractmethod
     def get_tensor(self, z: float, lbda: npt.ArrayLike) -> npt.NDArray:
         """Returns permittivity tensor matrix for position 'z'."""
 
+    def get_tensor_compact(self, z: float, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Returns the permittivity for position 'z' in its most compact form,
+        see :meth:`Material.get_tensor_compact<elli.materials.Material.get_tensor_compact>`.
+        Defaults to the full permittivity tensor."""
+        return self.get_tensor(z, lbda)
+
+    def get_tensors_compact(
+        self, z: npt.NDArray, lbda: npt.ArrayLike
+    ) -> List[npt.NDArray]:
+        """Returns the permittivities for all positions 'z' in their most compact form.
+        Defaults to evaluating :meth:`get_tensor_compact` for each position.
+
+        Args:
+            z (npt.NDArray): Array of positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[npt.NDArray]: Permittivities of shape (N,), (N, 3) or (N, 3, 3).
+        """
+        return [self.get_tensor_compact(position, lbda) for position in z]
+
     def get_permittivity_profile(self, lbda: npt.ArrayLike) -> List:
         """Returns the permittivity profile of the layer for the given wavelengths.
         The tensor is evaluated in the middle of each slice.
@@ -267,11 +440,10 @@ class InhomogeneousLayer(AbstractLayer):
             List[Tuple[float, npt.NDArray]]:
                 Returns list of tuples [(d1, epsilon1), (d2, epsilon2), ...]
         """
-        z = self.get_slices()
+        z = self.get_slices(lbda)
         h = np.diff(z)
-        zmid = (z[:-1] + z[1:]) / 2.0
-        tensor = [self.get_tensor(z, lbda) for z in zmid]
-        return list(zip(h, tensor))
+        tensors = self.get_tensors_compact((z[:-1] + z[1:]) / 2.0, lbda)
+        return list(zip(h, tensors))
 
 
 class TwistedLayer(InhomogeneousLayer):
@@ -312,10 +484,59 @@ class TwistedLayer(InhomogeneousLayer):
         Returns:
             npt.NDArray: Permittivity tensor for position 'z' and wavelength 'lbda'.
         """
-        epsilon = self.material.get_tensor(lbda)
-        m_r = rotation_v_theta(E_Z, self.angle * z / self.thickness)
+        epsilon = expand_tensor(self.material.get_tensor_shared(lbda))
+        m_r = self.get_rotations(z)
         return m_r @ epsilon @ m_r.T
 
+    def get_rotations(self, z: npt.ArrayLike) -> npt.NDArray:
+        """Gets the rotation matrices around the z axis for the positions 'z'.
+
+        Args:
+            z (npt.ArrayLike): Single value or array of positions in the layer (in nm)
+
+        Returns:
+            npt.NDArray: Rotation matrices of shape z.shape + (3, 3).
+        """
+        theta = np.deg2rad(self.angle * np.asarray(z, dtype=float) / self.thickness)
+        cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+
+        m_r = np.zeros(theta.shape + (3, 3))
+        m_r[..., 0, 0] = cos_theta
+        m_r[..., 0, 1] = -sin_theta
+        m_r[..., 1, 0] = sin_theta
+        m_r[..., 1, 1] = cos_theta
+        m_r[..., 2, 2] = 1
+        return m_r
+
+    def get_tensors_compact(
+        self, z: npt.NDArray, lbda: npt.ArrayLike
+    ) -> List[npt.NDArray]:
+        """Returns the permittivities for all positions 'z' in their most compact form.
+        The material is evaluated once and rotated to all positions at once.
+
+        Args:
+            z (npt.NDArray): Array of positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[npt.NDArray]: Permittivities of shape (N,), (N, 3) or (N, 3, 3).
+        """
+        epsilon = self.material.get_tensor_shared(lbda)
+
+        # Isotropic materials and uniaxial materials with their optical axis along z
+        # are not changed by rotations around z
+        if np.ndim(epsilon) == 1 or (
+            np.ndim(epsilon) == 2 and not np.any(epsilon[:, 0] - epsilon[:, 1])
+        ):
+            return [epsilon] * len(z)
+
+        m_r = self.get_rotations(z)
+        return list(
+            np.einsum(
+                "sij,njk,slk->snil", m_r, expand_tensor(epsilon), m_r, optimize=True
+            )
+        )
+
 
 class VaryingMixtureLayer(InhomogeneousLayer):
     """Mixture layer, with varying fraction dependent on z Position.
@@ -340,6 +561,7 @@ class VaryingMixtureLayer(InhomogeneousLayer):
                 Function to modify the fraction amount,
                 takes float from 0 to 1 (top to bottom of layer),
                 should return fraction at that level.
+                Functions accepting arrays are evaluated for all slices at once.
                 Defaults to a linear profile
                 (100% host material to 100% guest material).
         """
@@ -371,6 +593,7 @@ class VaryingMixtureLayer(InhomogeneousLayer):
                 Function to modify the fraction amount,
                 takes float from 0 to 1 (top to bottom of layer),
                 should return fraction at that level.
+                Functions accepting arrays are evaluated for all slices at once.
                 Defaults to a linear profile
                 (100% host material to 100% guest material).
         """
@@ -386,10 +609,58 @@ class VaryingMixtureLayer(InhomogeneousLayer):
         Returns:
             npt.NDArray: Permittivity tensor for position 'z' and wavelength 'lbda'.
         """
-        epsilon = self.material.get_tensor_fraction(
+        return expand_tensor(self.get_tensor_compact(z, lbda))
+
+    def get_tensor_compact(self, z: float, lbda: npt.ArrayLike) -> npt.NDArray:
+        """Gets the permittivity for position 'z' and wavelength 'lbda' in its most compact form.
+
+        Args:
+            z (float): Position in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            npt.NDArray: Permittivity of shape (N,), (N, 3) or (N, 3, 3).
+        """
+        return self.material.get_tensor_fraction_compact(
             lbda, self.fraction_modulation(z / self.thickness)
         )
-        return epsilon
+
+    def get_fractions(self, z: npt.NDArray) -> npt.NDArray:
+        """Gets the fractions of the guest material for the positions 'z'.
+        The fraction modulation is called once with the whole array,
+        functions which only take single values are called for each position.
+
+        Args:
+            z (npt.NDArray): Array of positions in the layer (in nm)
+
+        Returns:
+            npt.NDArray: Fractions of the guest material for each position.
+        """
+        relative_z = z / self.thickness
+        try:
+            return np.broadcast_to(
+                np.asarray(self.fraction_modulation(relative_z), dtype=float),
+                relative_z.shape,
+            )
+        except (TypeError, ValueError):
+            return np.array([self.fraction_modulation(value) for value in relative_z])
+
+    def get_tensors_compact(
+        self, z: npt.NDArray, lbda: npt.ArrayLike
+    ) -> List[npt.NDArray]:
+        """Returns the permittivities for all positions 'z' in their most compact form.
+        Host and guest material are evaluated once for the fractions of all positions.
+
+        Args:
+            z (npt.NDArray): Array of positions in the layer (in nm)
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[npt.NDArray]: Permittivities of shape (N,), (N, 3) or (N, 3, 3).
+        """
+        return list(
+            self.material.get_tensor_fraction_compact(lbda, self.get_fractions(z))
+        )
 
 
 #########################################################
@@ -469,6 +740,8 @@ class Structure:
         self, lbda: npt.ArrayLike
     ) -> List[Tuple[float, npt.NDArray]]:
         """Returns the permittivity profile of the complete structure for the given wavelengths.
+        The dielectric tensors are given in their most compact form, see
+        :meth:`Material.get_tensor_compact<elli.materials.Material.get_tensor_compact>`.
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
@@ -477,18 +750,44 @@ class Structure:
             List[Tuple[float, npt.NDArray]]:
                 Returns list of tuples [(thickness, dielectric tensor), ...]
         """
-        permittivity_profile = [(np.inf, self.front_material.get_tensor(lbda))]
+        return [
+            layer
+            for repetitions, block in self.get_permittivity_blocks(lbda)
+            for layer in repetitions * block
+        ]
 
-        for layer in self.layers:
-            permittivity_profile.extend(layer.get_permittivity_profile(lbda))
+    def get_permittivity_blocks(
+        self, lbda: npt.ArrayLike
+    ) -> List[Tuple[int, List[Tuple[float, npt.NDArray]]]]:
+        """Returns the permittivity profile of the complete structure for the given wavelengths,
+        grouped into blocks of repeated slices.
+        The first and the last block contain the front and back half-space, respectively.
 
-        permittivity_profile.extend([(np.inf, self.back_material.get_tensor(lbda))])
-        return permittivity_profile
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+
+        Returns:
+            List[Tuple[int, List[Tuple[float, npt.NDArray]]]]:
+                Returns list of tuples [(repetitions, permittivity profile), ...]
+        """
+        with shared_tensors():
+            permittivity_blocks = [
+                (1, [(np.inf, self.front_material.get_tensor_shared(lbda))])
+            ]
+
+            for layer in self.layers:
+                permittivity_blocks.extend(layer.get_permittivity_blocks(lbda))
+
+            permittivity_blocks.append(
+                (1, [(np.inf, self.back_material.get_tensor_shared(lbda))])
+            )
+
+        return permittivity_blocks
 
     def evaluate(
         self,
         lbda: npt.ArrayLike,
-        theta_i: float,
+        theta_i: Union[float, npt.ArrayLike],
         solver: Solver = Solver4x4,
         **solver_kwargs,
     ) -> Result:
@@ -496,7 +795,9 @@ class Structure:
 
         Args:
             lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
-            theta_i (float): Incident angle of the experiment (in degrees).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles of the experiment (in degrees).
+                For an array of angles, all angles are evaluated at once.
             solver (Solver, optional): Choose which solver class is used. Defaults to Solver4x4.
             solver_kwargs (optional): Keyword arguments for the Solver can be appended as arguments.
 
@@ -505,3 +806,24 @@ class Structure:
         """
         exp = Experiment(self, lbda, theta_i)
         return exp.evaluate(solver, **solver_kwargs)
+
+    def create_session(
+        self,
+        lbda: npt.ArrayLike,
+        theta_i: Union[float, npt.ArrayLike],
+        **solver_kwargs,
+    ) -> Solver4x4Session:
+        """Returns a reusable solver bound to this structure.
+        Calling its :meth:`calculate<elli.solver4x4.Solver4x4Session.calculate>` method
+        evaluates the current state of the structure and only recalculates changed layers.
+
+        Args:
+            lbda (npt.ArrayLike): Single value or array of wavelengths (in nm).
+            theta_i (Union[float, npt.ArrayLike]):
+                Single value or array of incident angles of the experiment (in degrees).
+            solver_kwargs (optional): Keyword arguments for the Solver can be appended as arguments.
+
+        Returns:
+            Solver4x4Session: Reusable solver for this structure.
+        """
+        return Solver4x4Session(Experiment(self, lbda, theta_i), **solver_kwargs)
@@ -1,5 +1,6 @@
 # Encoding: utf-8
 from dataclasses import dataclass
+from typing import Callable, Hashable, List
 
 import chardet
 import numpy as np
@@ -198,19 +199,26 @@ E_Y = np.array([0, 1, 0]).reshape((3,))
 E_Z = np.array([0, 0, 1]).reshape((3,))
 
 
+PLANCK_SPEED_OF_LIGHT = sc.speed_of_light * sc.value("Planck constant in eV/Hz")
+
+
 def conversion_wavelength_energy(value: npt.ArrayLike) -> npt.ArrayLike:
     r"""Converts wavelength values to energy values and vice versa.
 
     .. math::
         value_{\text{target}} = c \cdot \hbar / \boldsymbol{value}
 
+    For a :class:`SpectralAxis` the energies are only calculated once.
+
     Args:
         value (npt.ArrayLike): Single value or array of wavelengths in nm or energy in eV.
 
     Returns:
         npt.ArrayLike: Energy in eV or wavelength in nm.
     """
-    return sc.speed_of_light * sc.value("Planck constant in eV/Hz") / (value * 1e-9)
+    if isinstance(value, SpectralAxis):
+        return value.energy
+    return PLANCK_SPEED_OF_LIGHT / (value * 1e-9)
 
 
 def conversion_frequency2energy(f: npt.ArrayLike) -> npt.ArrayLike:
@@ -274,6 +282,115 @@ def conversion_wavelength_wavenumber(value: npt.ArrayLike) -> npt.ArrayLike:
     return 1e7 / value
 
 
+class SpectralAxis(np.ndarray):
+    """Read-only array of wavelengths (in nm), which calculates the corresponding
+    energies only once.
+
+    It can be used everywhere in place of a wavelength array,
+    e.g. an :class:`Experiment<elli.experiment.Experiment>` passes its wavelengths
+    as SpectralAxis to all materials and dispersions of the structure.
+    Results of calculations with a SpectralAxis are plain arrays.
+    """
+
+    _quantities = None
+
+    def __new__(cls, lbda: npt.ArrayLike) -> "SpectralAxis":
+        axis = np.array(lbda, dtype=np.float64).view(cls)
+        axis.setflags(write=False)
+        return axis
+
+    def __array_finalize__(self, obj) -> None:
+        self._quantities = {}
+
+    def __array_wrap__(self, array, context=None, return_scalar=False):
+        array = array.view(np.ndarray)
+        return array[()] if return_scalar else array
+
+    def _get_quantity(self, key: Hashable, calculate: Callable) -> npt.NDArray:
+        if key not in self._quantities:
+            quantity = np.asarray(calculate())
+            quantity.setflags(write=False)
+            self._quantities[key] = quantity
+        return self._quantities[key]
+
+    @property
+    def lbda(self) -> npt.NDArray:
+        """Wavelengths in nm."""
+        return self.view(np.ndarray)
+
+    @property
+    def energy(self) -> npt.NDArray:
+        """Energies in eV."""
+        return self._get_quantity(
+            "energy", lambda: PLANCK_SPEED_OF_LIGHT / (self.lbda * 1e-9)
+        )
+
+
+#########################################################
+# Permittivity tensors
+#
+# Materials return their permittivity tensor for N wavelengths in the most compact
+# of three forms: one value per wavelength (N,) for isotropic materials,
+# the diagonal elements (N, 3) for materials with their principal axes along x, y and z
+# or the full tensor (N, 3, 3).
+
+
+def expand_tensor(epsilon: npt.ArrayLike) -> npt.NDArray:
+    """Returns the full permittivity tensor of a compact permittivity.
+
+    Args:
+        epsilon (npt.ArrayLike): Permittivity of shape (N,), (N, 3) or (N, 3, 3).
+
+    Returns:
+        npt.NDArray: Permittivity tensor of shape (N, 3, 3).
+    """
+    epsilon = np.asarray(epsilon)
+    if epsilon.ndim == 1:
+        return epsilon[:, np.newaxis, np.newaxis] * np.identity(3)
+    if epsilon.ndim == 2:
+        return epsilon[:, :, np.newaxis] * np.identity(3)
+    return epsilon
+
+
+def tensor_diagonal(epsilon: npt.ArrayLike) -> npt.NDArray:
+    """Returns the diagonal elements of a compact permittivity.
+
+    Args:
+        epsilon (npt.ArrayLike): Permittivity of shape (N,), (N, 3) or (N, 3, 3).
+
+    Returns:
+        npt.NDArray: Read-only diagonal elements of shape (N, 3).
+    """
+    epsilon = np.asarray(epsilon)
+    if epsilon.ndim == 1:
+        return np.broadcast_to(epsilon[:, np.newaxis], epsilon.shape + (3,))
+    if epsilon.ndim == 2:
+        return epsilon
+    return np.diagonal(epsilon, axis1=-2, axis2=-1)
+
+
+def broadcast_tensors(*epsilons: npt.ArrayLike) -> List[npt.NDArray]:
+    """Converts compact permittivities to their common, least compact form,
+    so they can be combined element-wise.
+
+    Args:
+        epsilons (npt.ArrayLike): Permittivities of shape (N,), (N, 3) or (N, 3, 3).
+
+    Returns:
+        List[npt.NDArray]: Permittivities of the same shape.
+    """
+    epsilons = [np.asarray(epsilon) for epsilon in epsilons]
+    ndim = max(epsilon.ndim for epsilon in epsilons)
+    if ndim == 3:
+        return [expand_tensor(epsilon) for epsilon in epsilons]
+    if ndim == 2:
+        return [
+            epsilon if epsilon.ndim == 2 else np.array(tensor_diagonal(epsilon))
+            for epsilon in epsilons
+        ]
+    return epsilons
+
+
 #########################################################
 # Rotations
 
@@ -112,6 +112,17 @@ def test_solver4x4_linear(benchmark, structure):
     )
 
 
+def test_solver4x4_analytic(benchmark, structure):
+    """Benchmarks closed-form propagation of isotropic layers with solver4x4"""
+    benchmark.pedantic(
+        structure.evaluate,
+        args=(lbda, PHI),
+        kwargs={"solver": elli.Solver4x4},
+        iterations=1,
+        rounds=10,
+    )
+
+
 def test_solver2x2(benchmark, structure):
     """Benchmarks solver2x2"""
     benchmark.pedantic(
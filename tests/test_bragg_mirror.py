@@ -174,3 +174,36 @@ class TestBragg:
 
         np.testing.assert_array_almost_equal(R_ss, R_th_ss, decimal=1)
         np.testing.assert_array_almost_equal(R_pp, R_th_pp, decimal=1)
+
+
+def test_repeated_layers_match_explicit_stack():
+    """Repeated layers propagated by matrix power give the same result
+    as the explicitly stacked layers"""
+    SiO2 = elli.IsotropicMaterial(elli.ConstantRefractiveIndex(n=1.47))
+    TiO2 = elli.IsotropicMaterial(elli.ConstantRefractiveIndex(n=2.23 + 5.2e-4j))
+    L_SiO2 = elli.Layer(SiO2, 263.6)
+    L_TiO2 = elli.Layer(TiO2, 173.8)
+    lbda = np.linspace(1100, 2500, 100)
+
+    repeated = elli.Structure(
+        elli.AIR, [elli.RepeatedLayers([L_TiO2, L_SiO2], 20, 1, 1)], SiO2
+    )
+    explicit = elli.Structure(
+        elli.AIR, [L_SiO2] + 20 * [L_TiO2, L_SiO2] + [L_TiO2], SiO2
+    )
+
+    assert [len(block) for _, block in repeated.get_permittivity_blocks(lbda)] == [
+        1,
+        1,
+        2,
+        1,
+        1,
+    ]
+
+    for solver in [elli.Solver4x4, elli.Solver2x2]:
+        np.testing.assert_allclose(
+            repeated.evaluate(lbda, 45, solver=solver).jones_matrix_r,
+            explicit.evaluate(lbda, 45, solver=solver).jones_matrix_r,
+            rtol=1e-8,
+            atol=1e-10,
+        )
@@ -9,10 +9,13 @@ import pandas as pd
 from numpy.testing import assert_array_equal
 from pandas.testing import assert_frame_equal
 from pytest import fixture, raises
+from scipy.interpolate import interp1d
+from scipy.special import digamma
 
 import elli
 from elli.dispersions.base_dispersion import InvalidParameters
 from elli.dispersions.sellmeier import Sellmeier
+from elli.dispersions.tanguy import _digamma
 
 
 @fixture
@@ -237,6 +240,267 @@ def test_correct_reconstruction_with_pseudo_dielectric():
     )
 
 
+def test_oscillators_evaluated_at_once():
+    """Dispersions with multiple oscillators equal the sum of the single oscillators"""
+    lbda = np.linspace(250, 1700, 200)
+    oscillators = {
+        elli.Gaussian: [(2, 3, 0.5), (1, 5, 1), (0.5, 7, 2)],
+        elli.LorentzEnergy: [(10, 3, 0.5), (5, 5, 1)],
+        elli.LorentzLambda: [(1, 100, 10), (0.5, 300, 5)],
+        elli.Sellmeier: [(1, 0.01), (0.2, 0.1)],
+        elli.SellmeierCustomExponent: [(1, 2, 0.1, 2), (0.3, 2, 0.15, 2)],
+    }
+
+    for dispersion, params in oscillators.items():
+        combined = dispersion()
+        for param_set in params:
+            combined.add(*param_set)
+
+        single = [dispersion().add(*param_set) for param_set in params]
+        offset = (
+            1
+            if dispersion in (elli.LorentzEnergy, elli.LorentzLambda, Sellmeier)
+            else 0
+        )
+
+        np.testing.assert_allclose(
+            combined.get_dielectric(lbda),
+            sum(disp.get_dielectric(lbda) - offset for disp in single) + offset,
+        )
+
+    tauc_lorentz = elli.TaucLorentz(Eg=1.5).add(20, 3, 1).add(40, 4.5, 2)
+    np.testing.assert_allclose(
+        tauc_lorentz.get_dielectric(lbda),
+        elli.TaucLorentz(Eg=1.5).add(20, 3, 1).get_dielectric(lbda)
+        + elli.TaucLorentz(Eg=1.5).add(40, 4.5, 2).get_dielectric(lbda),
+    )
+
+    tauc_lorentz.rep_params[1]["A"] = 10
+    np.testing.assert_array_equal(tauc_lorentz.rep_params_dl["A"], [20, 10])
+    np.testing.assert_allclose(
+        tauc_lorentz.get_dielectric(lbda),
+        elli.TaucLorentz(Eg=1.5).add(20, 3, 1).add(10, 4.5, 2).get_dielectric(lbda),
+    )
+
+    tauc_lorentz = elli.TaucLorentz(Eg=np.float64(1.5)).add(
+        A=np.float64(20), E=3.5, C=1.5
+    )
+    expected = tauc_lorentz.get_dielectric(lbda)
+    tauc_lorentz.get_dielectric_batch(
+        lbda, np.stack([tauc_lorentz.get_batch_values()] * 2)
+    )
+    np.testing.assert_array_equal(tauc_lorentz.get_dielectric(lbda), expected)
+
+    gaussian = elli.Gaussian().add(2, 3, 0.5).enable_cache()
+    gaussian.get_dielectric(lbda)
+    gaussian.rep_params[0]["A"] = 4
+    np.testing.assert_allclose(
+        gaussian.get_dielectric(lbda),
+        elli.Gaussian().add(4, 3, 0.5).get_dielectric(lbda),
+    )
+    assert elli.LorentzEnergy().get_dielectric(lbda).shape == lbda.shape
+
+
+def test_dielectric_cache():
+    """The dielectric function is cached until parameters or wavelengths change"""
+    lbda = np.linspace(300, 900, 100)
+    disp = elli.TaucLorentz(Eg=1.5).add(20, 3, 1)
+    assert disp.get_dielectric(lbda) is not disp.get_dielectric(lbda)
+
+    disp.enable_cache(cache_size=2)
+    eps = disp.get_dielectric(lbda)
+    assert disp.get_dielectric(lbda) is eps
+    assert (disp.cache_hits, disp.cache_misses) == (1, 1)
+    with raises(ValueError):
+        eps[0] = 1
+
+    disp.single_params["Eg"] = 1.6
+    assert_array_equal(
+        disp.get_dielectric(lbda),
+        elli.TaucLorentz(Eg=1.6).add(20, 3, 1).get_dielectric(lbda),
+    )
+    disp.get_dielectric(lbda[:50])
+    disp.single_params["Eg"] = 1.5
+    assert disp.get_dielectric(lbda) is not eps
+    assert (disp.cache_hits, disp.cache_misses) == (1, 4)
+
+    dispersion_sum = (elli.Gaussian().add(1, 4, 1) + elli.EpsilonInf(2)).enable_cache()
+    dispersion_sum.get_dielectric(lbda)
+    dispersion_sum.dispersions[1].single_params["eps"] = 3
+    assert_array_equal(
+        dispersion_sum.get_dielectric(lbda),
+        elli.Gaussian().add(1, 4, 1).get_dielectric(lbda) + 3,
+    )
+
+    dispersion_sum.clear_cache()
+    assert (dispersion_sum.cache_hits, dispersion_sum.cache_misses) == (0, 0)
+    with raises(ValueError):
+        disp.enable_cache(-1)
+
+
+def test_dielectric_batch():
+    """Batches of parameter sets equal dispersions created for each set"""
+    lbda = np.linspace(250, 1700, 200)
+    formula = "eps = eps_inf + sum[A / (E0**2 - E**2 - 1j * gamma * E)]"
+    batches = [
+        (elli.Cauchy, [[1.5, 0.005, 0, 0, 0, 0], [1.6, 0.01, 1e-4, 0.1, 0, 0]]),
+        (elli.Tanguy, [[1, 2, 0.1, 0.1, 1, 0, 0], [1, 2.5, 0.1, 0.1, 1, 0, 0]]),
+        (elli.CodyLorentz, [[1.6, 100, 1.8, 2.4, 0.8, 3.6, 0.05], [1.5] + [1] * 6]),
+    ]
+    for dispersion, params_array in batches:
+        np.testing.assert_allclose(
+            dispersion().get_dielectric_batch(lbda, params_array),
+            [dispersion(*params).get_dielectric(lbda) for params in params_array],
+            rtol=1e-12,
+        )
+
+    tauc_lorentz = elli.TaucLorentz(Eg=1.5).add(20, 3, 1).add(10, 5, 2)
+    assert tauc_lorentz.get_batch_parameters() == [
+        "Eg",
+        ("A", 0),
+        ("E", 0),
+        ("C", 0),
+        ("A", 1),
+        ("E", 1),
+        ("C", 1),
+    ]
+    assert_array_equal(
+        tauc_lorentz.get_dielectric_batch(lbda, [[1.6, 20, 3, 1, 10, 5, 2]])[0],
+        elli.TaucLorentz(Eg=1.6).add(20, 3, 1).add(10, 5, 2).get_dielectric(lbda),
+    )
+    assert tauc_lorentz.single_params["Eg"] == 1.5
+
+    lorentz = elli.Formula(
+        formula, "E", {"eps_inf": 2}, {"A": [10], "E0": [3], "gamma": [0.2]}, unit="eV"
+    )
+    dispersion_sum = elli.Gaussian().add(1, 4, 1) + lorentz
+    assert_array_equal(
+        dispersion_sum.get_dielectric_batch(lbda, [[1, 4, 1, 2, 10, 3, 0.2]])[0],
+        dispersion_sum.get_dielectric(lbda),
+    )
+
+    with raises(InvalidParameters):
+        tauc_lorentz.get_dielectric_batch(lbda, [1.6, 20, 3, 1, 10, 5, 2])
+
+
+def test_dielectric_derivatives():
+    """Analytic derivatives match central differences of the dielectric function"""
+    lbda = np.linspace(250, 1700, 200)
+    dispersions = [
+        elli.Cauchy(1.5, 0.01, 0.001, 0.01, 0.002, 0.001),
+        elli.CauchyUrbach(1.5, 0.01, 0.001, 0.01, 2, 0.3),
+        elli.Sellmeier().add(1, 0.01).add(0.5, 0.02),
+        elli.TaucLorentz(Eg=1.5).add(20, 3, 1).add(10, 5, 2),
+        elli.CodyLorentz(),
+        elli.Gaussian().add(1, 4, 1).add(2, 3, 0.5),
+        elli.LorentzEnergy().add(10, 3, 0.5),
+        elli.DrudeEnergy(10, 0.5),
+        elli.Tanguy(d=2, Eg=2),
+        elli.Tanguy(d=3, Eg=1.5, R=0.05, gamma=0.08),
+        elli.Tanguy(d=2.5, Eg=2, a=1, b=30),
+        elli.Poles(1, 2, 7),
+        elli.Polynomial(2).add(1e-3, 1.1),
+        elli.EpsilonInf(2),
+        elli.Gaussian().add(1, 4, 1) + elli.LorentzEnergy().add(10, 3, 0.5) + 2,
+    ]
+    for disp in dispersions:
+        derivatives = disp.dielectric_derivatives(lbda)
+        assert derivatives.shape == (lbda.size, len(disp.get_batch_parameters()))
+        np.testing.assert_allclose(
+            derivatives,
+            disp._finite_differences(lbda, disp.dielectric_function),
+            rtol=1e-6,
+            atol=1e-6 * np.max(np.abs(derivatives)),
+        )
+
+
+def test_table_interpolation_matches_interp1d():
+    """Tables interpolate like scipy's interp1d, reusing the weights of known grids"""
+    lbda_table = np.linspace(200, 1700, 151) + np.sin(np.arange(151))
+    n = 1.5 + 0.1j * np.cos(lbda_table / 100)
+    lbda = np.linspace(201, 1699, 500)
+
+    for kind in ["linear", "cubic", "nearest"]:
+        table = elli.Table(lbda=lbda_table[::-1], n=n[::-1], kind=kind)
+        expected = interp1d(lbda_table, n, kind=kind)(lbda)
+        np.testing.assert_allclose(table.get_dielectric(lbda), expected**2, rtol=1e-14)
+        np.testing.assert_allclose(
+            table.interpolation(lbda.reshape(5, 100)), expected.reshape(5, 100)
+        )
+
+    interpolation = elli.Table(lbda=lbda_table, n=n).interpolation
+    assert interpolation.get_weights(lbda) is interpolation.get_weights(lbda.copy())
+    assert np.shape(interpolation(500)) == ()
+    with raises(ValueError):
+        interpolation(np.array([500, 1800]))
+
+
+def test_precomputed_terms_follow_parameters():
+    """Wavelength independent terms are recalculated when parameters change"""
+    lbda = np.linspace(300, 1200, 200)
+    models = [
+        (elli.Tanguy(d=2), {"Eg": 2.5, "R": 0.05}),
+        (elli.Tanguy(d=2.5), {"d": 2.2, "A": 2}),
+        (elli.TaucLorentz(Eg=1.5).add(20, 3, 1), {"Eg": 1.2}),
+        (elli.CodyLorentz(), {"Eg": 1.7, "E0": 3.2}),
+    ]
+
+    for model, params in models:
+        precomputed = model._get_precomputed()
+        model.get_dielectric(lbda)
+        assert model._get_precomputed() is precomputed
+
+        model.single_params.update(params)
+        expected = type(model)(**model.single_params)
+        for rep_params in model.rep_params:
+            expected.add(**rep_params)
+        np.testing.assert_array_equal(
+            model.get_dielectric(lbda), expected.get_dielectric(lbda)
+        )
+
+    # Numpy scalar parameters, which are replaced by arrays during batches and back
+    tanguy = elli.Tanguy(A=np.float64(3.6), Eg=np.float64(2))
+    expected = tanguy.get_dielectric(lbda)
+    tanguy.get_dielectric_batch(lbda, np.stack([tanguy.get_batch_values()] * 2))
+    np.testing.assert_array_equal(tanguy.get_dielectric(lbda), expected)
+
+    z = np.linspace(-5.05, 5, 101) + 1j * np.linspace(-2, 3, 101)
+    np.testing.assert_allclose(_digamma(z), digamma(z), rtol=1e-12)
+
+
+def test_bake_dispersion():
+    """Baked tables stay within the tolerance and are rebuilt on parameter changes"""
+    lbda = np.linspace(300, 1200, 200)
+    lbda_check = np.random.default_rng(0).uniform(300, 1200, 1000)
+
+    tanguy = elli.Tanguy(d=2.5, Eg=2)
+    baked = tanguy.bake(lbda, tolerance=1e-6)
+    assert isinstance(baked, elli.BakedDispersion)
+    assert baked.max_error <= 1e-6
+    np.testing.assert_allclose(
+        baked.get_dielectric(lbda_check), tanguy.get_dielectric(lbda_check), atol=1e-5
+    )
+
+    tanguy.single_params["Eg"] = 2.5
+    assert baked.is_stale()
+    np.testing.assert_allclose(
+        baked.get_dielectric(lbda_check), tanguy.get_dielectric(lbda_check), atol=1e-5
+    )
+    assert not baked.is_stale()
+
+    cauchy = elli.Cauchy(1.5, 0.01, 0.001)
+    baked_index = cauchy.bake(lbda)
+    assert isinstance(baked_index, elli.BakedIndexDispersion)
+    np.testing.assert_allclose(
+        baked_index.get_refractive_index(lbda_check),
+        cauchy.get_refractive_index(lbda_check),
+        atol=1e-6,
+    )
+
+    with raises(ValueError):
+        baked.get_dielectric([250, 500])
+
+
 def test_deepcopy_of_index_dispersion():
     sell = Sellmeier()
     sell.add(1, 1)
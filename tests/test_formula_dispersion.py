@@ -10,6 +10,12 @@ import elli
 from elli.dispersions import Sellmeier, Formula
 from elli.dispersions.cauchy import Cauchy
 from elli.dispersions.formula import FormulaIndex
+from elli.formula_parser.parser import (
+    FormulaCompiler,
+    FormulaTransformer,
+    compile_formula,
+    parse_formula,
+)
 
 
 @pytest.mark.parametrize(
@@ -90,3 +96,54 @@ def test_formula_against_predefined_model(structure, formula_structure):
     formula2x2 = formula_structure.evaluate(lbda, PHI, solver=elli.Solver2x2)
 
     assert_array_almost_equal(predefined2x2.rho, formula2x2.rho)
+
+
+@pytest.mark.parametrize(
+    "formula, single_params, rep_params",
+    [
+        (
+            "eps = einf + sum[A * dawsn((E - h * c / lbda) / s) + 1j * sqrt(A) / lbda]",
+            {"einf": 2.0},
+            {"A": [1, 2, 3], "E": [2, 3, 4], "s": [0.5, 0.6, 0.7]},
+        ),
+        (
+            "eps = sum[lbda * Eg] + ln(lbda) - log(lbda) * cos(pi / lbda) ** 2",
+            {"Eg": 1.3},
+            {},
+        ),
+        (
+            "eps = 1 + sum[A * (2 * pi * hbar / 1e-15) * (lbda * 1e-3) ** 2 / "
+            "((lbda * 1e-3) ** 2 - (E - Eg) ** 2) + (E - Eg) / (lbda * 1e-3) ** 2]"
+            " + sqrt(2) * 1240 / lbda - (1 / 0.5) / lbda",
+            {"Eg": 0.1},
+            {"A": [1, 2], "E": [0.4, 0.6]},
+        ),
+    ],
+)
+def test_compiled_formula_matches_interpreter(formula, single_params, rep_params):
+    """The compiled formula gives the same values as the formula interpreter"""
+    lbda = np.linspace(400, 1500, 500)
+    rep_params = {key: np.array(value) for key, value in rep_params.items()}
+
+    interpreted = FormulaTransformer("lbda", lbda, single_params, rep_params).transform(
+        parse_formula(formula)
+    )[1]
+    compiled = compile_formula(formula, "lbda", tuple(single_params), tuple(rep_params))
+
+    np.testing.assert_array_equal(
+        compiled(lbda, single_params, rep_params), interpreted
+    )
+    assert compiled is compile_formula(
+        formula, "lbda", tuple(single_params), tuple(rep_params)
+    )
+
+
+def test_compiled_formula_is_optimized():
+    """Constants are folded and repeated subexpressions are evaluated once"""
+    formula = "eps = sum[A * lbda ** 2 / (lbda ** 2 - (E - Eg)) + (E - Eg)] + 2 * pi"
+    compiler = FormulaCompiler("lbda", ("Eg",), ("A", "E"))
+    source = compiler.generate(compiler.transform(parse_formula(formula)))
+
+    assert source.count("** 2.0") == 1
+    assert source.count("- single_0") == 1
+    assert repr(2 * np.pi) in source
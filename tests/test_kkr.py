@@ -51,3 +51,19 @@ def test_gauss():
         g.get_dielectric(lbda).real[:-1000],
         decimal=2,
     )
+
+
+def test_stacked_spectra():
+    """Spectra stacked along leading axes are transformed at once"""
+    lbda = np.linspace(1e-2, 2000, 2000)
+    spectra = np.array(
+        [
+            elli.TaucLorentz(Eg=eg).add(A=20, E=8, C=5).get_dielectric(lbda).imag
+            for eg in (3, 4, 5)
+        ]
+    )
+    assert_array_almost_equal(
+        im2re_reciprocal(spectra, lbda),
+        [im2re_reciprocal(spectrum, lbda) for spectrum in spectra],
+        decimal=12,
+    )
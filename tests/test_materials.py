@@ -1,6 +1,7 @@
 """Tests for the materials classes"""
 
 import elli
+import numpy as np
 from pytest import raises
 
 
@@ -32,3 +33,29 @@ class TestMaterials:
 
         with raises(ValueError):
             elli.VCAMaterial(self.mat, self.mat, 10)
+
+    def test_compact_tensors(self):
+        """Checks that materials return their permittivity in the most compact form"""
+        lbda = np.linspace(400, 800, 5)
+        cauchy = elli.Cauchy(1.5, 0.01)
+        uniaxial = elli.UniaxialMaterial(cauchy, self.disp)
+        rotated = elli.UniaxialMaterial(cauchy, self.disp)
+        rotated.set_rotation(elli.rotation_euler(10, 30, 0))
+
+        cases = [
+            (cauchy.get_mat(), (5,)),
+            (uniaxial, (5, 3)),
+            (rotated, (5, 3, 3)),
+            (elli.VCAMaterial(self.mat, cauchy.get_mat(), 0.3), (5,)),
+            (elli.BruggemanEMA(self.mat, uniaxial, 0.3), (5, 3)),
+            (elli.LooyengaEMA(rotated, self.mat2, 0.3), (5, 3, 3)),
+        ]
+
+        for material, shape in cases:
+            epsilon = material.get_tensor_compact(lbda)
+            assert epsilon.shape == shape
+            np.testing.assert_array_equal(
+                elli.utils.expand_tensor(epsilon), material.get_tensor(lbda)
+            )
+
+        assert self.mat.get_tensor_compact(500).shape == (1,)
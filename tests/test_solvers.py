@@ -4,6 +4,7 @@ import warnings
 
 import elli
 import numpy as np
+import pytest
 from pytest import raises
 
 
@@ -23,3 +24,512 @@ def test_solver2x2_inverse_active_medium():
         s.evaluate([200, 300, 400, 500], 70, solver=elli.Solver2x2)
         assert len(w) == 1
         assert issubclass(w[-1].category, UserWarning)
+
+
+def test_half_space_helpers_match_solver_paths():
+    """list_snell and get_k_z are consistent with the paths used by the solvers"""
+    lbda = np.linspace(400, 800, 5)
+    substrate = elli.Cauchy(1.6, k0=0.1).get_mat()
+    structure = elli.Structure(
+        elli.ConstantRefractiveIndex(1.5).get_mat(),
+        [elli.Layer(elli.Cauchy(2.3, k0=0.5).get_mat(), 50)],
+        substrate,
+    )
+    solver = elli.Solver2x2(elli.Experiment(structure, lbda, 70))
+
+    n_list = np.array([np.full(5, 1.5), np.full(5, 2.3 + 0.5j), np.full(5, 1.6 + 0.1j)])
+    np.testing.assert_allclose(
+        np.cos(solver.list_snell(n_list)), elli.Solver2x2.snell_cos(n_list, 70)
+    )
+
+    k_x = np.full(5, 1.5 * np.sin(np.deg2rad(70)))
+    np.testing.assert_array_equal(
+        elli.Solver4x4.get_k_z(substrate, lbda, k_x),
+        elli.Solver4x4.k_z_iso_halfspace(k_x, substrate.get_tensor_compact(lbda)),
+    )
+
+
+@pytest.mark.parametrize("solver", [elli.Solver2x2, elli.Solver4x4])
+def test_multiple_angles_match_single_angles(solver):
+    """Evaluating an array of angles gives the same results as single evaluations"""
+    lbda = np.linspace(400, 800, 50)
+    angles = [50, 60, 70]
+    SiO2 = elli.Cauchy(1.452, 36.0).get_mat()
+    Si = elli.Cauchy(3.8, 0, 0, 0.1).get_mat()
+    s = elli.Structure(elli.AIR, [elli.Layer(SiO2, 100)], Si)
+
+    result = s.evaluate(lbda, angles, solver=solver)
+
+    assert result.psi.shape == (3, 50)
+    assert result.jones_matrix_r.shape == (3, 50, 2, 2)
+    assert result.mueller_matrix.shape == (3, 50, 4, 4)
+    for i, angle in enumerate(angles):
+        single = s.evaluate(lbda, angle, solver=solver)
+        np.testing.assert_allclose(result.rho[i], single.rho)
+        np.testing.assert_allclose(result.T[i], single.T)
+        np.testing.assert_allclose(result.mueller_matrix[i], single.mueller_matrix)
+
+
+def test_multiple_angles_anisotropic_substrate():
+    """Multiple angles are evaluated correctly for anisotropic half-spaces"""
+    lbda = np.linspace(400, 800, 20)
+    angles = np.array([45, 55, 65, 75])
+    substrate = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.5), elli.ConstantRefractiveIndex(1.7)
+    )
+    substrate.set_rotation(elli.rotation_euler(30, 40, 0))
+    s = elli.Structure(elli.AIR, [], substrate)
+
+    result = s.evaluate(lbda, angles)
+
+    assert result.psi_pp.shape == (4, 20)
+    for i, angle in enumerate(angles):
+        np.testing.assert_allclose(
+            result.jones_matrix_r[i], s.evaluate(lbda, angle).jones_matrix_r
+        )
+
+
+def test_experiment_angle_shape():
+    """Only scalar or one dimensional angles are accepted"""
+    s = elli.Structure(elli.AIR, [], elli.AIR)
+    with raises(ValueError):
+        elli.Experiment(s, 500, [[50, 60], [70, 80]])
+
+
+def test_isotropic_propagator_matches_expm():
+    """The closed-form isotropic propagator equals the matrix exponential"""
+    lbda = np.linspace(300, 900, 40)
+    epsilon = elli.Cauchy(2.1, 100, 0, 0.05).get_mat().get_tensor(lbda)
+    k_x = np.sin(np.deg2rad(65)) * np.ones_like(lbda)
+    delta = elli.Solver4x4.build_delta_matrix(k_x, epsilon)
+
+    assert elli.Solver4x4.is_isotropic(epsilon)
+    np.testing.assert_allclose(
+        elli.PropagatorIsotropic().calculate_propagation(delta, -120, lbda),
+        elli.PropagatorExpm(backend="scipy").calculate_propagation(delta, -120, lbda),
+        atol=1e-12,
+    )
+
+
+def test_diagonal_propagator_matches_expm():
+    """The closed-form propagator of diagonal tensors equals the matrix exponential"""
+    lbda = np.linspace(300, 900, 40)
+    epsilon = elli.BiaxialMaterial(
+        elli.Cauchy(1.5, 80, 0, 0.02),
+        elli.Cauchy(1.7, 100),
+        elli.Cauchy(2.2, 120, 0, 0.05),
+    ).get_tensor(lbda)
+    k_x = np.sin(np.deg2rad(65)) * np.ones_like(lbda)
+    delta = elli.Solver4x4.build_delta_matrix(k_x, epsilon)
+
+    assert elli.Solver4x4.is_diagonal(epsilon)
+    assert not elli.Solver4x4.is_isotropic(epsilon)
+    np.testing.assert_allclose(
+        elli.PropagatorDiagonal().calculate_propagation(delta, -120, lbda),
+        elli.PropagatorExpm(backend="scipy").calculate_propagation(delta, -120, lbda),
+        atol=1e-12,
+    )
+
+
+def test_delta_matrix_of_compact_tensors():
+    """Delta matrices of compact permittivities match the ones of the full tensors"""
+    lbda = np.linspace(300, 900, 40)
+    k_x = np.sin(np.deg2rad(65)) * np.ones_like(lbda)
+    materials = [
+        elli.Cauchy(2.236, 451, 251, 0.01).get_mat(),
+        elli.UniaxialMaterial(
+            elli.Cauchy(1.5, 0.01), elli.ConstantRefractiveIndex(1.7)
+        ),
+    ]
+
+    for material in materials:
+        epsilon = material.get_tensor_compact(lbda)
+        assert elli.Solver4x4.is_diagonal(epsilon)
+        assert elli.Solver4x4.is_isotropic(epsilon) == (epsilon.ndim == 1)
+        np.testing.assert_array_equal(
+            elli.Solver4x4.build_delta_matrix(k_x, epsilon),
+            elli.Solver4x4.build_delta_matrix(k_x, material.get_tensor(lbda)),
+        )
+
+
+def test_eig_propagator_cache():
+    """The cached eigendecomposition is reused for different thicknesses"""
+    lbda = np.linspace(300, 900, 40)
+    LC = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.5), elli.ConstantRefractiveIndex(1.7)
+    )
+    LC.set_rotation(elli.rotation_euler(20, 50, 0))
+    k_x = np.sin(np.deg2rad(65)) * np.ones_like(lbda)
+    delta = elli.Solver4x4.build_delta_matrix(k_x, LC.get_tensor(lbda))
+
+    propagator = elli.PropagatorEig(cache_size=4)
+    for thickness in [-120, -80]:
+        np.testing.assert_allclose(
+            propagator.calculate_propagation(delta, thickness, lbda),
+            elli.PropagatorEig(cache_size=0).calculate_propagation(
+                delta, thickness, lbda
+            ),
+        )
+    assert len(propagator._cache) == 1
+
+    propagator = elli.PropagatorEig()
+    propagator.calculate_propagation(delta, -120, lbda)
+    assert len(propagator._cache) == 0
+
+
+def test_solver4x4_analytic_propagation():
+    """Analytic propagation of isotropic and diagonal layers does not change the results"""
+    lbda = np.linspace(300, 900, 40)
+    TiO2 = elli.Cauchy(2.236, 451, 251, 0.01).get_mat()
+    LC = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.5), elli.ConstantRefractiveIndex(1.7)
+    )
+    LC.set_rotation(elli.rotation_euler(20, 50, 0))
+    ZnO = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.9), elli.ConstantRefractiveIndex(2.0)
+    )
+    s = elli.Structure(
+        elli.AIR,
+        [elli.Layer(TiO2, 80), elli.Layer(LC, 200), elli.Layer(ZnO, 150)],
+        elli.Cauchy(3).get_mat(),
+    )
+
+    assert not elli.Solver4x4.is_diagonal(LC.get_tensor(lbda))
+    np.testing.assert_allclose(
+        s.evaluate(lbda, 70).jones_matrix_r,
+        s.evaluate(lbda, 70, analytic_propagation=False).jones_matrix_r,
+        atol=1e-12,
+    )
+
+
+def test_solver4x4_explicit_propagator():
+    """A propagator given explicitly is used for all layers"""
+    lbda = np.linspace(300, 900, 40)
+    s = elli.Structure(
+        elli.AIR,
+        [elli.Layer(elli.Cauchy(2.236, 451, 251, 0.01).get_mat(), 80)],
+        elli.Cauchy(3).get_mat(),
+    )
+    epsilon = elli.Cauchy(1.5).get_mat().get_tensor_compact(lbda)
+    propagator = elli.PropagatorLinear()
+
+    solver = elli.Solver4x4(elli.Experiment(s, lbda, 70), propagator=propagator)
+    assert solver.get_propagator(epsilon) is propagator
+    assert isinstance(
+        elli.Solver4x4(elli.Experiment(s, lbda, 70)).get_propagator(epsilon),
+        elli.PropagatorIsotropic,
+    )
+    np.testing.assert_array_equal(
+        s.evaluate(lbda, 70, propagator=elli.PropagatorLinear()).jones_matrix_r,
+        s.evaluate(
+            lbda, 70, propagator=elli.PropagatorLinear(), analytic_propagation=False
+        ).jones_matrix_r,
+    )
+
+
+def test_solver4x4_session_matches_evaluate():
+    """The session gives the same results as a new solver after changes of the structure"""
+    lbda = np.linspace(400, 800, 30)
+    angles = np.array([50, 70])
+    TiO2 = elli.Cauchy(2.236, 451, 251, 0.01)
+    SiO2 = elli.Cauchy(1.452, 36)
+    LC = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.5), elli.ConstantRefractiveIndex(1.7)
+    )
+    LC.set_rotation(elli.rotation_euler(20, 50, 0))
+    layers = [elli.Layer(TiO2.get_mat(), 80), elli.Layer(SiO2.get_mat(), 120)]
+    s = elli.Structure(
+        elli.AIR,
+        [
+            elli.RepeatedLayers(layers, 5),
+            elli.Layer(LC, 200),
+            elli.Layer(SiO2.get_mat(), 50),
+        ],
+        elli.Cauchy(3).get_mat(),
+    )
+    session = s.create_session(lbda, angles)
+
+    calls = []
+    calculate_layer_propagation = session.calculate_layer_propagation
+
+    def count_calls(*args):
+        calls.append(args)
+        return calculate_layer_propagation(*args)
+
+    session.calculate_layer_propagation = count_calls
+
+    def check():
+        np.testing.assert_allclose(
+            session.calculate().psi, s.evaluate(lbda, angles).psi, atol=1e-10
+        )
+
+    check()
+    assert len(calls) == 4
+
+    s.layers[1].set_thickness(210)
+    check()
+    assert len(calls) == 5
+
+    s.layers[1].set_thickness(200)
+    s.layers[2].set_thickness(60)
+    check()
+    assert len(calls) == 6
+
+    layers[0].set_thickness(85)
+    check()
+    assert len(calls) == 7
+
+    TiO2.single_params["n0"] = 2.3
+    check()
+    assert len(calls) == 8
+
+    calls.clear()
+    check()
+    assert len(calls) == 0
+
+
+def test_solver4x4_session_angle_and_wavelength_changes():
+    """The session gives the same results as a new solver after changes of the experiment"""
+    lbda = np.linspace(400, 800, 30)
+    LC = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.5), elli.ConstantRefractiveIndex(1.7)
+    )
+    LC.set_rotation(elli.rotation_euler(20, 50, 0))
+    s = elli.Structure(
+        elli.AIR,
+        [
+            elli.Layer(elli.Cauchy(2.236, 451, 251, 0.01).get_mat(), 80),
+            elli.Layer(LC, 200),
+        ],
+        elli.Cauchy(3).get_mat(),
+    )
+    experiment = elli.Experiment(s, lbda, 50)
+    session = elli.Solver4x4Session(experiment)
+
+    def check():
+        np.testing.assert_allclose(
+            session.calculate().jones_matrix_r,
+            elli.Solver4x4(experiment).calculate().jones_matrix_r,
+            atol=1e-12,
+        )
+
+    check()
+    experiment.set_theta(70)
+    check()
+    experiment.set_lbda(np.linspace(500, 900, 30))
+    check()
+    experiment.set_theta([50, 70])
+    check()
+
+
+def test_result_keeps_experiment_snapshot():
+    """Results store an immutable snapshot instead of a copy of the structure"""
+    lbda = np.linspace(400, 800, 10)
+    layer = elli.Layer(elli.Cauchy(1.452, 36).get_mat(), 100)
+    s = elli.Structure(elli.AIR, [layer], elli.Cauchy(3).get_mat())
+    result = s.evaluate(lbda, 70)
+
+    assert isinstance(result.experiment, elli.ExperimentSnapshot)
+    assert result.experiment.back_isotropic
+    assert result.experiment.permittivity_profile[1][0] == 100
+    assert not result.experiment.lbda.flags.writeable
+
+    layer.set_thickness(200)
+    assert result.experiment.permittivity_profile[1][0] == 100
+
+
+@pytest.mark.parametrize("back_rotated", [False, True])
+@pytest.mark.parametrize("angles", [70, [50, 70]])
+def test_solver4x4_torch_matches_numpy(back_rotated, angles):
+    """The PyTorch 4x4 solver gives the same results as the NumPy solver"""
+    _ = pytest.importorskip("torch")
+    lbda = np.linspace(400, 800, 30)
+    LC = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.5), elli.ConstantRefractiveIndex(1.7)
+    )
+    LC.set_rotation(elli.rotation_euler(20, 50, 0))
+    ZnO = elli.UniaxialMaterial(
+        elli.ConstantRefractiveIndex(1.9), elli.ConstantRefractiveIndex(2.0)
+    )
+    back = elli.BiaxialMaterial(
+        elli.ConstantRefractiveIndex(3.9),
+        elli.ConstantRefractiveIndex(4.0),
+        elli.ConstantRefractiveIndex(4.1),
+    )
+    if back_rotated:
+        back.set_rotation(elli.rotation_euler(10, 30, 0))
+    layers = [
+        elli.Layer(elli.Cauchy(2.236, 451, 251, 0.01).get_mat(), 80),
+        elli.Layer(elli.Cauchy(1.452, 36).get_mat(), 100),
+    ]
+    s = elli.Structure(
+        elli.AIR,
+        [
+            elli.RepeatedLayers(layers, 5, 1, 1),
+            elli.Layer(LC, 200),
+            elli.Layer(ZnO, 150),
+        ],
+        back,
+    )
+
+    expected = s.evaluate(lbda, angles)
+    for analytic_propagation in [True, False]:
+        result = s.evaluate(
+            lbda,
+            angles,
+            solver=elli.Solver4x4Torch,
+            analytic_propagation=analytic_propagation,
+        )
+        np.testing.assert_allclose(
+            result.jones_matrix_r, expected.jones_matrix_r, atol=1e-10
+        )
+        np.testing.assert_allclose(
+            result.jones_matrix_t, expected.jones_matrix_t, atol=1e-10
+        )
+
+
+def test_solver2x2_parameter_set_batch():
+    """Batches of parameter sets give the same results as single structures"""
+    lbda = np.linspace(400, 800, 20)
+    TiO2 = elli.Cauchy(2.236, 451, 251, 0.01).get_mat()
+    SiO2 = elli.Cauchy(1.452, 36).get_mat()
+    substrate = elli.Cauchy(3).get_mat()
+    thicknesses = np.array([[80, 120], [90, 100], [0, 300]])
+
+    n_list = np.sqrt(
+        np.array(
+            [mat.get_tensor(lbda)[:, 0, 0] for mat in [elli.AIR, TiO2, SiO2, substrate]]
+        )
+    )
+    jones_matrix_r, jones_matrix_t, power_correction = (
+        elli.Solver2x2.calculate_jones_matrices(
+            np.broadcast_to(n_list, (3,) + n_list.shape), thicknesses, lbda, 70
+        )
+    )
+
+    assert jones_matrix_r.shape == (3, 20, 2, 2)
+    for i, (d_1, d_2) in enumerate(thicknesses):
+        result = elli.Structure(
+            elli.AIR,
+            [elli.Layer(TiO2, d_1), elli.Layer(SiO2, d_2)],
+            substrate,
+        ).evaluate(lbda, 70, solver=elli.Solver2x2)
+        np.testing.assert_allclose(jones_matrix_r[i], result.jones_matrix_r)
+        np.testing.assert_allclose(jones_matrix_t[i], result.jones_matrix_t)
+        np.testing.assert_allclose(power_correction[i], result._power_correction)
+
+
+@pytest.mark.parametrize("solver", [elli.Solver2x2, elli.Solver4x4])
+@pytest.mark.parametrize("angles", [70, [50, 70]])
+def test_structure_ensemble_matches_evaluate(solver, angles):
+    """Ensemble members give the same results as single structures"""
+    lbda = np.linspace(400, 800, 20)
+    cauchy = elli.Cauchy(2.236, 451, 251, 0.01)
+    layer = elli.Layer(cauchy.get_mat(), 100)
+    structure = elli.Structure(
+        elli.AIR,
+        [layer, elli.Layer(elli.Cauchy(1.452, 36).get_mat(), 50)],
+        elli.Cauchy(3).get_mat(),
+    )
+    thicknesses = np.array([80, 100, 0])
+    n0 = np.array([2.0, 2.236, 2.5])
+
+    ensemble = elli.StructureEnsemble(
+        structure, {layer: thicknesses}, {(cauchy, "n0"): n0}
+    )
+    result = ensemble.evaluate(lbda, angles, solver=solver)
+
+    assert result.psi.shape == (3,) + np.shape(angles) + (20,)
+    assert layer.thickness == 100
+    assert cauchy.single_params["n0"] == 2.236
+    for i, (thickness, value) in enumerate(zip(thicknesses, n0)):
+        layer.set_thickness(thickness)
+        cauchy.single_params["n0"] = value
+        expected = structure.evaluate(lbda, angles, solver=solver)
+        np.testing.assert_allclose(result.jones_matrix_r[i], expected.jones_matrix_r)
+        np.testing.assert_allclose(result.jones_matrix_t[i], expected.jones_matrix_t)
+
+
+def test_snapshot_thickness_per_wavelength():
+    """Thicknesses with one value per wavelength are kept in snapshots"""
+    lbda = np.linspace(400, 800, 20)
+    layer = elli.Layer(elli.Cauchy(2.236, 451, 251, 0.01).get_mat(), 100)
+    structure = elli.Structure(elli.AIR, [layer], elli.Cauchy(3).get_mat())
+    expected = structure.evaluate(lbda, 70)
+
+    layer.thickness = np.full(lbda.shape, 100.0)
+    experiment = elli.Experiment(structure, lbda, 70)
+    thickness = experiment.snapshot().permittivity_profile[1][0]
+    assert thickness.shape == lbda.shape
+    assert not thickness.flags.writeable
+
+    for solver in [elli.Solver4x4, elli.Solver4x4Session]:
+        np.testing.assert_allclose(
+            solver(experiment).calculate().jones_matrix_r, expected.jones_matrix_r
+        )
+
+
+def test_structure_ensemble_unbatched_dispersion():
+    """Dispersions without parameter arrays are evaluated per member"""
+    lbda = np.linspace(400, 800, 20)
+    cody_lorentz = elli.CodyLorentz()
+    structure = elli.Structure(
+        elli.AIR, [elli.Layer(cody_lorentz.get_mat(), 50)], elli.Cauchy(3).get_mat()
+    )
+    assert not cody_lorentz.supports_parameter_arrays
+
+    ensemble = elli.StructureEnsemble(
+        structure, parameters={(cody_lorentz, "A"): [80, 120]}
+    )
+    result = ensemble.evaluate(lbda, 70)
+    for i, value in enumerate([80, 120]):
+        cody_lorentz.single_params["A"] = value
+        np.testing.assert_allclose(
+            result.psi[i], structure.evaluate(lbda, 70).psi, atol=1e-10
+        )
+
+    cauchy = elli.Cauchy(1.5)
+    structure = elli.Structure(
+        elli.AIR, [elli.Layer(cauchy.get_mat(), 50)], elli.Cauchy(3).get_mat()
+    )
+    ensemble = elli.StructureEnsemble(structure, parameters={(cauchy, "n0"): [1, 2]})
+    cauchy.single_params["n1"] = np.zeros(3)
+    with raises(ValueError):
+        ensemble.evaluate(lbda, 70)
+
+
+def test_structure_ensemble_numpy_scalar_template():
+    """Templates with numpy scalar parameters can be evaluated after an ensemble"""
+    lbda = np.linspace(400, 800, 20)
+    tauc_lorentz = elli.TaucLorentz(Eg=np.float64(1.5)).add(
+        A=np.float64(20), E=np.float64(3.5), C=1.5
+    )
+    layer = elli.Layer(tauc_lorentz.get_mat(), np.float64(100))
+    structure = elli.Structure(elli.AIR, [layer], elli.Cauchy(3).get_mat())
+    expected = structure.evaluate(lbda, 70)
+
+    ensemble = elli.StructureEnsemble(
+        structure,
+        thicknesses={layer: [90, 110]},
+        parameters={(tauc_lorentz, "Eg"): [1.4, 1.6], (tauc_lorentz, "A", 0): [10, 30]},
+    )
+    ensemble.evaluate(lbda, 70)
+
+    np.testing.assert_array_equal(
+        structure.evaluate(lbda, 70).jones_matrix_r, expected.jones_matrix_r
+    )
+
+
+def test_structure_ensemble_invalid_values():
+    cauchy = elli.Cauchy(1.5)
+    layer = elli.Layer(cauchy.get_mat(), 100)
+    structure = elli.Structure(elli.AIR, [layer], elli.Cauchy(3).get_mat())
+
+    with raises(ValueError):
+        elli.StructureEnsemble(structure)
+    with raises(ValueError):
+        elli.StructureEnsemble(structure, {layer: [1, 2]}, {(cauchy, "n0"): [1.5]})
+    with raises(ValueError):
+        elli.StructureEnsemble(structure, {layer: [-1, 2]})
+    with raises(elli.InvalidParameters):
+        elli.StructureEnsemble(structure, parameters={(cauchy, "A"): [1.5]})
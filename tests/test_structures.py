@@ -2,7 +2,7 @@
 
 import numpy as np
 import elli
-from pytest import raises
+from pytest import raises, warns
 
 
 class TestStructures:
@@ -68,6 +68,111 @@ class TestStructures:
         vml = elli.VaryingMixtureLayer(vca_mat, 10, 3)
 
         np.testing.assert_array_equal(
-            vml.get_permittivity_profile(500)[1][1],
+            elli.utils.expand_tensor(vml.get_permittivity_profile(500)[1][1]),
             (elli.AIR.get_tensor(500) + self.mat.get_tensor(500)) / 2,
         )
+
+    def test_shared_material_evaluation(self):
+        """Layers of the same material share one read-only permittivity array."""
+        lbda = np.linspace(400, 800, 10)
+        structure = elli.Structure(
+            elli.AIR,
+            [elli.Layer(self.mat, 10), elli.Layer(elli.AIR, 5)] * 3,
+            self.mat,
+        )
+
+        profile = structure.get_permittivity_profile(lbda)
+        assert all(epsilon is profile[1][1] for _, epsilon in profile[1:-1:2])
+        assert profile[-1][1] is profile[1][1]
+        assert not profile[1][1].flags.writeable
+        assert profile[2][1] is not profile[1][1]
+
+        snapshot = elli.Experiment(structure, lbda, 70).snapshot()
+        assert (
+            snapshot.permittivity_profile[3][1] is snapshot.permittivity_profile[1][1]
+        )
+
+        with raises(ValueError):
+            profile[1][1][0] = 1
+
+    def test_twisted_layer_profile(self):
+        """The batched profile of a twisted layer equals the rotated tensors of its slices."""
+        lbda = np.linspace(400, 800, 10)
+        material = elli.BiaxialMaterial(
+            elli.Cauchy(1.5), elli.Cauchy(1.6), elli.Cauchy(1.7)
+        )
+        layer = elli.TwistedLayer(material, 100, 4, 90)
+
+        profile = layer.get_permittivity_profile(lbda)
+        for (thickness, epsilon), z in zip(profile, [12.5, 37.5, 62.5, 87.5]):
+            m_r = elli.utils.rotation_v_theta(elli.utils.E_Z, 90 * z / 100)
+            assert thickness == 25
+            np.testing.assert_allclose(
+                epsilon, m_r @ material.get_tensor(lbda) @ m_r.T, atol=1e-14
+            )
+
+        uniaxial_layer = elli.TwistedLayer(
+            elli.UniaxialMaterial(elli.Cauchy(1.5), elli.Cauchy(1.7)), 100, 4, 90
+        )
+        profile = uniaxial_layer.get_permittivity_profile(lbda)
+        assert all(epsilon is profile[0][1] for _, epsilon in profile)
+
+    def test_varying_mixture_layer_fractions(self):
+        """The batched profile of a VML equals the tensors of its single slices."""
+        lbda = np.linspace(400, 800, 10)
+        guest = elli.Cauchy(2.5, 0.02, k0=0.1).get_mat()
+
+        for modulation in [lambda x: x**2, lambda x: 0.2 if x < 0.5 else 0.7]:
+            for mixture in [
+                elli.VCAMaterial,
+                elli.LooyengaEMA,
+                elli.MaxwellGarnettEMA,
+                elli.BruggemanEMA,
+            ]:
+                vml = elli.VaryingMixtureLayer(
+                    mixture(self.mat, guest, 0.5), 100, 4, modulation
+                )
+                profile = vml.get_permittivity_profile(lbda)
+
+                assert len(profile) == 4
+                for (thickness, epsilon), z in zip(profile, [12.5, 37.5, 62.5, 87.5]):
+                    assert thickness == 25
+                    np.testing.assert_allclose(
+                        epsilon, vml.get_tensor_compact(z, lbda), rtol=1e-14
+                    )
+
+        vca = elli.VCAMaterial(self.mat, guest, 0.5)
+        assert vca.get_tensor_fraction(lbda, [0.1, 0.9]).shape == (2, 10, 3, 3)
+
+    def test_adaptive_slicing(self):
+        """Adaptive slicing concentrates the slices in the transition region."""
+        lbda = np.linspace(400, 800, 10)
+        guest = elli.Cauchy(2.5, 0.02, k0=0.1).get_mat()
+        vml = elli.VaryingMixtureLayer(
+            elli.VCAMaterial(self.mat, guest, 0.5),
+            200,
+            400,
+            lambda x: 0.5 + 0.5 * np.tanh((x - 0.5) * 20),
+        )
+        assert vml.get_divisions(lbda) == 400
+
+        vml.set_tolerance(0.1)
+        z = vml.get_slices(lbda)
+        assert z[0] == 0 and z[-1] == 200
+        assert vml.get_divisions(lbda) < 40
+        assert vml.get_divisions() == 400
+        assert np.diff(z)[len(z) // 2 - 1] < np.diff(z)[0] / 5
+
+        vml.set_divisions(1)
+        assert vml.get_divisions(lbda) < 40
+        assert len(vml.get_permittivity_profile(lbda)) == vml.get_divisions(lbda)
+
+        vml.set_tolerance(1e-6, max_div=20)
+        with warns(UserWarning):
+            assert vml.get_divisions(lbda) <= 20
+
+        with raises(ValueError):
+            vml.set_tolerance(0)
+
+        vml.set_tolerance(None)
+        assert vml.get_divisions(lbda) == 1
@@ -1,5 +1,6 @@
 """Tests for the utils file"""
 
+import numpy as np
 from pytest import raises
 
 import elli
@@ -18,3 +19,22 @@ def test_delta_range_errors():
 
     with raises(ValueError):
         elli.DeltaRange(360, 0)
+
+
+def test_spectral_axis():
+    """Spectral axis calculates derived quantities once and behaves like an array."""
+    lbda = np.linspace(300, 900, 50)
+    axis = elli.SpectralAxis(lbda)
+
+    assert axis.energy is axis.energy
+    np.testing.assert_array_equal(axis.energy, elli.conversion_wavelength_energy(lbda))
+    assert elli.conversion_wavelength_energy(axis) is axis.energy
+    assert type(axis * 2) is np.ndarray
+
+    with raises(ValueError):
+        axis[0] = 1
+
+    dispersion = elli.TaucLorentz(Eg=1.5).add(20, 3, 1) + elli.Gaussian().add(1, 4, 1)
+    np.testing.assert_array_equal(
+        dispersion.get_dielectric(axis), dispersion.get_dielectric(lbda)
+    )